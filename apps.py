@@ -13,16 +13,34 @@ Place this file in the same directory as:
 - label_encoders.pkl
 - Depression Student Dataset.csv (optional; only loaded for reference)
 - Depresi.jpeg (image shown on Beranda/Home)
+- resources.py (shared, hot-reloaded model & dataset loader)
+- content.py (static copy, labels and answer options per language)
+
+Optional: set PREDICT_API_URL to score through server.py instead of locally,
+and CANDIDATE_MODEL_PATH / CANDIDATE_FRACTION to trial a second model
+(A/B + shadow scoring, see model_registry.py). Every prediction is written
+to an anonymized audit log in the background (see audit_log.py), and input
+drift against the training data is monitored (see drift.py).
 
 Run:
     streamlit run apps_final.py
 """
 
+import os
+import time
+import uuid
+
 import streamlit as st
-import pandas as pd
-import joblib
-import pickle
-from pathlib import Path
+
+import audit_log
+import content
+import drift
+import metrics
+import model_registry
+import prediction_cache
+import resources
+import server
+from scoring import FEATURE_COLUMNS
 
 # ------------------------------------------------------------------
 # Page Config (call as early as possible)
@@ -94,351 +112,68 @@ APP_BASE_CSS = """
 
 st.markdown(APP_BASE_CSS, unsafe_allow_html=True)
 
-# ------------------------------------------------------------------
-# Load assets (model, scaler, encoders, dataset optional)
-# ------------------------------------------------------------------
-## Lokasi dua file CSV
-PRIMER_PATH = Path("Depression Student Dataset Primer.csv")
-SEKUNDER_PATH = Path("Depression Student Dataset Sekunder.csv")
-
-# Load dan gabung tanpa ubah kolom
-try:
-    df_primer = pd.read_csv(PRIMER_PATH)
-    df_sekunder = pd.read_csv(SEKUNDER_PATH)
-    
-    # Gabung langsung
-    df = pd.concat([df_primer, df_sekunder], ignore_index=True)
-
-except Exception as e:
-    df = None
-    print(f"❌ Gagal memuat dataset: {e}")
+# Instrumentasi per tahap (APP_METRICS=1; METRICS_PORT untuk /metrics)
+_rerun_start = time.perf_counter()
+if metrics.is_enabled():
+    metrics.start_http_exporter()
 
-MODEL_PATH = Path("model_depression.joblib")
-
-# Load bundle
-model_bundle = joblib.load(MODEL_PATH)
-
-model = model_bundle["model"]
-scaler = model_bundle["scaler"]
-label_encoders = model_bundle["encoders"]
-
-# ------------------------------------------------------------------
-# Long-form copy (Home & About) - Indonesia
 # ------------------------------------------------------------------
-HOME_DESC_ID = '''
-### 💬 Kenali Risiko Depresi dengan Cara yang Mudah dan Empatik
-
-Selamat datang di aplikasi prediksi risiko depresi untuk mahasiswa 🎓🧠
-
-Depresi adalah salah satu gangguan kesehatan mental yang paling umum dan sering disertai dengan kecemasan. Menurut WHO (2023), depresi ditandai oleh suasana hati yang tertekan, hilangnya minat terhadap aktivitas sehari-hari dalam jangka waktu yang lama, serta dapat mengganggu fungsi di lingkungan kerja atau pendidikan. 
-Tingkat keparahan depresi bervariasi, dari yang ringan dan sementara hingga yang berat dan berlangsung lama. Beberapa orang mungkin hanya mengalaminya sekali, sementara yang lain dapat mengalaminya berulang kali. Meskipun depresi dapat meningkatkan risiko bunuh diri, hal ini dapat dicegah jika individu mendapatkan dukungan yang tepat, terutama bagi remaja yang mengalami pikiran untuk mengakhiri hidup.
-
-🧩 **Bagaimana aplikasi ini bekerja?**
-- Isi pertanyaan - pertanyaan yang ada pada halaman "Prediksi Depresi".
-- Klik tombol "Prediksi" untuk memuatkan hasil.
-- Hasil beserta dengan saran akan muncul dibawah.
-'''
-
-ABOUT_DESC_ID = '''
-### 🎯 Tujuan Aplikasi
-
-Untuk mengidentifikasi seseorang yang mengalami depresi, diperlukan pendekatan berbasis analisis data terhadap gejala dan faktor risiko yang terkait dengan kondisi psikologis, seperti tekanan aktivitas, kualitas tidur, stres ekonomi, dan kepuasan hidup. Oleh karena itu, penggunaan teknologi sangat dibutuhkan untuk membantu mendeteksi risiko depresi secara sistematis dan otomatis. 
-- 🧠 Meningkatkan kesadaran mahasiswa terhadap pentingnya kesehatan mental.
-- 📊 Memberikan estimasi awal terkait risiko depresi secara otomatis dan personal.
-- 🤝 Menjadi alat bantu tambahan bagi dosen, konselor kampus, dan tenaga pendidik dalam memahami kondisi mahasiswa.
-
----
-
-### ❓ Mengapa Aplikasi Ini Dibuat?
-
-Berdasarkan berbagai penelitian, mahasiswa termasuk dalam kelompok yang rentan mengalami gangguan kesehatan mental, terutama **depresi**, karena berbagai tekanan seperti:
-
-- **Beban akademik yang tinggi**
-- **Stres finansial**
-- **Kurangnya waktu tidur**
-- **Pola makan**
-- **Minimnya akses terhadap layanan psikologis**
-
-Namun, banyak dari mereka yang tidak menyadari atau enggan mencari bantuan karena stigma atau kurangnya informasi. Aplikasi ini hadir sebagai **langkah awal yang mudah, cepat, dan empatik** untuk mengenali kondisi tersebut.
-
----
-
-### 🧪 Teknologi yang Digunakan
-
-Aplikasi ini menggunakan pendekatan **Machine Learning** untuk memprediksi risiko depresi. Berikut teknologi dan proses yang digunakan:
-
-- 🔍 **Model Machine Learning**: `Binary Logistic Regression` Model ini dipilih karena kesederhanaannya, kecepatan dalam inferensi, serta interpretabilitas tinggi untuk klasifikasi biner (*Depresi* vs *Tidak Depresi*).
-- 📈 **Preprocessing Data**: 
-  - Encoding label pada data kategorikal menggunakan `LabelEncoder`
-  - Standarisasi fitur numerik menggunakan `StandardScaler`
-- 🧪 **Pelatihan Model**:
-  - Data dibagi menjadi data latih dan uji 80:20 `train_test_split`
-  - Model dilatih untuk memprediksi variabel target: apakah seseorang mengalami depresi atau tidak berdasarkan data survei.
-- 🧠 **Fitur yang dipertimbangkan**:
-  - Jenis Kelamin
-  - Usia
-  - Tekanan Akademik
-  - Kepuasan Belajar
-  - Durasi Tidur
-  - Kebiasaan Makan
-  - Pikiran untuk Bunuh Diri
-  - Jam Belajar per Hari
-  - Stres Finansial
-  - Riwayat Gangguan Mental dalam Keluarga
-
----
-
-### ⚠️ Catatan Penting
-
-Hasil prediksi dari aplikasi ini **bukan merupakan diagnosis klinis**, melainkan estimasi berbasis data. Untuk diagnosis atau penanganan lebih lanjut, silakan konsultasi dengan tenaga kesehatan mental profesional.
-
----
-
-### 💡 Harapan Pengembang
-
-Semoga aplikasi ini dapat menjadi:
-- 🌱 Awal dari peningkatan kesadaran akan pentingnya kesehatan mental.
-- 🔑 Alat bantu sederhana dalam deteksi dini risiko depresi.
-- 🧩 Bagian dari solusi digital dalam mendukung kesejahteraan emosional mahasiswa.
-'''
-
-# ------------------------------------------------------------------
-# Long-form copy (Home & About) - English
+# Load assets (model, scaler, encoders, dataset optional)
 # ------------------------------------------------------------------
-HOME_DESC_EN = '''
-### 💬 Understand Depression Risk Easily and Empathetically
-
-Welcome to the student depression risk prediction app 🎓🧠
-
-Depression is one of the most common mental health disorders, often accompanied by anxiety. According to WHO (2023), depression is characterized by a persistently low mood, loss of interest in daily activities over a long period, and can interfere with functioning at work or in education.  
-The severity of depression varies, from mild and temporary to severe and long-lasting. Some people may experience it only once, while others may experience it repeatedly. Although depression can increase the risk of suicide, it can be prevented if individuals receive proper support, especially for adolescents who have suicidal thoughts.
-
-🧩 **How does this app work?**
-- Fill in the questions on the "Depression Prediction" page.
-- Click the "Predict" button to load the results.
-- The result and suggestions will appear below.
-'''
-
-ABOUT_DESC_EN = '''
-### 🎯 Purpose of the Application
-
-To identify someone experiencing depression, a data-driven approach is needed to analyze symptoms and risk factors related to psychological conditions, such as activity pressure, sleep quality, financial stress, and life satisfaction.  
-Therefore, technology is essential to help systematically and automatically detect depression risk.
-
-- 🧠 Increase students' awareness of the importance of mental health.
-- 📊 Provide an initial automated and personalized estimate of depression risk.
-- 🤝 Serve as an additional tool for lecturers, campus counselors, and educators to understand students' conditions.
-
----
-
-### ❓ Why Was This App Created?
-
-Research shows that students are among the groups most vulnerable to mental health problems, especially **depression**, due to various pressures such as:
-
-- **High academic workload**
-- **Financial stress**
-- **Lack of sleep**
-- **Dietary habits**
-- **Limited access to psychological services**
-
-However, many students are unaware or reluctant to seek help due to stigma or lack of information. This app is a **first step that is simple, quick, and empathetic** in recognizing this condition.
+## Model dimuat sekali per proses (lihat resources.py) dan dimuat ulang
+## otomatis bila file berubah. Bila model_depression.json (export_model.py)
+## cocok dengan bundle, model slim itu yang dipakai: tanpa pickle/sklearn.
+## Dataset tidak dimuat di sini; panggil resources.load_dataset() bila perlu
+## (pandas baru diimpor saat itu).
+MODEL_PATH = resources.MODEL_PATH
 
----
+with metrics.timer("rerun.load_model"):
+    # Predictor siap pakai (lookup kategori & koefisien sudah dihitung sekali)
+    predictor = resources.load_predictor(MODEL_PATH)
 
-### 🧪 Technology Used
+    # Tabel risiko ter-precompute (opsional; None jika belum dibangun / basi)
+    risk_table = resources.load_risk_table(MODEL_PATH)
 
-This application uses a **Machine Learning** approach to predict depression risk. Technologies and processes used include:
+# Backend HTTP opsional (python server.py); kosong = prediksi lokal
+PREDICT_API_URL = os.environ.get("PREDICT_API_URL", "").strip()
 
-- 🔍 **Machine Learning Model**: `Binary Logistic Regression`  
-  This model is chosen for its simplicity, fast inference, and high interpretability for binary classification (*Depression* vs *No Depression*).
-- 📈 **Data Preprocessing**:
-  - Label encoding for categorical data using `LabelEncoder`
-  - Standardizing numeric features using `StandardScaler`
-- 🧪 **Model Training**:
-  - Data is split into training and test sets (80:20) using `train_test_split`
-  - The model is trained to predict the target variable: whether someone is experiencing depression based on survey data.
-- 🧠 **Features considered**:
-  - Gender
-  - Age
-  - Academic Pressure
-  - Study Satisfaction
-  - Sleep Duration
-  - Dietary Habits
-  - Suicidal Thoughts
-  - Study Hours per Day
-  - Financial Stress
-  - Family History of Mental Illness
+# Tampilkan hit/miss cache prediksi di sidebar (SHOW_CACHE_STATS=1)
+SHOW_CACHE_STATS = os.environ.get("SHOW_CACHE_STATS", "") == "1"
 
----
-
-### ⚠️ Important Note
-
-The predictions from this app **are not clinical diagnoses**, but data-based estimates.  
-For further diagnosis or treatment, please consult a mental health professional.
-
----
-
-### 💡 Developer’s Hope
-
-We hope this app can be:
-- 🌱 A starting point to raise awareness of the importance of mental health.
-- 🔑 A simple tool for early detection of depression risk.
-- 🧩 A part of digital solutions to support students' emotional well-being.
-'''
-
-# ------------------------------------------------------------------
-# Label dictionaries (short UI strings)
-# ------------------------------------------------------------------
-LABELS_ID = {
-    "home_title": "Prediksi Risiko Depresi Untuk Mahasiswa",
-    "home_desc": HOME_DESC_ID,
-    "about_title": "ℹ️ Tentang Website",
-    "about_desc": ABOUT_DESC_ID,
-    "predict_title": "🧠 Prediksi Risiko Depresi Mahasiswa",
-    "predict_desc": "Isi formulir di bawah untuk memprediksi apakah anda berpotensi mengalami depresi.",
-    "gender": "Jenis Kelamin",
-    "age": "Usia",
-    "academic_pressure": "Seberapa Besar Tekanan Akademik Yang Anda Rasakan",
-    "study_satisfaction": "Seberapa Puas Kepuasan Belajar Anda Dalam Belajar",
-    "sleep_duration": "Berapa Durasi Tidur Anda Dalam Sehari",
-    "dietary_habits": "Bagaimana Pola Makan Anda Sehari Hari",
-    "suicidal_thoughts": "Pernahkah Anda Berpikir Untuk Bunuh Diri?",
-    "study_hours": "Seberapa Lama Anda Belajar Dalam Satu Hari",
-    "financial_stress": "Seberapa Besar Stres Finansial Anda",
-    "family_history": "Apakah Ada Riwayat Gangguan Mental Dalam Keluarga Anda",
-    "predict_button": "Prediksi",
-    "result_yes": "🚨 Mahasiswa ini kemungkinan mengalami depresi.",
-    "result_no": "✅ Mahasiswa ini tidak terindikasi mengalami depresi.",
-    "warning": "⚠️ Lengkapi semua pilihan!",
-}
-
-LABELS_EN = {
-    "home_title": "Student Depression Risk Prediction",
-    "home_desc": HOME_DESC_EN,
-    "about_title": "ℹ️ About This Website",
-    "about_desc": ABOUT_DESC_EN,
-    "predict_title": "🧠 Student Depression Risk Prediction",
-    "predict_desc": "Fill out the form below to predict whether you are at risk of depression.",
-    "gender": "Gender",
-    "age": "Age",
-    "academic_pressure": "How Much Academic Pressure Do You Feel?",
-    "study_satisfaction": "How Satisfied Are You With Your Studies?",
-    "sleep_duration": "How Long Do You Sleep Daily?",
-    "dietary_habits": "What Is Your Daily Dietary Habit?",
-    "suicidal_thoughts": "Have You Ever Had Suicidal Thoughts?",
-    "study_hours": "How Many Hours Do You Study Daily?",
-    "financial_stress": "How Much Financial Stress Do You Experience?",
-    "family_history": "Is There a Family History of Mental Illness?",
-    "predict_button": "Predict",
-    "result_yes": "🚨 This student is likely experiencing depression.",
-    "result_no": "✅ This student does not show signs of depression.",
-    "warning": "⚠️ Please complete all selections.",
-}
+# Lebar gambar Home (px); gambar disimpan di cache sudah selebar ini
+HOME_IMAGE_WIDTH = 600
 
 # ------------------------------------------------------------------
 # Sidebar: language + navigation
 # ------------------------------------------------------------------
-with st.sidebar:
+## Teks statis (copy Home/About, LABELS, opsi jawaban, markup halaman)
+## disiapkan sekali per proses di content.py; rerun hanya memilih bahasanya.
+with st.sidebar, metrics.timer("rerun.sidebar"):
     st.markdown("<h1>🧠</h1>", unsafe_allow_html=True)
     st.markdown("<h3>Depression App</h3>", unsafe_allow_html=True)
     st.markdown("<hr>", unsafe_allow_html=True)
 
-    lang = st.selectbox("🌐 Pilih Bahasa / Choose Language", ["Indonesia", "English"], index=0)
+    lang = st.selectbox("🌐 Pilih Bahasa / Choose Language", list(content.LANGUAGES), index=0)
+    ui = content.LANGUAGES[lang]
     st.markdown("<hr>", unsafe_allow_html=True)
 
-    if lang == "Indonesia":
-        nav_title = "Navigasi"
-        page_options = ["Beranda", "Tentang", "Prediksi Depresi"]
-        pilih_halaman_label = "Pilih Halaman"
-    else:
-        nav_title = "Navigation"
-        page_options = ["Home", "About", "Depression Prediction"]
-        pilih_halaman_label = "Choose Page"
-
-    st.markdown(f"<h4>{nav_title}</h4>", unsafe_allow_html=True)
-    page_label = st.selectbox(pilih_halaman_label, page_options, index=0)
+    st.markdown(f"<h4>{ui.nav_title}</h4>", unsafe_allow_html=True)
+    page_label = st.selectbox(ui.page_label, list(ui.page_ids), index=0)
     st.markdown("<hr>", unsafe_allow_html=True)
 
+    # Statistik cache prediksi (opsional, untuk pemantauan)
+    if SHOW_CACHE_STATS:
+        cache_stats = prediction_cache.default_cache.stats()
+        st.caption(
+            f"Prediction cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%}), {cache_stats['size']}/{cache_stats['maxsize']} entries"
+        )
+
 # map page_label -> internal id
-PAGE_MAP_ID = {"Beranda": "home", "Tentang": "about", "Prediksi Depresi": "predict"}
-PAGE_MAP_EN = {"Home": "home", "About": "about", "Depression Prediction": "predict"}
-page_id = PAGE_MAP_ID.get(page_label) if lang == "Indonesia" else PAGE_MAP_EN.get(page_label)
+page_id = ui.page_ids.get(page_label)
 
 # choose language labels
-LABELS = LABELS_ID if lang == "Indonesia" else LABELS_EN
-
-# option mappings (display->canonical English used by encoders)
-if lang == "Indonesia":
-    gender_options = {"Laki-laki": "Male", "Perempuan": "Female"}
-    sleep_options = {
-        "Kurang dari 5 jam": "Less than 5 hours",
-        "5-6 jam": "5-6 hours",
-        "7-8 jam": "7-8 hours",
-        "Lebih dari 8 jam": "More than 8 hours",
-    }
-    diet_options = {"Sehat": "Healthy", "Sedang": "Moderate", "Tidak sehat": "Unhealthy"}
-    suicidal_options = {"Ya": "Yes", "Tidak": "No"}
-    family_history_options = {"Ya": "Yes", "Tidak": "No"}
-
-    # tambahan mapping skala (1–5 / 0–5)
-    academic_pressure_map = {
-        "Sangat ringan": 1,
-        "Ringan": 2,
-        "Sedang": 3,
-        "Berat": 4,
-        "Sangat berat": 5
-    }
-    study_satisfaction_map = {
-        "Sangat tidak puas": 1,
-        "Tidak puas": 2,
-        "Netral": 3,
-        "Puas": 4,
-        "Sangat puas": 5
-    }
-    financial_stress_map = {
-        "Tidak ada": 0,
-        "Sangat rendah": 1,
-        "Rendah": 2,
-        "Sedang": 3,
-        "Tinggi": 4,
-        "Sangat tinggi": 5
-    }
-
-else:
-    gender_options = {"Male": "Male", "Female": "Female"}
-    sleep_options = {
-        "Less than 5 hours": "Less than 5 hours",
-        "5-6 hours": "5-6 hours",
-        "7-8 hours": "7-8 hours",
-        "More than 8 hours": "More than 8 hours",
-    }
-    diet_options = {"Healthy": "Healthy", "Moderate": "Moderate", "Unhealthy": "Unhealthy"}
-    suicidal_options = {"Yes": "Yes", "No": "No"}
-    family_history_options = {"Yes": "Yes", "No": "No"}
-
-    # tambahan mapping skala (1–5 / 0–5)
-    academic_pressure_map = {
-        "Very light": 1,
-        "Light": 2,
-        "Moderate": 3,
-        "Heavy": 4,
-        "Very heavy": 5
-    }
-    study_satisfaction_map = {
-        "Very dissatisfied": 1,
-        "Dissatisfied": 2,
-        "Neutral": 3,
-        "Satisfied": 4,
-        "Very satisfied": 5
-    }
-    financial_stress_map = {
-        "None": 0,
-        "Very low": 1,
-        "Low": 2,
-        "Moderate": 3,
-        "High": 4,
-        "Very high": 5
-    }
+LABELS = ui.labels
 
 # ------------------------------------------------------------------
 # Page render helpers
@@ -446,181 +181,234 @@ else:
 
 def show_home():
     # Judul (centered)
-    st.markdown(
-        f'''<h1 style="text-align:center; font-size: 36px; font-weight: bold; margin-bottom: 2rem;">
-            {LABELS["home_title"]}
-        </h1>''',
-        unsafe_allow_html=True,
-    )
-
-    # Gambar di bawah judul (centered pakai column)
+    st.markdown(ui.home_title_html, unsafe_allow_html=True)
+
+    # Gambar di bawah judul (centered pakai column); bytes sudah diperkecil ke
+    # lebar tampilan sekali per proses, jadi Streamlit tidak decode/resize lagi
     col_center = st.columns([3, 3, 3])[1]
     with col_center:
-        st.image("Depresi.jpeg", width=600)
+        st.image(resources.load_image(width=HOME_IMAGE_WIDTH), width=HOME_IMAGE_WIDTH)
 
     # Spacer
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Deskripsi (justify + max width)
-    st.markdown(
-        f'''
-        <div class="custom-text" style="max-width: 900px; margin: 0 auto;">
-            {HOME_DESC_ID if lang == "Indonesia" else HOME_DESC_EN}
-        ''',
-        unsafe_allow_html=True,
-    )
+    st.markdown(ui.home_desc_html, unsafe_allow_html=True)
 
     # Disclaimer card
+    st.markdown(ui.disclaimer_html, unsafe_allow_html=True)
+
+def show_about():
+    st.markdown(ui.about_html, unsafe_allow_html=True)
+
+def show_contributions(contributions, features):
+    """Table of each answer's log-odds contribution, largest effect first."""
     if lang == "Indonesia":
-        st.markdown(
-            '''
-            <div style="background: #2c2f33; border-radius: 12px; padding: 1.5rem; margin-top: 2rem; 
-                     border-left: 6px solid #5865F2; box-shadow: 0 4px 12px rgba(0,0,0,0.2); 
-                     max-width: 900px; margin-left: auto; margin-right: auto;">
-
-              <div style="margin-bottom: 1.2rem;">
-                <h4 style="margin: 0; color: #ffffff; font-size: 20px;">✨ <strong>Harap diingat:</strong></h4>
-                <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
-                  Prediksi ini bukan pengganti diagnosis profesional. Hasil yang ditampilkan hanya bersifat estimasi berdasarkan data input yang diberikan.
-                </p>
-              </div>
-
-              <div style="margin-bottom: 1.2rem;">
-                <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💬 <strong>Jika kamu merasa kesulitan:</strong></h4>
-                <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
-                  Jangan ragu untuk mencari bantuan profesional seperti psikolog kampus, konselor, atau layanan kesehatan mental lainnya.
-                </p>
-              </div>
-
-              <div>
-                <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💡 <strong>Tips:</strong></h4>
-                <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
-                  Gunakan aplikasi ini sebagai langkah awal untuk mengenali, memahami, dan menjaga kesehatan mentalmu!
-                </p>
-              </div>
-            </div>
-            ''',
-            unsafe_allow_html=True,
-        )
+        title, head = "🔍 Jawaban yang paling memengaruhi hasil", "| Pertanyaan | Jawaban | Pengaruh |"
+        up, down = "menaikkan risiko", "menurunkan risiko"
+        note = ("Pengaruh = kontribusi log-odds tiap jawaban dibanding responden rata-rata "
+                "(dari koefisien regresi logistik, bukan diagnosis).")
     else:
-        st.markdown(
-            '''
-            <div style="background: #2c2f33; border-radius: 12px; padding: 1.5rem; margin-top: 2rem; 
-                        border-left: 6px solid #5865F2; box-shadow: 0 4px 12px rgba(0,0,0,0.2); 
-                        max-width: 900px; margin-left: auto; margin-right: auto;">
-
-              <div style="margin-bottom: 1.2rem;">
-                <h4 style="margin: 0; color: #ffffff; font-size: 20px;">✨ <strong>Note:</strong></h4>
-                <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
-                  This prediction is not a substitute for professional diagnosis. The results shown are only estimates based on your input.
-                </p>
-              </div>
-
-              <div style="margin-bottom: 1.2rem;">
-                <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💬 <strong>If you feel distressed:</strong></h4>
-                <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
-                  Do not hesitate to seek professional help such as campus psychologists, counselors, or mental health services.
-                </p>
-              </div>
-
-              <div>
-                <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💡 <strong>Tips:</strong></h4>
-                <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
-                  Use this app as a first step to recognize, understand, and maintain your mental health!
-                </p>
-              </div>
-            </div>
-            ''',
-            unsafe_allow_html=True,
-        )
+        title, head = "🔍 Answers that drove this result", "| Question | Answer | Effect |"
+        up, down = "raises risk", "lowers risk"
+        note = ("Effect = each answer's log-odds contribution compared with an average respondent "
+                "(from the logistic regression coefficients, not a diagnosis).")
+
+    rows = [head, "|---|---|---|"]
+    for col, value in sorted(contributions.items(), key=lambda item: -abs(item[1])):
+        arrow = f"▲ +{value:.2f} {up}" if value >= 0 else f"▼ −{-value:.2f} {down}"
+        rows.append(f"| {ui.questions[col]} | {ui.answer_label(col, features[col])} | {arrow} |")
+    with st.expander(title):
+        st.markdown("\n".join(rows))
+        st.caption(note)
+
+
+def show_interval(result):
+    """Bootstrap interval of the probability, flagged when it straddles the threshold."""
+    if result.get("interval") is None:
+        return
+    low, high = result["interval"]
+    threshold = result["threshold"]
+    crosses = low < threshold <= high
+    if lang == "Indonesia":
+        text = (f"📏 Probabilitas {result['prob']:.0%}, rentang ketidakpastian {low:.0%} – {high:.0%} "
+                f"(ensemble bootstrap model).")
+        note = "Rentang ini memotong ambang batas, jadi hasilnya belum pasti."
+    else:
+        text = (f"📏 Probability {result['prob']:.0%}, uncertainty range {low:.0%} – {high:.0%} "
+                f"(bootstrap model ensemble).")
+        note = "This range crosses the decision threshold, so the result is uncertain."
+    if crosses:
+        st.warning(f"{text} {note}")
+    else:
+        st.caption(text)
+
+
+def show_what_if(features, predictor):
+    """Risk over alternative answers for one or two questions (one batch per rerun).
+
+    ``predictor`` is the model that served the result above (production or
+    the A/B candidate), so the cell for the current answers matches it.
+    """
+    if lang == "Indonesia":
+        title, first_txt, second_txt, none_txt = ("🔀 Bagaimana jika jawaban saya berbeda?",
+                                                  "Ubah pertanyaan", "Dan pertanyaan kedua (opsional)", "— tidak ada —")
+        risk_txt = "Risiko"
+        legend_txt = "Titik oranye / ● = jawaban Anda · garis putus-putus = ambang batas"
+    else:
+        title, first_txt, second_txt, none_txt = ("🔀 What if my answers were different?",
+                                                  "Vary question", "And a second question (optional)", "— none —")
+        risk_txt = "Risk"
+        legend_txt = "Orange point / ● = your answers · dashed line = decision threshold"
+
+    domains = ui.domains
+    columns = list(domains)
+    question = ui.questions
+
+    with st.expander(title, expanded=True):
+        c1, c2 = st.columns(2)
+        first = c1.selectbox(first_txt, columns, index=columns.index("Study Hours"),
+                             format_func=question.get, key="whatif_first")
+        rest = [None] + [col for col in columns if col != first]
+        second = c2.selectbox(second_txt, rest, index=rest.index("Sleep Duration") if "Sleep Duration" in rest else 0,
+                              format_func=lambda col: none_txt if col is None else question[col], key="whatif_second")
+
+        axes = [(col, domains[col]) for col in (first, second) if col is not None]
+        with metrics.timer("whatif.score"):
+            grid = predictor.what_if(features, [(col, [v for _, v in domain]) for col, domain in axes])
+
+        threshold = predictor.threshold
+        if len(axes) == 1:
+            (col, domain), = axes
+            values = [
+                {"x": label, "risk": float(p), "current": value == features[col]}
+                for (label, value), p in zip(domain, grid)
+            ]
+            spec = {
+                "layer": [
+                    {"mark": {"type": "line", "point": True},
+                     "encoding": {"x": {"field": "x", "type": "ordinal", "sort": None, "title": question[col]},
+                                  "y": {"field": "risk", "type": "quantitative", "title": risk_txt,
+                                        "scale": {"domain": [0, 1]}, "axis": {"format": "%"}},
+                                  "tooltip": [{"field": "x", "title": question[col]},
+                                              {"field": "risk", "title": risk_txt, "format": ".1%"}]}},
+                    {"transform": [{"filter": "datum.current"}],
+                     "mark": {"type": "point", "size": 160, "filled": True, "color": "#e4572e"},
+                     "encoding": {"x": {"field": "x", "type": "ordinal", "sort": None},
+                                  "y": {"field": "risk", "type": "quantitative"}}},
+                    {"data": {"values": [{"t": threshold}]}, "mark": {"type": "rule", "strokeDash": [4, 4]},
+                     "encoding": {"y": {"field": "t", "type": "quantitative"}}},
+                ],
+            }
+        else:
+            (col_a, domain_a), (col_b, domain_b) = axes
+            values = [
+                {"a": label_a, "b": label_b, "risk": float(grid[i, j]),
+                 "current": value_a == features[col_a] and value_b == features[col_b]}
+                for i, (label_a, value_a) in enumerate(domain_a)
+                for j, (label_b, value_b) in enumerate(domain_b)
+            ]
+            spec = {
+                "layer": [
+                    {"mark": "rect",
+                     "encoding": {"x": {"field": "a", "type": "ordinal", "sort": None, "title": question[col_a]},
+                                  "y": {"field": "b", "type": "ordinal", "sort": None, "title": question[col_b]},
+                                  "color": {"field": "risk", "type": "quantitative", "title": risk_txt,
+                                            "scale": {"domain": [0, 1], "scheme": "redyellowgreen", "reverse": True}},
+                                  "tooltip": [{"field": "a", "title": question[col_a]},
+                                              {"field": "b", "title": question[col_b]},
+                                              {"field": "risk", "title": risk_txt, "format": ".1%"}]}},
+                    {"transform": [{"filter": "datum.current"}],
+                     "mark": {"type": "text", "text": "●", "fontSize": 16},
+                     "encoding": {"x": {"field": "a", "type": "ordinal", "sort": None},
+                                  "y": {"field": "b", "type": "ordinal", "sort": None}}},
+                ],
+            }
+        spec["data"] = {"values": values}
+        st.vega_lite_chart(spec, width="stretch")
+        st.caption(f"{legend_txt} ({threshold:.0%})")
 
-def show_about():
-    st.markdown(
-        f'''<div class="custom-text">
-            <h1 style="text-align:center; font-size: 36px; font-weight: bold; margin-bottom: 2rem;">
-                {LABELS["about_title"]}
-            </h1>
-            {LABELS["about_desc"]}
-        ''',
-        unsafe_allow_html=True,
-    )
 
 def show_predict():
     st.title(LABELS["predict_title"])
     st.write("")
     st.caption(LABELS["predict_desc"])
 
-    placeholder_txt = "- Pilih -" if lang == "Indonesia" else "- Select -"
+    placeholder_txt = ui.placeholder
+    options = ui.options
 
-    col1, col2 = st.columns(2)
+    # Form: jawaban baru dikirim saat tombol ditekan, jadi mengisi pertanyaan
+    # tidak memicu rerun sama sekali
+    with st.form("predict_form", border=False):
+        col1, col2 = st.columns(2)
 
-    with col1:
-        gender = st.selectbox(LABELS["gender"], [placeholder_txt] + list(gender_options.keys()))
-        
-        # 👉 Age manual input
-        age = st.number_input(LABELS["age"], min_value=18, max_value=34, step=1)
+        with col1:
+            gender = st.selectbox(LABELS["gender"], [placeholder_txt] + list(options["Gender"]))
 
-        academic_pressure = st.selectbox(
-            LABELS["academic_pressure"],
-            [placeholder_txt] + list(academic_pressure_map.keys())
-        )
+            # 👉 Age manual input
+            age = st.number_input(LABELS["age"], min_value=18, max_value=34, step=1)
 
-        study_satisfaction = st.selectbox(
-            LABELS["study_satisfaction"],
-            [placeholder_txt] + list(study_satisfaction_map.keys())
-        )
+            academic_pressure = st.selectbox(
+                LABELS["academic_pressure"],
+                [placeholder_txt] + list(options["Academic Pressure"])
+            )
 
-        sleep_duration = st.selectbox(
-            LABELS["sleep_duration"],
-            [placeholder_txt] + list(sleep_options.keys())
-        )
+            study_satisfaction = st.selectbox(
+                LABELS["study_satisfaction"],
+                [placeholder_txt] + list(options["Study Satisfaction"])
+            )
+
+            sleep_duration = st.selectbox(
+                LABELS["sleep_duration"],
+                [placeholder_txt] + list(options["Sleep Duration"])
+            )
 
-    with col2:
-        dietary_habits = st.selectbox(LABELS["dietary_habits"], [placeholder_txt] + list(diet_options.keys()))
-        suicidal_thoughts = st.selectbox(LABELS["suicidal_thoughts"], [placeholder_txt] + list(suicidal_options.keys()))
-        study_hours = st.selectbox(LABELS["study_hours"], [placeholder_txt] + [str(i) for i in range(0, 13)])
-        financial_stress = st.selectbox(LABELS["financial_stress"], [placeholder_txt] + list(financial_stress_map.keys()))
-        family_history = st.selectbox(LABELS["family_history"], [placeholder_txt] + list(family_history_options.keys()))
+        with col2:
+            dietary_habits = st.selectbox(LABELS["dietary_habits"], [placeholder_txt] + list(options["Dietary Habits"]))
+            suicidal_thoughts = st.selectbox(LABELS["suicidal_thoughts"],
+                                             [placeholder_txt] + list(options["Have you ever had suicidal thoughts ?"]))
+            study_hours = st.selectbox(LABELS["study_hours"], [placeholder_txt] + list(options["Study Hours"]))
+            financial_stress = st.selectbox(LABELS["financial_stress"], [placeholder_txt] + list(options["Financial Stress"]))
+            family_history = st.selectbox(LABELS["family_history"],
+                                          [placeholder_txt] + list(options["Family History of Mental Illness"]))
+
+        # Predict button -----------------------------------------------------------
+        submitted = st.form_submit_button(LABELS["predict_button"])
+
+    if submitted:
+        # Jawaban sebagaimana dipilih di form
+        answers = {
+            'Gender': gender,
+            'Academic Pressure': academic_pressure,
+            'Study Satisfaction': study_satisfaction,
+            'Sleep Duration': sleep_duration,
+            'Dietary Habits': dietary_habits,
+            'Have you ever had suicidal thoughts ?': suicidal_thoughts,
+            'Study Hours': study_hours,
+            'Financial Stress': financial_stress,
+            'Family History of Mental Illness': family_history,
+        }
 
-    # Predict button ---------------------------------------------------------------
-    if st.button(LABELS["predict_button"]):
         # Validasi input kosong
-        if (
-            gender == placeholder_txt
-            or academic_pressure == placeholder_txt
-            or study_satisfaction == placeholder_txt
-            or sleep_duration == placeholder_txt
-            or dietary_habits == placeholder_txt
-            or suicidal_thoughts == placeholder_txt
-            or study_hours == placeholder_txt
-            or financial_stress == placeholder_txt
-            or family_history == placeholder_txt
-        ):
+        if placeholder_txt in answers.values():
             st.warning(LABELS["warning"])
             return
 
-        if not all([model is not None, scaler is not None, label_encoders is not None]):
+        if predictor is None:
             if lang == "Indonesia":
                 st.error("Komponen model belum lengkap.")
             else:
                 st.error("Model components are not fully loaded.")
             return
 
+        features = {
+            col: int(age) if col == "Age" else options[col][answers[col]]
+            for col in FEATURE_COLUMNS
+        }
+
         try:
-            input_data = pd.DataFrame([
-                {
-                    'Gender': label_encoders['Gender'].transform([gender_options[gender]])[0],
-                    'Age': int(age),
-                    'Academic Pressure': academic_pressure_map[academic_pressure],
-                    'Study Satisfaction': study_satisfaction_map[study_satisfaction],
-                    'Sleep Duration': label_encoders['Sleep Duration'].transform([sleep_options[sleep_duration]])[0],
-                    'Dietary Habits': label_encoders['Dietary Habits'].transform([diet_options[dietary_habits]])[0],
-                    'Have you ever had suicidal thoughts ?': label_encoders['Have you ever had suicidal thoughts ?'].transform([suicidal_options[suicidal_thoughts]])[0],
-                    'Study Hours': int(study_hours),
-                    'Financial Stress': financial_stress_map[financial_stress],
-                    'Family History of Mental Illness': label_encoders['Family History of Mental Illness'].transform([family_history_options[family_history]])[0],
-                }
-            ])
+            with metrics.timer("predict.encode"):
+                input_data = predictor.encode(features)
         except Exception as e:
             if lang == "Indonesia":
                 st.error(f"Terjadi kesalahan saat encoding input: {e}")
@@ -628,18 +416,48 @@ def show_predict():
                 st.error(f"An error occurred during input encoding: {e}")
             return
 
-        # Scale semua fitur
+        # Scale + logistic (tanpa DataFrame, lihat scoring.Predictor)
         try:
-            input_scaled = pd.DataFrame(
-                scaler.transform(input_data),
-                columns=input_data.columns
-            )
+            # ambil probabilitas depresi (O(1) dari risk table bila tersedia)
+            remote = {}
+
+            def compute_prob():
+                if PREDICT_API_URL:
+                    remote.update(server.remote_predict(PREDICT_API_URL, features))
+                    return remote["probability"]
+                if risk_table is not None:
+                    return risk_table.lookup(features)
+                return predictor.predict_proba_encoded(input_data)
+
+            # jawaban yang sama (dari sesi mana pun) diambil dari cache LRU.
+            # Hasil server tidak di-cache: versi modelnya tidak diketahui di
+            # sini, jadi pergantian model di server tidak akan terlihat
+            def cached_prob():
+                if PREDICT_API_URL:
+                    return compute_prob()
+                return prediction_cache.default_cache.get_or_compute(
+                    features, prediction_cache.model_version(predictor), compute_prob
+                )
+
+            # Sesi diarahkan ke model produksi atau kandidat (A/B);
+            # model lain dinilai di background (shadow)
+            ab_key = st.session_state.setdefault("ab_key", uuid.uuid4().hex)
+            with metrics.timer("predict.score"):
+                prob, model_name, served_predictor = model_registry.default_registry.predict(
+                    features, ab_key, compute=cached_prob
+                )
+
+            # Kontribusi per jawaban dari model yang melayani (satu pass, 10 perkalian)
+            with metrics.timer("predict.explain"):
+                _, contributions = served_predictor.explain(features)
 
-            # ambil probabilitas depresi
-            prob = model.predict_proba(input_scaled)[0][1]
+            # Interval ketidakpastian dari ensemble bootstrap (None bila bundle belum punya)
+            with metrics.timer("predict.interval"):
+                interval = served_predictor.interval(features)
 
-            # tentukan threshold
-            threshold = 0.3
+            # tentukan threshold (dari bundle, lihat calibrate.py; default 0.3);
+            # probabilitas dari server dibandingkan dengan ambang model server
+            threshold = remote.get("threshold", served_predictor.threshold)
             prediction = 1 if prob >= threshold else 0
 
         except Exception as e:
@@ -649,10 +467,60 @@ def show_predict():
                 st.error(f"An error occurred during prediction: {e}")
             return
 
-        # Display result -----------------------------------------------------------
+        # Catatan audit anonim (fitur kanonik, probabilitas, versi model); hanya
+        # masuk antrean, ditulis ke disk oleh thread background audit_log
+        if audit_log.default_log is not None:
+            audit_log.default_log.log(
+                features, prob, threshold, model=model_name,
+                model_version=prediction_cache.model_version(served_predictor), session=ab_key,
+            )
+
+        # Histogram drift (ukuran tetap); dibandingkan dengan data latih terjadwal
+        if drift.default_monitor is not None:
+            drift.default_monitor.observe(features, prob)
+
+        # Hasil disimpan di session: tetap tampil di rerun berikutnya dan
+        # dirender ulang sendiri oleh fragment show_result()
+        st.session_state["prediction"] = {
+            "features": features,
+            "prob": prob,
+            "threshold": threshold,
+            "prediction": prediction,
+            "contributions": contributions,
+            "interval": interval,
+            # Model yang melayani (bisa kandidat A/B) untuk what-if di fragment
+            "predictor": served_predictor,
+            "remote": bool(remote),
+        }
         if prediction == 1:
             if lang == "Indonesia":
                 st.toast("🚨 Prediksi: Mahasiswa ini berisiko mengalami depresi.", icon="⚠️")
+            else:
+                st.toast("🚨 Prediction: This student is likely experiencing depression.", icon="⚠️")
+        else:
+            if lang == "Indonesia":
+                st.toast("✅ Prediksi: Mahasiswa ini tidak menunjukkan indikasi depresi.", icon="✅")
+            else:
+                st.toast("✅ Prediction: This student does not show signs of depression.", icon="✅")
+
+    if "prediction" in st.session_state:
+        show_result()
+
+
+@st.fragment
+def show_result():
+    """Prediction result, contributions and what-if.
+
+    A fragment: changing the what-if questions reruns only this function,
+    not the whole script (sidebar, form, model checks).
+    """
+    result = st.session_state["prediction"]
+    prediction, contributions = result["prediction"], result["contributions"]
+
+    # Display result -----------------------------------------------------------
+    with metrics.timer("predict.render_result"):
+        if prediction == 1:
+            if lang == "Indonesia":
                 st.error("🚨 **Hasil Prediksi: Mahasiswa ini berisiko mengalami depresi.**")
                 st.markdown(
                     """
@@ -676,7 +544,6 @@ def show_predict():
                     """
                 )
             else:
-                st.toast("🚨 Prediction: This student is likely experiencing depression.", icon="⚠️")
                 st.error("🚨 **Prediction Result: This student is likely experiencing depression.**")
                 st.markdown(
                     """
@@ -701,7 +568,6 @@ def show_predict():
                 )
         else:
             if lang == "Indonesia":
-                st.toast("✅ Prediksi: Mahasiswa ini tidak menunjukkan indikasi depresi.", icon="✅")
                 st.success("✅ **Hasil Prediksi: Mahasiswa ini tidak menunjukkan indikasi depresi.**")
                 st.markdown(
                     """
@@ -723,7 +589,6 @@ def show_predict():
                     """
                 )
             else:
-                st.toast("✅ Prediction: This student does not show signs of depression.", icon="✅")
                 st.success("✅ **Prediction Result: This student does not show signs of depression.**")
                 st.markdown(
                     """
@@ -744,15 +609,45 @@ def show_predict():
                     - ☀️ **Get morning sun exposure** for natural vitamin D & mood boost  
                     """
                 )
+        if result["remote"]:
+            if lang == "Indonesia":
+                st.caption("ℹ️ Probabilitas dari server prediksi; rentang, pengaruh jawaban dan simulasi "
+                           "di bawah dihitung dengan model lokal.")
+            else:
+                st.caption("ℹ️ Probability from the prediction server; the range, answer effects and "
+                           "what-if below are computed with the local model.")
+        show_interval(result)
+        show_contributions(contributions, result["features"])
+        show_what_if(result["features"], result["predictor"])
 
 # ------------------------------------------------------------------
 # Router
 # ------------------------------------------------------------------
-if page_id == "home":
-    show_home()
-elif page_id == "about":
-    show_about()
-elif page_id == "predict":
-    show_predict()
-else:  # fallback safety
-    st.error("Halaman tidak ditemukan / Page not found.")
+with metrics.timer(f"page.{page_id}"):
+    if page_id == "home":
+        show_home()
+    elif page_id == "about":
+        show_about()
+    elif page_id == "predict":
+        show_predict()
+    else:  # fallback safety
+        st.error("Halaman tidak ditemukan / Page not found.")
+
+# ------------------------------------------------------------------
+# Debug panel (APP_METRICS=1)
+# ------------------------------------------------------------------
+if metrics.is_enabled():
+    metrics.observe("rerun.total", time.perf_counter() - _rerun_start)
+    with st.sidebar.expander("⏱️ Debug: timing per stage"):
+        rows = ["| stage | n | p50 ms | p95 ms |", "|---|---:|---:|---:|"]
+        for stage, stat in metrics.registry.summary().items():
+            rows.append(f"| `{stage}` | {stat['count']} | {stat['p50_ms']:.3f} | {stat['p95_ms']:.3f} |")
+        st.markdown("\n".join(rows))
+        st.download_button("metrics.prom", metrics.export_text(), file_name="metrics.prom", mime="text/plain")
+    if len(model_registry.default_registry.entries) > 1:
+        rows = ["| model | role | served | shadow | agree | shadow p50 µs |", "|---|---|---:|---:|---:|---:|"]
+        for name, stat in model_registry.default_registry.stats().items():
+            agree = "–" if stat["agreement"] is None else f"{stat['agreement']:.1%}"
+            p50 = "–" if stat["shadow_p50_us"] is None else f"{stat['shadow_p50_us']:.1f}"
+            rows.append(f"| {name} | {stat['role']} | {stat['served']} | {stat['shadowed']} | {agree} | {p50} |")
+        st.sidebar.markdown("\n".join(rows))
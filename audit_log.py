@@ -0,0 +1,287 @@
+"""\
+audit_log.py
+-----------------
+Append-only, anonymized log of the predictions served by apps.py.
+
+One row per prediction: timestamp, canonical features (one column each, the
+dataset's column names and values), probability, threshold, decision, model
+name and version (bundle SHA-256), and the session id hashed with a per-
+process secret salt, so rows of one visit can be grouped but never linked
+back to a browser session or across server restarts
+(AUDIT_LOG_SESSION=drop stores no session column value at all).
+
+The request path never touches the disk:
+- log() only does a put_nowait on a bounded in-memory queue; when the
+  queue is full (a burst larger than it can absorb) the row is dropped
+  and counted, never waited for
+- a daemon writer thread drains the queue in batches (up to
+  ``batch_size`` rows or ``flush_interval`` s) and writes each batch in one
+  SQLite transaction (WAL journal)
+- rotation: once the file holds ``max_rows`` rows it is renamed to
+  predictions.<UTC timestamp>.sqlite and a new one is started; only the
+  newest ``keep`` rotated files are kept
+Queued rows are flushed at interpreter exit (best effort).
+
+Configuration for apps.py (environment):
+    AUDIT_LOG             0 to disable (default on)
+    AUDIT_LOG_PATH        database file (default predictions.sqlite next to the app)
+    AUDIT_LOG_SESSION     "hash" (default) or "drop"
+    AUDIT_LOG_SALT        fixed salt for the session hash (default: random per process)
+
+Run:
+    python audit_log.py check
+    python audit_log.py export -o predictions.csv
+"""
+
+import argparse
+import atexit
+import csv
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import resources
+from scoring import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = resources.BASE_DIR / "predictions.sqlite"
+
+COLUMNS = ["ts", "session", "model", "model_version", "probability", "threshold", "decision"] + FEATURE_COLUMNS
+
+
+def _column_list(columns):
+    # Nama kolom dataset berisi spasi / "?", jadi selalu di-quote
+    return ", ".join(f'"{col}"' for col in columns)
+
+
+_CREATE = (
+    "CREATE TABLE IF NOT EXISTS predictions ("
+    "id INTEGER PRIMARY KEY, ts REAL NOT NULL, session TEXT, model TEXT, model_version TEXT, "
+    "probability REAL NOT NULL, threshold REAL NOT NULL, decision INTEGER NOT NULL, "
+    f"{_column_list(FEATURE_COLUMNS)})"
+)
+_INSERT = f"INSERT INTO predictions ({_column_list(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def hash_session(key, salt):
+    """Keyed BLAKE2b of a session id (16 hex chars); same key + salt -> same value."""
+    return hashlib.blake2b(str(key).encode(), key=salt, digest_size=8).hexdigest()
+
+
+def rotated_files(path):
+    """Rotated files of ``path``, oldest first."""
+    path = Path(path)
+    return sorted(path.parent.glob(f"{path.stem}.*{path.suffix}"))
+
+
+class AuditLog:
+    def __init__(self, path=DEFAULT_PATH, max_queue=10000, batch_size=500, flush_interval=1.0,
+                 max_rows=1_000_000, keep=10, session_mode="hash", salt=None):
+        if session_mode not in ("hash", "drop"):
+            raise ValueError(f"session_mode must be 'hash' or 'drop', not {session_mode!r}")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.keep = keep
+        self.session_mode = session_mode
+        self.salt = salt or os.urandom(16)
+        self.logged = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.rotations = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = None
+        self._conn = None
+        self._rows = 0
+
+    # -- request path ---------------------------------------------------
+    def log(self, features, probability, threshold, model=None, model_version=None, session=None):
+        """Queue one prediction; never blocks. Returns False if it was dropped."""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                    self._worker.start()
+                    atexit.register(self.drain)
+
+        if session is not None:
+            session = hash_session(session, self.salt) if self.session_mode == "hash" else None
+        row = (time.time(), session, model, model_version, float(probability), float(threshold),
+               int(probability >= threshold)) + tuple(features[col] for col in FEATURE_COLUMNS)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    # -- writer thread --------------------------------------------------
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_CREATE)
+        self._rows = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        return conn
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+            except Exception as e:
+                # Log audit tidak boleh mengganggu layanan utama
+                with self._lock:
+                    self.failed += len(batch)
+                logger.warning("Audit log gagal ditulis (%d baris): %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def write(self, rows):
+        """Write ``rows`` in one transaction, rotating first if the file is full."""
+        if self._conn is None:
+            self._conn = self._connect()
+        if self._rows >= self.max_rows:
+            self.rotate()
+        with self._conn:
+            self._conn.executemany(_INSERT, rows)
+        self._rows += len(rows)
+        with self._lock:
+            self.logged += len(rows)
+            self.batches += 1
+
+    def rotate(self):
+        """Rename the current file to <stem>.<UTC timestamp><suffix> and start a new one."""
+        if self._conn is not None:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+            self._conn = None
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        target = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        n = 1
+        while target.exists():
+            target = self.path.with_name(f"{self.path.stem}.{stamp}-{n}{self.path.suffix}")
+            n += 1
+        if self.path.exists():
+            os.replace(self.path, target)
+        for suffix in ("-wal", "-shm"):
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+        for old in rotated_files(self.path)[:-self.keep or None]:
+            old.unlink()
+        self._conn = self._connect()
+        with self._lock:
+            self.rotations += 1
+
+    def drain(self, timeout=5.0):
+        """Wait until queued rows are written (exit, tests / benchmarks)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    # -- stats ----------------------------------------------------------
+    def stats(self):
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "logged": self.logged,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+                "rotations": self.rotations,
+                "queued": self._queue.qsize(),
+            }
+
+    def gauges(self):
+        """Writer counters as extra gauges for metrics.export_text()."""
+        stats = self.stats()
+        return {
+            "app_audit_logged": ("Predictions written to the audit log.", stats["logged"]),
+            "app_audit_dropped": ("Audit rows dropped because the queue was full.", stats["dropped"]),
+            "app_audit_failed": ("Audit rows lost to write errors.", stats["failed"]),
+            "app_audit_queued": ("Audit rows waiting for the writer.", stats["queued"]),
+        }
+
+
+def from_env():
+    """AuditLog configured from the environment, or None when AUDIT_LOG=0."""
+    if os.environ.get("AUDIT_LOG", "1").strip() == "0":
+        return None
+    salt = os.environ.get("AUDIT_LOG_SALT", "").encode() or None
+    return AuditLog(
+        os.environ.get("AUDIT_LOG_PATH", "").strip() or DEFAULT_PATH,
+        session_mode=os.environ.get("AUDIT_LOG_SESSION", "hash").strip() or "hash",
+        salt=salt,
+    )
+
+
+# Satu log per proses server (None = dimatikan)
+default_log = from_env()
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or export the prediction audit log.")
+    parser.add_argument("command", choices=["check", "export"])
+    parser.add_argument("--path", default=os.environ.get("AUDIT_LOG_PATH", "").strip() or str(DEFAULT_PATH))
+    parser.add_argument("-o", "--output", help="CSV file for export (default: stdout)")
+    parser.add_argument("--all", action="store_true", help="include rotated files (oldest first)")
+    args = parser.parse_args(argv)
+
+    current = [Path(args.path)] if Path(args.path).exists() else []
+    if args.command == "check" or args.all:
+        paths = rotated_files(args.path) + current
+    else:
+        paths = current
+    if not paths:
+        print(f"❌ {args.path}: no audit log", file=sys.stderr)
+        return 1
+
+    if args.command == "check":
+        for path in paths:
+            with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+                rows, first, last = conn.execute("SELECT COUNT(*), MIN(ts), MAX(ts) FROM predictions").fetchone()
+            span = (f", {time.strftime('%Y-%m-%d %H:%M', time.localtime(first))} .. "
+                    f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(last))}") if rows else ""
+            print(f"✅ {path.name}: {rows:,} predictions{span}")
+        return 0
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(COLUMNS)
+        for path in paths:
+            with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+                writer.writerows(conn.execute(f"SELECT {_column_list(COLUMNS)} FROM predictions ORDER BY id"))
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        print(f"✅ Exported {len(paths)} file(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""\
+batch_score.py
+-----------------
+Command-line batch scoring for survey exports with the same columns as
+"Depression Student Dataset Sekunder.csv" (the Depression column is optional).
+
+The input is read in chunks; each chunk is encoded and scored with the folded
+linear scorer (scoring.Predictor: one matrix-vector product + sigmoid), and
+written out immediately, so memory stays bounded regardless of file size.
+--model accepts the .joblib bundle or a slim .json exported by export_model.py.
+Every chunk is checked by the compiled validation schema first (see
+validation.py): invalid rows are kept in the output, unscored, instead of
+aborting the run. Three columns are appended:
+- probability: P(depression), empty for an invalid row
+- prediction: 1 if probability >= threshold else 0, empty for an invalid row
+- error: why the row was not scored, e.g. "'Age': 40 outside [18, 34]"
+When the model carries a bootstrap ensemble (see bootstrap.py),
+probability_low / probability_high hold its interval (e.g. 90%) as well.
+A per-field summary of the invalid rows is printed on stderr.
+With --explain, one "contrib <feature>" column per feature is added as well:
+its log-odds contribution relative to an average respondent (computed in the
+same matrix pass as the probability).
+
+Run:
+    python batch_score.py export.csv -o scored.csv
+    python batch_score.py export.csv --chunksize 50000 > scored.csv
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import resources
+import validation
+from scoring import CATEGORICAL_COLUMNS, DEFAULT_THRESHOLD, FEATURE_COLUMNS
+
+
+def score_csv(src, dst, predictor, chunksize=10_000, progress=None, explain=False, invalid=None):
+    """Stream ``src`` -> ``dst`` chunk by chunk. Returns the number of rows read.
+
+    ``invalid``, if given, is a dict updated with {column: {reason: rows}}
+    plus "rows" (total invalid rows).
+    """
+    schema = validation.compile_schema(predictor.classes)
+    total = 0
+    reader = pd.read_csv(src, chunksize=chunksize, dtype={c: str for c in CATEGORICAL_COLUMNS})
+    for i, chunk in enumerate(reader):
+        checked = schema.validate_frame(chunk)
+        valid = checked.valid
+        X = checked.X[valid]
+
+        # Baris tidak valid: probabilitas/prediksi kosong, alasan di kolom error
+        prob = np.full(len(chunk), np.nan)
+        pred = pd.array(np.zeros(len(chunk), dtype=np.int8), dtype="Int8")
+        pred[~valid] = pd.NA
+        if explain:
+            contributions = np.full((len(chunk), len(FEATURE_COLUMNS)), np.nan)
+            prob[valid], contributions[valid] = predictor.explain_matrix(X)
+        else:
+            prob[valid] = predictor.predict_proba_matrix(X)
+        if predictor.bootstrap is not None:
+            low, high = np.full(len(chunk), np.nan), np.full(len(chunk), np.nan)
+            low[valid], high[valid] = predictor.interval_matrix(X)
+        pred[valid] = (prob[valid] >= predictor.threshold).astype(np.int8)
+
+        chunk["probability"] = prob
+        if predictor.bootstrap is not None:
+            chunk["probability_low"] = low
+            chunk["probability_high"] = high
+        chunk["prediction"] = pred
+        chunk["error"] = checked.messages()
+        if explain:
+            for j, col in enumerate(FEATURE_COLUMNS):
+                chunk[f"contrib {col}"] = contributions[:, j]
+        chunk.to_csv(dst, header=(i == 0), index=False)
+        total += len(chunk)
+
+        if invalid is not None and not valid.all():
+            invalid["rows"] = invalid.get("rows", 0) + int((~valid).sum())
+            for col, reasons in checked.counts().items():
+                for reason, n in reasons.items():
+                    invalid.setdefault(col, {})
+                    invalid[col][reason] = invalid[col].get(reason, 0) + n
+        if progress is not None:
+            progress(total)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch depression-risk scoring for survey CSV exports.")
+    parser.add_argument("input", help="input CSV (same schema as the Sekunder dataset)")
+    parser.add_argument("-o", "--output", help="output CSV (default: stdout)")
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="model bundle (.joblib) or slim model (.json)")
+    parser.add_argument("--threshold", type=float, default=None, help=f"default: {DEFAULT_THRESHOLD}")
+    parser.add_argument("--chunksize", type=int, default=10_000, help="rows per chunk")
+    parser.add_argument("--explain", action="store_true", help="add per-feature log-odds contribution columns")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    predictor = resources.load_predictor(args.model)
+    if args.threshold is not None:
+        predictor.threshold = args.threshold
+
+    start = time.perf_counter()
+
+    def progress(rows):
+        if not args.quiet:
+            elapsed = time.perf_counter() - start
+            print(f"\r{rows:,} rows  ({rows / elapsed:,.0f} rows/s)", end="", file=sys.stderr)
+
+    invalid = {}
+    if args.output:
+        with open(args.output, "w", newline="") as dst:
+            total = score_csv(args.input, dst, predictor, args.chunksize, progress, args.explain, invalid)
+    else:
+        total = score_csv(args.input, sys.stdout, predictor, args.chunksize, progress, args.explain, invalid)
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(file=sys.stderr)
+    bad = invalid.pop("rows", 0)
+    print(
+        f"Scored {total - bad:,} of {total:,} rows in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    if bad:
+        print(f"⚠️ {bad:,} invalid rows left unscored (see the error column):", file=sys.stderr)
+        for col, reasons in invalid.items():
+            print(f"   {col}: " + ", ".join(f"{n:,} {reason}" for reason, n in reasons.items()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
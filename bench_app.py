@@ -0,0 +1,328 @@
+"""\
+bench_app.py
+-----------------
+Headless benchmark suite for apps.py and the scoring paths.
+
+Sections:
+- cold:    fresh-interpreter import time of the app's dependencies and of a
+           first full script run (streamlit.testing AppTest), in subprocesses
+- loading: uncached CSV read + concat vs dataset store, joblib.load, Predictor build, and the
+           cached per-rerun cost of resources.load_*
+- rerun:   full-script rerun time per page (show_home, show_about,
+           show_predict with a filled form and the predict button clicked)
+- single:  per-prediction latency of the original encode -> scale ->
+           predict_proba path vs scoring.Predictor (and the risk table if built)
+- batch:   rows/s at several batch sizes, sklearn path vs folded Predictor
+
+Results are written as JSON so two commits can be compared. The prediction
+audit log and drift monitor are switched off for the run, so benchmark
+answers never reach predictions.sqlite or the drift histograms.
+
+Run:
+    python bench_app.py -o bench.json
+    python bench_app.py --quick -o new.json --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import resources
+from scoring import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, Predictor, encode_frame, predict_proba_matrix
+
+APP_PATH = str(Path(__file__).resolve().parent / "apps.py")
+
+SAMPLE_FEATURES = {
+    "Gender": "Male",
+    "Age": 22,
+    "Academic Pressure": 4,
+    "Study Satisfaction": 2,
+    "Sleep Duration": "Less than 5 hours",
+    "Dietary Habits": "Unhealthy",
+    "Have you ever had suicidal thoughts ?": "Yes",
+    "Study Hours": 10,
+    "Financial Stress": 4,
+    "Family History of Mental Illness": "Yes",
+}
+
+# Jawaban form (label Indonesia) yang setara dengan SAMPLE_FEATURES
+FORM_ANSWERS_ID = [
+    "Laki-laki", "Berat", "Tidak puas", "Kurang dari 5 jam",
+    "Tidak sehat", "Ya", "10", "Tinggi", "Ya",
+]
+
+PAGES_ID = {"home": "Beranda", "about": "Tentang", "predict": "Prediksi Depresi"}
+
+
+# ------------------------------------------------------------------
+# Timing helpers
+# ------------------------------------------------------------------
+def summarize(samples):
+    """Seconds -> stats in milliseconds."""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": ms[len(ms) // 2],
+        "p95_ms": ms[min(len(ms) - 1, int(0.95 * len(ms)))],
+        "p99_ms": ms[min(len(ms) - 1, int(0.99 * len(ms)))],
+        "min_ms": ms[0],
+    }
+
+
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def measure_per_call(fn, calls, repeat=5):
+    """Per-call latency for very fast functions (timed in loops of ``calls``)."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / calls)
+    stats = summarize(samples)
+    stats["us_per_call"] = stats["p50_ms"] * 1000
+    return stats
+
+
+def disable_side_effects():
+    """Keep synthetic predictions out of the real audit log and drift monitor.
+
+    apps.py logs every prediction (audit_log.py) and feeds the drift monitor
+    (drift.py); both read their switch from the environment when first
+    imported, which for AppTest is inside this process (subprocesses inherit
+    it).
+    """
+    os.environ["AUDIT_LOG"] = "0"
+    os.environ["DRIFT_MONITOR"] = "0"
+    for name, attr in (("audit_log", "default_log"), ("drift", "default_monitor")):
+        module = sys.modules.get(name)
+        if module is not None:
+            setattr(module, attr, None)
+
+
+def run_subprocess(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True,
+                   cwd=resources.BASE_DIR, capture_output=True)
+    return time.perf_counter() - start
+
+
+# ------------------------------------------------------------------
+# Sections
+# ------------------------------------------------------------------
+def bench_cold(repeat):
+    imports = "import streamlit, pandas, joblib, sklearn.linear_model"
+    first_run = (
+        "from streamlit.testing.v1 import AppTest\n"
+        f"AppTest.from_file({APP_PATH!r}, default_timeout=120).run()"
+    )
+    return {
+        "interpreter": summarize([run_subprocess("pass") for _ in range(repeat)]),
+        "import_dependencies": summarize([run_subprocess(imports) for _ in range(repeat)]),
+        "first_script_run": summarize([run_subprocess(first_run) for _ in range(repeat)]),
+    }
+
+
+def bench_loading(repeat):
+    results = {
+        "read_dataset_uncached": measure(
+            lambda: resources._read_dataset(resources.PRIMER_PATH, resources.SEKUNDER_PATH), repeat),
+        "joblib_load_uncached": measure(lambda: resources._read_bundle(resources.MODEL_PATH), repeat),
+        "predictor_build": measure(
+            lambda: Predictor.from_bundle(resources._read_bundle(resources.MODEL_PATH)), repeat),
+        "load_all_cached": measure_per_call(
+            lambda: (resources.load_dataset(), resources.load_bundle(), resources.load_predictor()), 1000),
+    }
+    if resources.DATASET_STORE_PATH.exists():
+        results["read_store_uncached"] = measure(
+            lambda: resources._read_store(resources.DATASET_STORE_PATH), repeat)
+    return results
+
+
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(APP_PATH, default_timeout=120)
+
+
+def _select(at, label, value):
+    for box in at.selectbox:
+        if box.label == label:
+            box.set_value(value)
+            return
+    raise KeyError(label)
+
+
+def _fill_form(at):
+    boxes = [b for b in at.selectbox if b.label not in ("Pilih Halaman", "🌐 Pilih Bahasa / Choose Language")]
+    for box, value in zip(boxes, FORM_ANSWERS_ID):
+        box.set_value(value)
+
+
+def bench_reruns(repeat):
+    results = {}
+    for page_id, page_label in PAGES_ID.items():
+        at = _app_test().run()
+        _select(at, "Pilih Halaman", page_label)
+        at.run()
+
+        if page_id == "predict":
+            def rerun():
+                _fill_form(at)
+                at.button[0].click()
+                at.run()
+        else:
+            def rerun():
+                at.run()
+
+        results[page_id] = measure(rerun, repeat)
+        if at.exception:
+            raise RuntimeError(f"{page_id}: {at.exception}")
+    return results
+
+
+def legacy_predict(bundle, features):
+    """The original show_predict() path (5x LabelEncoder, 2 DataFrames, predict_proba)."""
+    encoders = bundle["encoders"]
+    row = {col: (encoders[col].transform([features[col]])[0] if col in CATEGORICAL_COLUMNS else features[col])
+           for col in FEATURE_COLUMNS}
+    input_data = pd.DataFrame([row])
+    input_scaled = pd.DataFrame(bundle["scaler"].transform(input_data), columns=input_data.columns)
+    return bundle["model"].predict_proba(input_scaled)[0][1]
+
+
+def bench_single():
+    bundle = resources.load_bundle()
+    predictor = resources.load_predictor()
+    results = {
+        "legacy_sklearn": measure_per_call(lambda: legacy_predict(bundle, SAMPLE_FEATURES), 50),
+        "predictor": measure_per_call(lambda: predictor.predict(SAMPLE_FEATURES), 20000),
+    }
+    table = resources.load_risk_table()
+    if table is not None:
+        results["risk_table"] = measure_per_call(lambda: table.lookup(SAMPLE_FEATURES), 20000)
+    return results
+
+
+def bench_batch(sizes):
+    bundle = resources.load_bundle()
+    predictor = resources.load_predictor()
+    df = resources.load_dataset()
+    results = {}
+    for size in sizes:
+        frame = df.sample(n=size, replace=True, random_state=0).reset_index(drop=True)
+        paths = {
+            "sklearn": lambda: predict_proba_matrix(encode_frame(frame, bundle["encoders"]),
+                                                    bundle["model"], bundle["scaler"]),
+            "predictor": lambda: predictor.predict_proba_matrix(predictor.encode_frame(frame)),
+        }
+        results[str(size)] = {}
+        for name, fn in paths.items():
+            stats = measure(fn, repeat=max(3, min(50, 200_000 // size)))
+            stats["rows_per_s"] = size / (stats["p50_ms"] / 1000)
+            results[str(size)][name] = stats
+    return results
+
+
+# ------------------------------------------------------------------
+# Compare
+# ------------------------------------------------------------------
+def flatten(results, prefix=""):
+    """{"a": {"b": {"p50_ms": 1}}} -> {"a.b": 1} (p50 of every timed entry)."""
+    out = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            if "p50_ms" in value:
+                out[prefix + key] = value["p50_ms"]
+            else:
+                out.update(flatten(value, prefix + key + "."))
+    return out
+
+
+def compare(new, old):
+    new_flat = flatten(new["results"])
+    old_flat = flatten(old["results"])
+    print(f"{'metric':<48} {'old p50 ms':>12} {'new p50 ms':>12} {'ratio':>8}")
+    for key in sorted(new_flat.keys() & old_flat.keys()):
+        ratio = new_flat[key] / old_flat[key] if old_flat[key] else float("nan")
+        flag = "  REGRESSION" if ratio > 1.2 else ""
+        print(f"{key:<48} {old_flat[key]:>12.4f} {new_flat[key]:>12.4f} {ratio:>8.2f}{flag}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=resources.BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark apps.py startup, reruns and inference.")
+    parser.add_argument("-o", "--output", help="write JSON results here")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    parser.add_argument("--sections", nargs="+", default=["cold", "loading", "rerun", "single", "batch"],
+                        choices=["cold", "loading", "rerun", "single", "batch"])
+    parser.add_argument("--quick", action="store_true", help="fewer repeats")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    disable_side_effects()
+    repeat = 3 if args.quick else 10
+    sizes = [1, 100, 10_000] if args.quick else [1, 100, 10_000, 100_000]
+
+    sections = {
+        "cold": lambda: bench_cold(2 if args.quick else 5),
+        "loading": lambda: bench_loading(repeat),
+        "rerun": lambda: bench_reruns(repeat),
+        "single": bench_single,
+        "batch": lambda: bench_batch(sizes),
+    }
+    results = {}
+    for name in args.sections:
+        start = time.perf_counter()
+        results[name] = sections[name]()
+        print(f"[{name}] done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""\
+bench_models.py
+-----------------
+Latency-vs-accuracy benchmark of candidate model families for
+model_depression.joblib.
+
+Every candidate is trained on the same encoded features (train.py:
+LabelEncoder codes of the merged Primer + Sekunder data, FEATURE_COLUMNS
+order) and measured on:
+- quality:    stratified k-fold CV (same seed for every candidate): ROC AUC
+              per fold (mean +- std), plus F1 at the serving threshold,
+              log loss and Brier score of the pooled out-of-fold
+              probabilities
+- single:     one-row latency (us) on the path the app would serve it with:
+              scoring.Predictor (folded linear model, dict lookups + a short
+              float loop) for logistic candidates, dict lookups +
+              estimator.predict_proba otherwise
+- batch:      rows/s on --batch-size encoded rows
+- size:       bytes of the joblib bundle ({"model", "scaler", "encoders"}
+              for logistic candidates, the same shape apps.py loads;
+              {"model", "encoders"} otherwise) and of the slim JSON where
+              the model folds
+- load:       joblib.load time of that bundle from memory
+
+Candidates: the shipped model's hyperparameters ("current"), regularized
+logistic variants, shallow decision trees, a shallow random forest,
+gradient boosting (classic + histogram) and a small MLP. CV folds run in
+parallel (--n-jobs); all timings run one at a time in this process.
+
+The report marks, per cost axis, the candidates on the Pareto front of CV
+ROC AUC vs that cost (no other candidate is at least as accurate and
+cheaper), and recommends the cheapest single-row candidate within
+--tolerance AUC of the best one. Only logistic candidates can be swapped
+into model_depression.joblib without changing scoring.Predictor.
+
+Run:
+    python bench_models.py
+    python bench_models.py --quick -o models.json
+    python bench_models.py --candidates current logreg_l1 hist_gbm --folds 10
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import warnings
+from collections import namedtuple
+from pathlib import Path
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss, log_loss, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+import resources
+from bench_app import SAMPLE_FEATURES, git_commit, measure, measure_per_call
+from scoring import CATEGORICAL_COLUMNS, DEFAULT_THRESHOLD, FEATURE_COLUMNS, Predictor
+from train import SEED, classification_metrics, encode_dataset, fit_encoders
+
+# family: "logistic" (foldable into scoring.Predictor), "tree", "boosting", "mlp"
+Candidate = namedtuple("Candidate", "name family make")
+
+AXES = {
+    # axis: (result key, lower is better, label, report mark)
+    "latency": ("single_us", True, "single-row us", "L"),
+    "throughput": ("rows_per_s", False, "rows/s", "T"),
+    "size": ("bundle_bytes", True, "bundle bytes", "S"),
+    "load": ("load_ms", True, "load ms", "D"),
+}
+
+
+# ------------------------------------------------------------------
+# Candidates
+# ------------------------------------------------------------------
+def _penalty(l1_ratio):
+    # sklearn >= 1.8 memilih penalti lewat l1_ratio saja; versi lama butuh penalty="elasticnet"
+    major, minor = (int(part) for part in sklearn.__version__.split(".")[:2])
+    if (major, minor) >= (1, 8):
+        return {"l1_ratio": l1_ratio}
+    return {"penalty": "elasticnet", "l1_ratio": l1_ratio}
+
+
+def _logistic(**params):
+    return Pipeline([("scaler", StandardScaler()), ("model", LogisticRegression(max_iter=1000, **params))])
+
+
+def candidates(bundle=None, seed=SEED):
+    """All candidates; "current" clones the shipped model's hyperparameters when ``bundle`` is given."""
+    found = []
+    if bundle is not None:
+        found.append(Candidate("current", "logistic", lambda: Pipeline([
+            ("scaler", StandardScaler()), ("model", clone(bundle["model"]).set_params(max_iter=1000))])))
+    found += [
+        Candidate("logreg_l2", "logistic", lambda: _logistic(C=1.0)),
+        Candidate("logreg_l2_balanced", "logistic", lambda: _logistic(C=1.0, class_weight="balanced")),
+        Candidate("logreg_l1", "logistic", lambda: _logistic(C=0.1, solver="saga", **_penalty(1.0))),
+        Candidate("logreg_elasticnet", "logistic", lambda: _logistic(C=0.1, solver="saga", **_penalty(0.5))),
+        Candidate("tree_d3", "tree", lambda: DecisionTreeClassifier(max_depth=3, min_samples_leaf=20,
+                                                                    random_state=seed)),
+        Candidate("tree_d5", "tree", lambda: DecisionTreeClassifier(max_depth=5, min_samples_leaf=20,
+                                                                    random_state=seed)),
+        Candidate("forest_d6", "tree", lambda: RandomForestClassifier(n_estimators=50, max_depth=6,
+                                                                      min_samples_leaf=10, random_state=seed)),
+        Candidate("gbm_d2", "boosting", lambda: GradientBoostingClassifier(n_estimators=100, max_depth=2,
+                                                                           random_state=seed)),
+        Candidate("hist_gbm", "boosting", lambda: HistGradientBoostingClassifier(
+            max_iter=100, max_depth=3, categorical_features=[FEATURE_COLUMNS.index(col) for col in CATEGORICAL_COLUMNS],
+            random_state=seed)),
+        Candidate("mlp_16", "mlp", lambda: Pipeline([
+            ("scaler", StandardScaler()),
+            # Data hanya ~540 baris: tanpa early_stopping (validasi 10% terlalu kecil)
+            ("model", MLPClassifier(hidden_layer_sizes=(16,), alpha=1e-2, max_iter=1000, random_state=seed))])),
+    ]
+    return found
+
+
+# ------------------------------------------------------------------
+# Quality
+# ------------------------------------------------------------------
+def _fit_fold(make, X, y, train, test):
+    start = time.perf_counter()
+    model = make().fit(X[train], y[train])
+    fit_s = time.perf_counter() - start
+    return test, model.predict_proba(X[test])[:, 1], fit_s
+
+
+def cross_validate(cands, X, y, folds=5, seed=SEED, n_jobs=-1, threshold=DEFAULT_THRESHOLD):
+    """{name: quality metrics}; every candidate sees the same folds."""
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(X, y))
+    tasks = [(cand, train, test) for cand in cands for train, test in splits]
+    fits = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_fit_fold)(cand.make, X, y, train, test) for cand, train, test in tasks
+    )
+    results = {}
+    for i, cand in enumerate(cands):
+        parts = fits[i * folds:(i + 1) * folds]
+        oof = np.empty(len(y))
+        aucs = []
+        for test, prob, _ in parts:
+            oof[test] = prob
+            aucs.append(roc_auc_score(y[test], prob))
+        pooled = classification_metrics(y, oof, threshold)
+        results[cand.name] = {
+            "roc_auc": float(np.mean(aucs)),
+            "roc_auc_std": float(np.std(aucs)),
+            "f1": pooled["f1"],
+            "recall": pooled["recall"],
+            "log_loss": float(log_loss(y, np.clip(oof, 1e-15, 1 - 1e-15))),
+            "brier": float(brier_score_loss(y, oof)),
+            "fit_s": float(np.mean([fit_s for _, _, fit_s in parts])),
+        }
+    return results
+
+
+# ------------------------------------------------------------------
+# Serving cost
+# ------------------------------------------------------------------
+def _per_call(fn, budget=0.2):
+    """measure_per_call with the loop length sized so one repeat takes ~``budget`` s."""
+    start = time.perf_counter()
+    fn()
+    once = max(time.perf_counter() - start, 1e-7)
+    return measure_per_call(fn, max(5, min(20000, int(budget / once))))
+
+
+def _folded(model, encoders, threshold):
+    """scoring.Predictor for a fitted scaler + LogisticRegression pipeline."""
+    scaler, lr = model.named_steps["scaler"], model.named_steps["model"]
+    classes = {col: encoders[col].classes_.tolist() for col in CATEGORICAL_COLUMNS}
+    return Predictor(classes, scaler.mean_, scaler.scale_, lr.coef_[0], lr.intercept_[0], threshold)
+
+
+def serving_cost(cand, model, encoders, X_batch, repeat=5, threshold=DEFAULT_THRESHOLD):
+    """Single-row latency, batch throughput, bundle size and load time of a fitted ``model``."""
+    result = {"family": cand.family, "folded": cand.family == "logistic"}
+    if result["folded"]:
+        predictor = _folded(model, encoders, threshold)
+        single = lambda: predictor.predict_proba(SAMPLE_FEATURES)  # noqa: E731
+        batch = lambda: predictor.predict_proba_matrix(X_batch)  # noqa: E731
+        bundle = {"model": model.named_steps["model"], "scaler": model.named_steps["scaler"], "encoders": encoders}
+        result["slim_bytes"] = len(json.dumps(predictor.to_slim()))
+    else:
+        # Jalur sklearn yang paling ringan: lookup kode sendiri, satu baris ndarray
+        codes = {col: {cls: code for code, cls in enumerate(encoders[col].classes_)} for col in CATEGORICAL_COLUMNS}
+
+        def single():
+            x = [codes[col][SAMPLE_FEATURES[col]] if col in codes else SAMPLE_FEATURES[col] for col in FEATURE_COLUMNS]
+            return model.predict_proba(np.array([x], dtype=np.float64))[0, 1]
+
+        batch = lambda: model.predict_proba(X_batch)[:, 1]  # noqa: E731
+        bundle = {"model": model, "encoders": encoders}
+
+    stats = _per_call(single)
+    result["single_us"] = stats["us_per_call"]
+    stats = measure(batch, repeat=repeat)
+    result["rows_per_s"] = len(X_batch) / (stats["p50_ms"] / 1000)
+
+    buffer = io.BytesIO()
+    joblib.dump(bundle, buffer)
+    data = buffer.getvalue()
+    result["bundle_bytes"] = len(data)
+    result["load_ms"] = measure(lambda: joblib.load(io.BytesIO(data)), repeat=repeat)["p50_ms"]
+    return result
+
+
+# ------------------------------------------------------------------
+# Pareto report
+# ------------------------------------------------------------------
+def pareto_front(results, cost_key, lower_is_better=True, quality_key="roc_auc"):
+    """Names no other candidate dominates on (quality up, cost down / up)."""
+    def cost(name):
+        value = results[name][cost_key]
+        return value if lower_is_better else -value
+
+    front = []
+    for name in results:
+        dominated = any(
+            results[other][quality_key] >= results[name][quality_key] and cost(other) <= cost(name)
+            and (results[other][quality_key] > results[name][quality_key] or cost(other) < cost(name))
+            for other in results if other != name
+        )
+        if not dominated:
+            front.append(name)
+    return sorted(front, key=lambda name: -results[name][quality_key])
+
+
+def recommend(results, tolerance):
+    """Fastest single-row candidate whose CV ROC AUC is within ``tolerance`` of the best."""
+    best = max(result["roc_auc"] for result in results.values())
+    close = [name for name, result in results.items() if result["roc_auc"] >= best - tolerance]
+    return min(close, key=lambda name: results[name]["single_us"])
+
+
+def print_report(results, fronts, recommended, tolerance):
+    marks = {axis: mark for axis, (_, _, _, mark) in AXES.items()}
+    print(f"{'candidate':<20} {'family':<9} {'ROC AUC':>15} {'F1':>6} {'Brier':>6} {'single us':>10} "
+          f"{'rows/s':>11} {'size KB':>8} {'load ms':>8}  front")
+    for name, r in sorted(results.items(), key=lambda item: -item[1]["roc_auc"]):
+        front = "".join(marks[axis] if name in fronts[axis] else "." for axis in AXES)
+        print(f"{name:<20} {r['family']:<9} {r['roc_auc']:>8.4f}+-{r['roc_auc_std']:.4f} {r['f1']:>6.3f} "
+              f"{r['brier']:>6.3f} {r['single_us']:>10.1f} {r['rows_per_s']:>11,.0f} "
+              f"{r['bundle_bytes'] / 1024:>8.1f} {r['load_ms']:>8.2f}  {front}")
+    print("front: Pareto-optimal on ROC AUC vs " + ", ".join(
+        f"{mark}={label}" for _, _, label, mark in AXES.values()))
+    r = results[recommended]
+    note = "" if r["folded"] else " (not foldable: scoring.Predictor cannot serve it as is)"
+    print(f"✅ Recommended: {recommended} (ROC AUC {r['roc_auc']:.4f}, {r['single_us']:.1f} us/row; "
+          f"fastest within {tolerance} AUC of the best){note}")
+
+
+def main(argv=None):
+    names = ["current"] + [cand.name for cand in candidates()]
+    parser = argparse.ArgumentParser(description="Benchmark CV quality vs serving cost of candidate models.")
+    parser.add_argument("-o", "--output", help="write JSON results here")
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="shipped bundle (for \"current\")")
+    parser.add_argument("--candidates", nargs="+", choices=names, help="subset to run (default: all)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="parallel CV workers (-1 = all cores)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="rows per throughput call")
+    parser.add_argument("--tolerance", type=float, default=0.005, help="AUC slack for the recommendation")
+    parser.add_argument("--quick", action="store_true", help="3 folds, fewer repeats")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    folds = 3 if args.quick else args.folds
+    repeat = 3 if args.quick else 7
+
+    try:
+        bundle = resources.load_bundle(args.model)
+    except OSError as e:
+        print(f"⚠️ {e}; skipping \"current\"", file=sys.stderr)
+        bundle = None
+    threshold = bundle.get("threshold", DEFAULT_THRESHOLD) if bundle else DEFAULT_THRESHOLD
+    cands = [cand for cand in candidates(bundle, args.seed) if not args.candidates or cand.name in args.candidates]
+
+    df = resources.load_dataset()
+    encoders = fit_encoders(df)
+    X, y = encode_dataset(df, encoders)
+    X = X.to_numpy()
+    X_batch = X[np.random.default_rng(args.seed).integers(0, len(X), size=args.batch_size)]
+
+    start = time.perf_counter()
+    results = cross_validate(cands, X, y, folds=folds, seed=args.seed, n_jobs=args.n_jobs, threshold=threshold)
+    print(f"[cv] {len(cands)} candidates x {folds} folds in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    start = time.perf_counter()
+    for cand in cands:
+        model = cand.make().fit(X, y)
+        results[cand.name].update(serving_cost(cand, model, encoders, X_batch, repeat=repeat, threshold=threshold))
+    print(f"[serving] done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    fronts = {axis: pareto_front(results, key, lower) for axis, (key, lower, _, _) in AXES.items()}
+    recommended = recommend(results, args.tolerance)
+    print_report(results, fronts, recommended, args.tolerance)
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sklearn": sklearn.__version__,
+            "numpy": np.__version__,
+            "rows": int(len(y)),
+            "folds": folds,
+            "seed": args.seed,
+            "threshold": threshold,
+            "results": results,
+            "pareto": fronts,
+            "recommended": recommended,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"✅ Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""\
+calibrate.py
+-----------------
+Choose the decision threshold from data and store it in the model bundle.
+
+The labelled rows (default: merged Primer + Sekunder dataset) are scored
+once. Precision, recall, F1 and cost for *every* distinct threshold then come
+from one sort plus cumulative sums:
+    sort probabilities descending -> cumsum(labels) = TP, cumsum(1 - labels) = FP
+so no threshold is ever re-predicted and the report stays O(n log n).
+
+Objectives:
+- f1      maximize F1
+- cost    minimize cost_fn * FN + cost_fp * FP
+- recall  highest threshold whose recall >= --min-recall
+
+With --write the chosen threshold is saved as bundle["threshold"] (plus a
+small bundle["calibration"] summary) and the slim export and risk table
+are refreshed with it (train.publish_bundle); apps.py, batch_score.py and
+server.py read it through scoring.Predictor. Bundles without it keep using
+0.3.
+
+Run:
+    python calibrate.py                               # report only
+    python calibrate.py --objective recall --min-recall 0.95 --write
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import resources
+from scoring import CATEGORICAL_COLUMNS, DEFAULT_THRESHOLD, TARGET_COLUMN
+from train import publish_bundle, target_values
+
+REPORT_THRESHOLDS = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+# ------------------------------------------------------------------
+# Curves
+# ------------------------------------------------------------------
+def threshold_curves(prob, y, cost_fn=1.0, cost_fp=1.0):
+    """Confusion counts and metrics for every distinct threshold (descending).
+
+    Row k describes the rule "predict 1 if prob >= thresholds[k]".
+    """
+    prob = np.asarray(prob, dtype=np.float64)
+    y = np.asarray(y, dtype=np.int64)
+    order = np.argsort(-prob, kind="mergesort")
+    p = prob[order]
+    t = y[order]
+
+    # Indeks terakhir dari tiap nilai probabilitas yang sama
+    last = np.r_[np.flatnonzero(np.diff(p)), len(p) - 1]
+    tp = np.cumsum(t)[last]
+    fp = np.cumsum(1 - t)[last]
+
+    pos = int(t.sum())
+    neg = len(t) - pos
+    fn = pos - tp
+    tn = neg - fp
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = tp / (tp + fp)
+        recall = tp / pos if pos else np.full(len(tp), np.nan)
+        f1 = 2 * tp / (2 * tp + fp + fn)
+    return {
+        "thresholds": p[last],
+        "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "cost": cost_fn * fn + cost_fp * fp,
+        "cost_fn": cost_fn,
+        "cost_fp": cost_fp,
+    }
+
+
+def metrics_at(curves, threshold):
+    """Metrics of the rule "prob >= threshold" read off the curves."""
+    thresholds = curves["thresholds"]
+    k = int(np.searchsorted(-thresholds, -threshold, side="right")) - 1
+    if k < 0:
+        # Tidak ada yang diprediksi positif
+        pos = int(curves["tp"][-1] + curves["fn"][-1])
+        neg = int(curves["fp"][-1] + curves["tn"][-1])
+        return {"threshold": threshold, "tp": 0, "fp": 0, "fn": pos, "tn": neg,
+                "precision": float("nan"), "recall": 0.0, "f1": 0.0, "cost": curves["cost_fn"] * pos}
+    row = {name: curves[name][k].item() for name in ("tp", "fp", "fn", "tn", "precision", "recall", "f1", "cost")}
+    row["threshold"] = threshold
+    return row
+
+
+def choose_threshold(curves, objective="f1", min_recall=0.9):
+    """Pick an operating point; returns a threshold halfway to the next lower score."""
+    if objective == "f1":
+        k = int(np.nanargmax(curves["f1"]))
+    elif objective == "cost":
+        k = int(np.argmin(curves["cost"]))
+    elif objective == "recall":
+        ok = np.flatnonzero(curves["recall"] >= min_recall)
+        if not len(ok):
+            raise ValueError(f"no threshold reaches recall {min_recall}")
+        k = int(ok[0])
+    else:
+        raise ValueError(f"unknown objective {objective!r}")
+
+    thresholds = curves["thresholds"]
+    if k + 1 < len(thresholds):
+        return float((thresholds[k] + thresholds[k + 1]) / 2)
+    return float(thresholds[k])
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+def format_row(row):
+    return (f"{row['threshold']:>9.4f} {row['precision']:>9.4f} {row['recall']:>9.4f} "
+            f"{row['f1']:>9.4f} {row['cost']:>10.1f} {row['tp']:>7} {row['fp']:>7} {row['fn']:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate the decision threshold and store it in the bundle.")
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="model bundle (.joblib)")
+    parser.add_argument("--data", help="labelled CSV (default: merged Primer + Sekunder)")
+    parser.add_argument("--objective", choices=["f1", "cost", "recall"], default="f1")
+    parser.add_argument("--cost-fn", type=float, default=1.0, help="cost of a missed depressed student")
+    parser.add_argument("--cost-fp", type=float, default=1.0, help="cost of a false alarm")
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    parser.add_argument("--write", action="store_true", help="save the chosen threshold into the bundle")
+    args = parser.parse_args(argv)
+
+    bundle = resources.load_bundle(args.model)
+    predictor = resources.load_predictor(args.model)
+    if args.data:
+        df = pd.read_csv(args.data, dtype={c: str for c in CATEGORICAL_COLUMNS + [TARGET_COLUMN]})
+    else:
+        df = resources.load_dataset()
+
+    start = time.perf_counter()
+    prob = predictor.predict_proba_matrix(predictor.encode_frame(df))
+    y = target_values(df)
+    scored = time.perf_counter()
+    curves = threshold_curves(prob, y, args.cost_fn, args.cost_fp)
+    threshold = choose_threshold(curves, args.objective, args.min_recall)
+    done = time.perf_counter()
+
+    current = bundle.get("threshold", DEFAULT_THRESHOLD)
+    print(f"{len(df):,} labelled rows, {len(curves['thresholds']):,} distinct thresholds "
+          f"(score {1000 * (scored - start):.1f} ms, curves {1000 * (done - scored):.1f} ms)")
+    print(f"{'threshold':>9} {'precision':>9} {'recall':>9} {'f1':>9} {'cost':>10} {'tp':>7} {'fp':>7} {'fn':>7}")
+    for t in sorted(set(REPORT_THRESHOLDS + [current])):
+        print(format_row(metrics_at(curves, t)) + ("   <- current" if t == current else ""))
+    chosen = metrics_at(curves, threshold)
+    print(format_row(chosen) + f"   <- chosen ({args.objective})")
+
+    if args.write:
+        updated = dict(bundle)
+        updated["threshold"] = threshold
+        updated["calibration"] = {
+            "objective": args.objective,
+            "cost_fn": args.cost_fn,
+            "cost_fp": args.cost_fp,
+            "min_recall": args.min_recall if args.objective == "recall" else None,
+            "rows": int(len(df)),
+            "metrics": {k: chosen[k] for k in ("precision", "recall", "f1", "cost")},
+        }
+        published = publish_bundle(updated, args.model)
+        print(f"✅ Saved threshold {threshold:.4f} to {args.model} and {published['slim']} (was {current})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+"""\
+content.py
+-----------------
+Static UI content for apps.py, built once per process.
+
+Streamlit re-executes apps.py on every interaction, but modules it imports
+run only once. The long Home/About copy, both label dictionaries, the answer
+option maps and the page markup therefore live here, prepared per language
+in a ``Language`` object; a rerun only picks one from LANGUAGES.
+
+- LABELS_ID / LABELS_EN: short UI strings
+- Language.options: {feature column: {answer label: canonical value}} in
+  form order (canonical values are what the label encoders know)
+- Language.domains / answer_label(): the same answers as (label, value)
+  pairs, for the what-if chart and the contribution table
+- Language.*_html: ready-to-render markup for the Home and About pages
+"""
+
+from scoring import FEATURE_COLUMNS
+
+# ------------------------------------------------------------------
+# Long-form copy (Home & About) - Indonesia
+# ------------------------------------------------------------------
+HOME_DESC_ID = '''
+### 💬 Kenali Risiko Depresi dengan Cara yang Mudah dan Empatik
+
+Selamat datang di aplikasi prediksi risiko depresi untuk mahasiswa 🎓🧠
+
+Depresi adalah salah satu gangguan kesehatan mental yang paling umum dan sering disertai dengan kecemasan. Menurut WHO (2023), depresi ditandai oleh suasana hati yang tertekan, hilangnya minat terhadap aktivitas sehari-hari dalam jangka waktu yang lama, serta dapat mengganggu fungsi di lingkungan kerja atau pendidikan. 
+Tingkat keparahan depresi bervariasi, dari yang ringan dan sementara hingga yang berat dan berlangsung lama. Beberapa orang mungkin hanya mengalaminya sekali, sementara yang lain dapat mengalaminya berulang kali. Meskipun depresi dapat meningkatkan risiko bunuh diri, hal ini dapat dicegah jika individu mendapatkan dukungan yang tepat, terutama bagi remaja yang mengalami pikiran untuk mengakhiri hidup.
+
+🧩 **Bagaimana aplikasi ini bekerja?**
+- Isi pertanyaan - pertanyaan yang ada pada halaman "Prediksi Depresi".
+- Klik tombol "Prediksi" untuk memuatkan hasil.
+- Hasil beserta dengan saran akan muncul dibawah.
+'''
+
+ABOUT_DESC_ID = '''
+### 🎯 Tujuan Aplikasi
+
+Untuk mengidentifikasi seseorang yang mengalami depresi, diperlukan pendekatan berbasis analisis data terhadap gejala dan faktor risiko yang terkait dengan kondisi psikologis, seperti tekanan aktivitas, kualitas tidur, stres ekonomi, dan kepuasan hidup. Oleh karena itu, penggunaan teknologi sangat dibutuhkan untuk membantu mendeteksi risiko depresi secara sistematis dan otomatis. 
+- 🧠 Meningkatkan kesadaran mahasiswa terhadap pentingnya kesehatan mental.
+- 📊 Memberikan estimasi awal terkait risiko depresi secara otomatis dan personal.
+- 🤝 Menjadi alat bantu tambahan bagi dosen, konselor kampus, dan tenaga pendidik dalam memahami kondisi mahasiswa.
+
+---
+
+### ❓ Mengapa Aplikasi Ini Dibuat?
+
+Berdasarkan berbagai penelitian, mahasiswa termasuk dalam kelompok yang rentan mengalami gangguan kesehatan mental, terutama **depresi**, karena berbagai tekanan seperti:
+
+- **Beban akademik yang tinggi**
+- **Stres finansial**
+- **Kurangnya waktu tidur**
+- **Pola makan**
+- **Minimnya akses terhadap layanan psikologis**
+
+Namun, banyak dari mereka yang tidak menyadari atau enggan mencari bantuan karena stigma atau kurangnya informasi. Aplikasi ini hadir sebagai **langkah awal yang mudah, cepat, dan empatik** untuk mengenali kondisi tersebut.
+
+---
+
+### 🧪 Teknologi yang Digunakan
+
+Aplikasi ini menggunakan pendekatan **Machine Learning** untuk memprediksi risiko depresi. Berikut teknologi dan proses yang digunakan:
+
+- 🔍 **Model Machine Learning**: `Binary Logistic Regression` Model ini dipilih karena kesederhanaannya, kecepatan dalam inferensi, serta interpretabilitas tinggi untuk klasifikasi biner (*Depresi* vs *Tidak Depresi*).
+- 📈 **Preprocessing Data**: 
+  - Encoding label pada data kategorikal menggunakan `LabelEncoder`
+  - Standarisasi fitur numerik menggunakan `StandardScaler`
+- 🧪 **Pelatihan Model**:
+  - Data dibagi menjadi data latih dan uji 80:20 `train_test_split`
+  - Model dilatih untuk memprediksi variabel target: apakah seseorang mengalami depresi atau tidak berdasarkan data survei.
+- 🧠 **Fitur yang dipertimbangkan**:
+  - Jenis Kelamin
+  - Usia
+  - Tekanan Akademik
+  - Kepuasan Belajar
+  - Durasi Tidur
+  - Kebiasaan Makan
+  - Pikiran untuk Bunuh Diri
+  - Jam Belajar per Hari
+  - Stres Finansial
+  - Riwayat Gangguan Mental dalam Keluarga
+
+---
+
+### ⚠️ Catatan Penting
+
+Hasil prediksi dari aplikasi ini **bukan merupakan diagnosis klinis**, melainkan estimasi berbasis data. Untuk diagnosis atau penanganan lebih lanjut, silakan konsultasi dengan tenaga kesehatan mental profesional.
+
+---
+
+### 💡 Harapan Pengembang
+
+Semoga aplikasi ini dapat menjadi:
+- 🌱 Awal dari peningkatan kesadaran akan pentingnya kesehatan mental.
+- 🔑 Alat bantu sederhana dalam deteksi dini risiko depresi.
+- 🧩 Bagian dari solusi digital dalam mendukung kesejahteraan emosional mahasiswa.
+'''
+
+# ------------------------------------------------------------------
+# Long-form copy (Home & About) - English
+# ------------------------------------------------------------------
+HOME_DESC_EN = '''
+### 💬 Understand Depression Risk Easily and Empathetically
+
+Welcome to the student depression risk prediction app 🎓🧠
+
+Depression is one of the most common mental health disorders, often accompanied by anxiety. According to WHO (2023), depression is characterized by a persistently low mood, loss of interest in daily activities over a long period, and can interfere with functioning at work or in education.  
+The severity of depression varies, from mild and temporary to severe and long-lasting. Some people may experience it only once, while others may experience it repeatedly. Although depression can increase the risk of suicide, it can be prevented if individuals receive proper support, especially for adolescents who have suicidal thoughts.
+
+🧩 **How does this app work?**
+- Fill in the questions on the "Depression Prediction" page.
+- Click the "Predict" button to load the results.
+- The result and suggestions will appear below.
+'''
+
+ABOUT_DESC_EN = '''
+### 🎯 Purpose of the Application
+
+To identify someone experiencing depression, a data-driven approach is needed to analyze symptoms and risk factors related to psychological conditions, such as activity pressure, sleep quality, financial stress, and life satisfaction.  
+Therefore, technology is essential to help systematically and automatically detect depression risk.
+
+- 🧠 Increase students' awareness of the importance of mental health.
+- 📊 Provide an initial automated and personalized estimate of depression risk.
+- 🤝 Serve as an additional tool for lecturers, campus counselors, and educators to understand students' conditions.
+
+---
+
+### ❓ Why Was This App Created?
+
+Research shows that students are among the groups most vulnerable to mental health problems, especially **depression**, due to various pressures such as:
+
+- **High academic workload**
+- **Financial stress**
+- **Lack of sleep**
+- **Dietary habits**
+- **Limited access to psychological services**
+
+However, many students are unaware or reluctant to seek help due to stigma or lack of information. This app is a **first step that is simple, quick, and empathetic** in recognizing this condition.
+
+---
+
+### 🧪 Technology Used
+
+This application uses a **Machine Learning** approach to predict depression risk. Technologies and processes used include:
+
+- 🔍 **Machine Learning Model**: `Binary Logistic Regression`  
+  This model is chosen for its simplicity, fast inference, and high interpretability for binary classification (*Depression* vs *No Depression*).
+- 📈 **Data Preprocessing**:
+  - Label encoding for categorical data using `LabelEncoder`
+  - Standardizing numeric features using `StandardScaler`
+- 🧪 **Model Training**:
+  - Data is split into training and test sets (80:20) using `train_test_split`
+  - The model is trained to predict the target variable: whether someone is experiencing depression based on survey data.
+- 🧠 **Features considered**:
+  - Gender
+  - Age
+  - Academic Pressure
+  - Study Satisfaction
+  - Sleep Duration
+  - Dietary Habits
+  - Suicidal Thoughts
+  - Study Hours per Day
+  - Financial Stress
+  - Family History of Mental Illness
+
+---
+
+### ⚠️ Important Note
+
+The predictions from this app **are not clinical diagnoses**, but data-based estimates.  
+For further diagnosis or treatment, please consult a mental health professional.
+
+---
+
+### 💡 Developer’s Hope
+
+We hope this app can be:
+- 🌱 A starting point to raise awareness of the importance of mental health.
+- 🔑 A simple tool for early detection of depression risk.
+- 🧩 A part of digital solutions to support students' emotional well-being.
+'''
+
+# ------------------------------------------------------------------
+# Label dictionaries (short UI strings)
+# ------------------------------------------------------------------
+LABELS_ID = {
+    "home_title": "Prediksi Risiko Depresi Untuk Mahasiswa",
+    "home_desc": HOME_DESC_ID,
+    "about_title": "ℹ️ Tentang Website",
+    "about_desc": ABOUT_DESC_ID,
+    "predict_title": "🧠 Prediksi Risiko Depresi Mahasiswa",
+    "predict_desc": "Isi formulir di bawah untuk memprediksi apakah anda berpotensi mengalami depresi.",
+    "gender": "Jenis Kelamin",
+    "age": "Usia",
+    "academic_pressure": "Seberapa Besar Tekanan Akademik Yang Anda Rasakan",
+    "study_satisfaction": "Seberapa Puas Kepuasan Belajar Anda Dalam Belajar",
+    "sleep_duration": "Berapa Durasi Tidur Anda Dalam Sehari",
+    "dietary_habits": "Bagaimana Pola Makan Anda Sehari Hari",
+    "suicidal_thoughts": "Pernahkah Anda Berpikir Untuk Bunuh Diri?",
+    "study_hours": "Seberapa Lama Anda Belajar Dalam Satu Hari",
+    "financial_stress": "Seberapa Besar Stres Finansial Anda",
+    "family_history": "Apakah Ada Riwayat Gangguan Mental Dalam Keluarga Anda",
+    "predict_button": "Prediksi",
+    "result_yes": "🚨 Mahasiswa ini kemungkinan mengalami depresi.",
+    "result_no": "✅ Mahasiswa ini tidak terindikasi mengalami depresi.",
+    "warning": "⚠️ Lengkapi semua pilihan!",
+}
+
+LABELS_EN = {
+    "home_title": "Student Depression Risk Prediction",
+    "home_desc": HOME_DESC_EN,
+    "about_title": "ℹ️ About This Website",
+    "about_desc": ABOUT_DESC_EN,
+    "predict_title": "🧠 Student Depression Risk Prediction",
+    "predict_desc": "Fill out the form below to predict whether you are at risk of depression.",
+    "gender": "Gender",
+    "age": "Age",
+    "academic_pressure": "How Much Academic Pressure Do You Feel?",
+    "study_satisfaction": "How Satisfied Are You With Your Studies?",
+    "sleep_duration": "How Long Do You Sleep Daily?",
+    "dietary_habits": "What Is Your Daily Dietary Habit?",
+    "suicidal_thoughts": "Have You Ever Had Suicidal Thoughts?",
+    "study_hours": "How Many Hours Do You Study Daily?",
+    "financial_stress": "How Much Financial Stress Do You Experience?",
+    "family_history": "Is There a Family History of Mental Illness?",
+    "predict_button": "Predict",
+    "result_yes": "🚨 This student is likely experiencing depression.",
+    "result_no": "✅ This student does not show signs of depression.",
+    "warning": "⚠️ Please complete all selections.",
+}
+
+# ------------------------------------------------------------------
+# Answer options (display -> canonical English used by encoders)
+# ------------------------------------------------------------------
+OPTIONS_ID = {
+    "Gender": {"Laki-laki": "Male", "Perempuan": "Female"},
+    # tambahan mapping skala (1–5 / 0–5)
+    "Academic Pressure": {
+        "Sangat ringan": 1,
+        "Ringan": 2,
+        "Sedang": 3,
+        "Berat": 4,
+        "Sangat berat": 5
+    },
+    "Study Satisfaction": {
+        "Sangat tidak puas": 1,
+        "Tidak puas": 2,
+        "Netral": 3,
+        "Puas": 4,
+        "Sangat puas": 5
+    },
+    "Sleep Duration": {
+        "Kurang dari 5 jam": "Less than 5 hours",
+        "5-6 jam": "5-6 hours",
+        "7-8 jam": "7-8 hours",
+        "Lebih dari 8 jam": "More than 8 hours",
+    },
+    "Dietary Habits": {"Sehat": "Healthy", "Sedang": "Moderate", "Tidak sehat": "Unhealthy"},
+    "Have you ever had suicidal thoughts ?": {"Ya": "Yes", "Tidak": "No"},
+    "Study Hours": {str(i): i for i in range(0, 13)},
+    "Financial Stress": {
+        "Tidak ada": 0,
+        "Sangat rendah": 1,
+        "Rendah": 2,
+        "Sedang": 3,
+        "Tinggi": 4,
+        "Sangat tinggi": 5
+    },
+    "Family History of Mental Illness": {"Ya": "Yes", "Tidak": "No"},
+}
+
+OPTIONS_EN = {
+    "Gender": {"Male": "Male", "Female": "Female"},
+    # tambahan mapping skala (1–5 / 0–5)
+    "Academic Pressure": {
+        "Very light": 1,
+        "Light": 2,
+        "Moderate": 3,
+        "Heavy": 4,
+        "Very heavy": 5
+    },
+    "Study Satisfaction": {
+        "Very dissatisfied": 1,
+        "Dissatisfied": 2,
+        "Neutral": 3,
+        "Satisfied": 4,
+        "Very satisfied": 5
+    },
+    "Sleep Duration": {
+        "Less than 5 hours": "Less than 5 hours",
+        "5-6 hours": "5-6 hours",
+        "7-8 hours": "7-8 hours",
+        "More than 8 hours": "More than 8 hours",
+    },
+    "Dietary Habits": {"Healthy": "Healthy", "Moderate": "Moderate", "Unhealthy": "Unhealthy"},
+    "Have you ever had suicidal thoughts ?": {"Yes": "Yes", "No": "No"},
+    "Study Hours": {str(i): i for i in range(0, 13)},
+    "Financial Stress": {
+        "None": 0,
+        "Very low": 1,
+        "Low": 2,
+        "Moderate": 3,
+        "High": 4,
+        "Very high": 5
+    },
+    "Family History of Mental Illness": {"Yes": "Yes", "No": "No"},
+}
+
+# Usia diisi lewat number_input, bukan selectbox
+AGE_RANGE = range(18, 35)
+
+# Kolom fitur -> kunci LABELS (pertanyaan di form)
+FEATURE_LABEL_KEYS = {
+    "Gender": "gender",
+    "Age": "age",
+    "Academic Pressure": "academic_pressure",
+    "Study Satisfaction": "study_satisfaction",
+    "Sleep Duration": "sleep_duration",
+    "Dietary Habits": "dietary_habits",
+    "Have you ever had suicidal thoughts ?": "suicidal_thoughts",
+    "Study Hours": "study_hours",
+    "Financial Stress": "financial_stress",
+    "Family History of Mental Illness": "family_history",
+}
+
+# ------------------------------------------------------------------
+# Disclaimer card (Home)
+# ------------------------------------------------------------------
+DISCLAIMER_ID = '''
+<div style="background: #2c2f33; border-radius: 12px; padding: 1.5rem; margin-top: 2rem; 
+         border-left: 6px solid #5865F2; box-shadow: 0 4px 12px rgba(0,0,0,0.2); 
+         max-width: 900px; margin-left: auto; margin-right: auto;">
+
+  <div style="margin-bottom: 1.2rem;">
+    <h4 style="margin: 0; color: #ffffff; font-size: 20px;">✨ <strong>Harap diingat:</strong></h4>
+    <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
+      Prediksi ini bukan pengganti diagnosis profesional. Hasil yang ditampilkan hanya bersifat estimasi berdasarkan data input yang diberikan.
+    </p>
+  </div>
+
+  <div style="margin-bottom: 1.2rem;">
+    <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💬 <strong>Jika kamu merasa kesulitan:</strong></h4>
+    <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
+      Jangan ragu untuk mencari bantuan profesional seperti psikolog kampus, konselor, atau layanan kesehatan mental lainnya.
+    </p>
+  </div>
+
+  <div>
+    <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💡 <strong>Tips:</strong></h4>
+    <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
+      Gunakan aplikasi ini sebagai langkah awal untuk mengenali, memahami, dan menjaga kesehatan mentalmu!
+    </p>
+  </div>
+</div>
+'''
+
+DISCLAIMER_EN = '''
+<div style="background: #2c2f33; border-radius: 12px; padding: 1.5rem; margin-top: 2rem; 
+            border-left: 6px solid #5865F2; box-shadow: 0 4px 12px rgba(0,0,0,0.2); 
+            max-width: 900px; margin-left: auto; margin-right: auto;">
+
+  <div style="margin-bottom: 1.2rem;">
+    <h4 style="margin: 0; color: #ffffff; font-size: 20px;">✨ <strong>Note:</strong></h4>
+    <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
+      This prediction is not a substitute for professional diagnosis. The results shown are only estimates based on your input.
+    </p>
+  </div>
+
+  <div style="margin-bottom: 1.2rem;">
+    <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💬 <strong>If you feel distressed:</strong></h4>
+    <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
+      Do not hesitate to seek professional help such as campus psychologists, counselors, or mental health services.
+    </p>
+  </div>
+
+  <div>
+    <h4 style="margin: 0; color: #ffffff; font-size: 20px;">💡 <strong>Tips:</strong></h4>
+    <p style="margin: 0.3rem 0 0; color: #dcdcdc; font-size: 16px;">
+      Use this app as a first step to recognize, understand, and maintain your mental health!
+    </p>
+  </div>
+</div>
+'''
+
+
+# ------------------------------------------------------------------
+# Per-language bundle
+# ------------------------------------------------------------------
+class Language:
+    """Everything a rerun needs for one language, prepared once."""
+
+    def __init__(self, name, labels, options, home_desc, disclaimer, pages, nav_title, page_label, placeholder):
+        self.name = name
+        self.labels = labels
+        self.options = options
+        self.placeholder = placeholder
+        self.nav_title = nav_title
+        self.page_label = page_label
+        self.pages = pages                                    # id -> label
+        self.page_ids = {label: page for page, label in pages.items()}
+
+        # Pertanyaan dan jawaban per kolom, urutan form
+        self.questions = {col: labels[FEATURE_LABEL_KEYS[col]] for col in FEATURE_COLUMNS}
+        self.domains = {
+            col: [(str(age), age) for age in AGE_RANGE] if col == "Age" else list(options[col].items())
+            for col in FEATURE_COLUMNS
+        }
+        self._answer_labels = {col: {value: label for label, value in domain}
+                               for col, domain in self.domains.items()}
+
+        self.home_title_html = f'''<h1 style="text-align:center; font-size: 36px; font-weight: bold; margin-bottom: 2rem;">
+            {labels["home_title"]}
+        </h1>'''
+        self.home_desc_html = f'''
+        <div class="custom-text" style="max-width: 900px; margin: 0 auto;">
+            {home_desc}
+        '''
+        self.disclaimer_html = disclaimer
+        self.about_html = f'''<div class="custom-text">
+            <h1 style="text-align:center; font-size: 36px; font-weight: bold; margin-bottom: 2rem;">
+                {labels["about_title"]}
+            </h1>
+            {labels["about_desc"]}
+        '''
+
+    def answer_label(self, col, value):
+        """Form label of a canonical answer (e.g. "Male" -> "Laki-laki")."""
+        return self._answer_labels[col].get(value, str(value))
+
+
+LANGUAGES = {
+    "Indonesia": Language(
+        "Indonesia", LABELS_ID, OPTIONS_ID, HOME_DESC_ID, DISCLAIMER_ID,
+        pages={"home": "Beranda", "about": "Tentang", "predict": "Prediksi Depresi"},
+        nav_title="Navigasi", page_label="Pilih Halaman", placeholder="- Pilih -",
+    ),
+    "English": Language(
+        "English", LABELS_EN, OPTIONS_EN, HOME_DESC_EN, DISCLAIMER_EN,
+        pages={"home": "Home", "about": "About", "predict": "Depression Prediction"},
+        nav_title="Navigation", page_label="Choose Page", placeholder="- Select -",
+    ),
+}
@@ -0,0 +1,280 @@
+"""\
+dataset_store.py
+-----------------
+Columnar, typed copy of the merged survey data (Primer + Sekunder CSV).
+
+File: dataset.arrow (Arrow IPC / Feather v2, uncompressed) next to the CSVs.
+- Categorical columns are dictionary<int8, string> with a fixed category
+  order (the LabelEncoder order), so the codes are the model's codes
+- Numeric answers are int8 (all are small whole numbers)
+- Schema metadata (key "dataset_store") holds the format version, row count,
+  a SHA-256 over the column data (content_sha256) and the SHA-256 of every
+  source file the rows came from
+
+Opening uses pyarrow.memory_map: no text parsing, and the int8 columns are
+read straight from the page cache. At 538 rows the DataFrame is ~10x smaller
+than the CSV-parsed one (object/str + int64/float64 columns).
+
+Every row is checked against SCHEMA before it is written; a frame that
+violates it raises SchemaError and nothing is written. New survey exports
+are normalized and appended with ingest.py (append_store).
+
+Run:
+    python dataset_store.py build
+    python dataset_store.py check
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from scoring import FEATURE_COLUMNS, NUMERIC_RANGES, TARGET_COLUMN
+
+FORMAT_VERSION = 1
+META_KEY = b"dataset_store"
+
+COLUMNS = FEATURE_COLUMNS + [TARGET_COLUMN]
+
+# Urutan kategori = urutan LabelEncoder (alfabetis), kode int8 = kode model
+CATEGORIES = {
+    "Gender": ["Female", "Male"],
+    "Sleep Duration": ["5-6 hours", "7-8 hours", "Less than 5 hours", "More than 8 hours"],
+    "Dietary Habits": ["Healthy", "Moderate", "Unhealthy"],
+    "Have you ever had suicidal thoughts ?": ["No", "Yes"],
+    "Family History of Mental Illness": ["No", "Yes"],
+    TARGET_COLUMN: ["No", "Yes"],
+}
+
+SCHEMA = pa.schema([
+    pa.field(col, pa.dictionary(pa.int8(), pa.string()) if col in CATEGORIES else pa.int8(), nullable=False)
+    for col in COLUMNS
+])
+
+
+class SchemaError(ValueError):
+    """The data does not fit SCHEMA (or the stored file is corrupted)."""
+
+
+# ------------------------------------------------------------------
+# Conversion
+# ------------------------------------------------------------------
+def schema_problems(frame):
+    """Human-readable list of schema violations in ``frame`` (empty if valid)."""
+    import pandas as pd
+
+    missing = [col for col in COLUMNS if col not in frame.columns]
+    if missing:
+        return [f"missing columns: {missing}"]
+
+    problems = []
+    for col in COLUMNS:
+        values = frame[col]
+        if values.isna().any():
+            problems.append(f"{col!r}: {int(values.isna().sum())} empty values")
+            continue
+        if col in CATEGORIES:
+            unknown = sorted(set(values.astype(str)) - set(CATEGORIES[col]))
+            if unknown:
+                problems.append(f"{col!r}: unknown values {unknown}")
+            continue
+        numbers = pd.to_numeric(values, errors="coerce")
+        lo, hi = NUMERIC_RANGES.get(col, (-128, 127))
+        bad = numbers.isna() | (numbers != np.round(numbers)) | (numbers < lo) | (numbers > hi)
+        if bad.any():
+            sample = sorted(set(values[bad].astype(str)))[:5]
+            problems.append(f"{col!r}: {int(bad.sum())} values not whole numbers in [{lo}, {hi}], e.g. {sample}")
+    return problems
+
+
+def from_codes(codes):
+    """Typed Arrow table from already validated int8 arrays ({column: codes or values})."""
+    arrays = []
+    for col in COLUMNS:
+        values = pa.array(np.asarray(codes[col], dtype=np.int8), type=pa.int8())
+        if col in CATEGORIES:
+            values = pa.DictionaryArray.from_arrays(values, pa.array(CATEGORIES[col], type=pa.string()))
+        arrays.append(values)
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def to_table(frame):
+    """Typed Arrow table (SCHEMA) from a DataFrame; raises SchemaError if invalid."""
+    import pandas as pd
+
+    problems = schema_problems(frame)
+    if problems:
+        raise SchemaError("; ".join(problems))
+
+    codes = {}
+    for col in COLUMNS:
+        if col in CATEGORIES:
+            codes[col] = pd.Categorical(frame[col].astype(str), categories=CATEGORIES[col]).codes
+        else:
+            codes[col] = pd.to_numeric(frame[col]).to_numpy()
+    return from_codes(codes)
+
+
+def content_hash(*tables):
+    """SHA-256 over column names, categories and values (independent of file layout).
+
+    Several tables hash as their concatenation; columns are read chunk by
+    chunk, so memory-mapped tables are never materialized.
+    """
+    h = hashlib.sha256()
+    for col in COLUMNS:
+        h.update(col.encode() + b"\0")
+        if col in CATEGORIES:
+            h.update("\x1f".join(CATEGORIES[col]).encode() + b"\0")
+        for table in tables:
+            for chunk in table.column(col).chunks:
+                if col in CATEGORIES:
+                    if chunk.dictionary.to_pylist() != CATEGORIES[col]:
+                        raise SchemaError(f"{col!r}: categories differ from dataset_store.CATEGORIES")
+                    chunk = chunk.indices
+                h.update(chunk.to_numpy(zero_copy_only=False).astype(np.int8, copy=False).tobytes())
+    return h.hexdigest()
+
+
+# ------------------------------------------------------------------
+# Write / read
+# ------------------------------------------------------------------
+def write_store(tables, path, sources):
+    """Write the concatenation of ``tables`` atomically.
+
+    ``sources`` is [{"name", "sha256", "rows"}, ...]. Record batches are
+    copied one by one, so memory-mapped inputs stay out of RAM.
+    """
+    meta = {
+        "version": FORMAT_VERSION,
+        "rows": sum(table.num_rows for table in tables),
+        "content_sha256": content_hash(*tables),
+        "sources": sources,
+    }
+    schema = SCHEMA.with_metadata({META_KEY: json.dumps(meta).encode()})
+    tmp = f"{path}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for table in tables:
+            for batch in table.to_batches():
+                writer.write_batch(batch)
+    os.replace(tmp, path)
+    return meta
+
+
+def build_store(csv_paths, path):
+    """Merge the CSVs (in order), validate, and write the store."""
+    import pandas as pd
+
+    import resources
+
+    frames, sources = [], []
+    for csv_path in csv_paths:
+        frame = pd.read_csv(csv_path)
+        frames.append(frame)
+        sources.append({"name": os.path.basename(csv_path), "sha256": resources.file_digest(csv_path), "rows": len(frame)})
+    table = to_table(pd.concat(frames, ignore_index=True))
+    return write_store([table], path, sources)
+
+
+def append_store(path, table, source):
+    """Append ``table`` (rows from ``source``) to the store at ``path``, creating it if needed."""
+    if os.path.exists(path):
+        current, meta = open_table(path)
+        return write_store([current, table], path, meta["sources"] + [source])
+    return write_store([table], path, [source])
+
+
+def read_meta(table):
+    raw = (table.schema.metadata or {}).get(META_KEY)
+    if raw is None:
+        raise SchemaError("not a dataset store (no metadata)")
+    return json.loads(raw)
+
+
+def open_table(path, verify=True):
+    """Memory-mapped Arrow table and its metadata.
+
+    With ``verify`` the schema, row count and content hash are checked.
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    meta = read_meta(table)
+    if meta.get("version") != FORMAT_VERSION:
+        raise SchemaError(f"{path}: unsupported store version {meta.get('version')!r}")
+    if not table.schema.equals(SCHEMA, check_metadata=False):
+        raise SchemaError(f"{path}: schema does not match dataset_store.SCHEMA")
+    if verify and (table.num_rows != meta["rows"] or content_hash(table) != meta["content_sha256"]):
+        raise SchemaError(f"{path}: content hash mismatch")
+    return table, meta
+
+
+def to_frame(table):
+    """DataFrame view: categoricals for the string columns, int8 for the rest."""
+    return table.to_pandas()
+
+
+def source_rows(table, meta, sha256s):
+    """Rows of ``table`` that came from the sources with these SHA-256s (in store order).
+
+    Sources are stored in append order, so each one is a contiguous slice.
+    """
+    slices, start = [], 0
+    for source in meta["sources"]:
+        if source["sha256"] in sha256s:
+            slices.append(table.slice(start, source["rows"]))
+        start += source["rows"]
+    return pa.concat_tables(slices) if slices else table.slice(0, 0)
+
+
+def to_codes(table):
+    """{column: int8 ndarray} (category codes = LabelEncoder codes, numbers as-is)."""
+    codes = {}
+    for col in COLUMNS:
+        column = table.column(col).combine_chunks()
+        if col in CATEGORIES:
+            column = column.indices
+        codes[col] = column.to_numpy(zero_copy_only=False)
+    return codes
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+def main(argv=None):
+    import resources
+
+    parser = argparse.ArgumentParser(description="Build or check the columnar dataset store.")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--store", default=str(resources.DATASET_STORE_PATH))
+    parser.add_argument("--csv", nargs="+", default=[str(resources.PRIMER_PATH), str(resources.SEKUNDER_PATH)])
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        try:
+            meta = build_store(args.csv, args.store)
+        except SchemaError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        print(f"✅ Wrote {args.store} ({meta['rows']:,} rows in {time.perf_counter() - start:.2f}s, "
+              f"content {meta['content_sha256'][:12]})")
+        return 0
+
+    try:
+        table, meta = open_table(args.store)
+    except (OSError, SchemaError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"✅ {args.store}: {meta['rows']:,} rows, {os.path.getsize(args.store):,} bytes, "
+          f"content {meta['content_sha256'][:12]}")
+    for source in meta["sources"]:
+        print(f"   {source['name']}: {source['rows']:,} rows, sha256 {source['sha256'][:12]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
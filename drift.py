@@ -0,0 +1,331 @@
+"""\
+drift.py
+-----------------
+Streaming input-drift monitor: live form answers and predicted probabilities
+against the training data (Primer + Sekunder).
+
+Reference (drift_reference.json, next to the model bundle, built once):
+- per feature, counts over that feature's whole domain: every category, or
+  every whole number in scoring.NUMERIC_RANGES (Age 18-34 = 17 bins), the
+  same axes as the risk table
+- predicted probabilities of the training rows in PROB_BINS equal bins,
+  under the bundle it was built from (its SHA-256 is recorded)
+
+Live side (DriftMonitor): one int64 count array per feature, the same size
+as the reference one, plus the probability histogram. observe() is a few
+dict lookups and increments, so memory and CPU stay constant no matter how
+many predictions are served; nothing per prediction is kept.
+
+Every ``interval`` s a daemon thread compares the window since the last
+check (once it holds ``min_count`` answers; smaller windows keep growing)
+and the all-time counts with the reference:
+- PSI = sum((live - ref) * ln(live / ref))
+- KL(live || ref) = sum(live * ln(live / ref))
+with +0.5 smoothing per bin, so empty bins stay finite. PSI >= 0.1 is
+reported as moderate, >= 0.25 as significant drift (logged as a warning).
+The probability comparison is skipped once the served bundle is no longer
+the one the reference was scored with (rebuild after retraining).
+
+Configuration for apps.py (environment):
+    DRIFT_MONITOR     0 to disable (default on when the reference exists)
+    DRIFT_INTERVAL    seconds between checks (default 300)
+
+Run:
+    python drift.py build
+    python drift.py check                       # logged predictions (audit_log.py)
+    python drift.py check --audit-log predictions.sqlite
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+
+import resources
+from risk_table import table_axes
+from scoring import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+PROB_BINS = 10
+PROBABILITY = "probability"
+
+MODERATE_PSI = 0.1
+SIGNIFICANT_PSI = 0.25
+
+
+# ------------------------------------------------------------------
+# Divergences
+# ------------------------------------------------------------------
+def _smoothed(counts, eps=0.5):
+    counts = np.asarray(counts, dtype=np.float64) + eps
+    return counts / counts.sum()
+
+
+def psi(reference, live):
+    """Population stability index of ``live`` counts against ``reference`` counts."""
+    q, p = _smoothed(reference), _smoothed(live)
+    return float(np.sum((p - q) * np.log(p / q)))
+
+
+def kl_divergence(reference, live):
+    """KL(live || reference) in nats, from counts."""
+    q, p = _smoothed(reference), _smoothed(live)
+    return float(np.sum(p * np.log(p / q)))
+
+
+def severity(value):
+    if value >= SIGNIFICANT_PSI:
+        return "significant"
+    if value >= MODERATE_PSI:
+        return "moderate"
+    return "stable"
+
+
+def probability_bin(prob):
+    return min(max(int(prob * PROB_BINS), 0), PROB_BINS - 1)
+
+
+# ------------------------------------------------------------------
+# Reference
+# ------------------------------------------------------------------
+def build_reference(predictor, frame, path, bundle_sha256):
+    """Histogram every feature of ``frame`` and its predicted probabilities; write ``path``."""
+    axes = table_axes(predictor.classes)
+    counts = {}
+    for col, values in axes:
+        lookup = {value: pos for pos, value in enumerate(values)}
+        column = frame[col].astype(object) if col in predictor.classes else frame[col].astype(int)
+        codes = column.map(lookup)
+        outside = int(codes.isna().sum())
+        if outside:
+            logger.warning("%r: %d training rows outside the form's domain (not counted)", col, outside)
+        counts[col] = np.bincount(codes.dropna().astype(int), minlength=len(values)).tolist()
+
+    prob, _ = predictor.score_frame(frame)
+    counts[PROBABILITY] = np.bincount([probability_bin(p) for p in prob], minlength=PROB_BINS).tolist()
+
+    reference = {
+        "version": FORMAT_VERSION,
+        "rows": len(frame),
+        "bundle_sha256": bundle_sha256,
+        "axes": axes,
+        "counts": counts,
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(reference, f, indent=2)
+    os.replace(tmp, path)
+    return reference
+
+
+def load_reference(path=resources.DRIFT_REFERENCE_PATH):
+    with open(path) as f:
+        reference = json.load(f)
+    if reference.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported reference version {reference.get('version')!r}")
+    if [col for col, _ in reference["axes"]] != FEATURE_COLUMNS:
+        raise ValueError(f"{path}: features do not match scoring.FEATURE_COLUMNS")
+    return reference
+
+
+# ------------------------------------------------------------------
+# Monitor
+# ------------------------------------------------------------------
+class DriftMonitor:
+    def __init__(self, reference, interval=300.0, min_count=100, model_path=resources.MODEL_PATH):
+        self.reference = reference
+        self.interval = interval
+        self.min_count = min_count
+        self.model_path = model_path
+        self.outside = 0
+        self.checks = 0
+        self.last_report = None
+        self._lookups = {col: {value: pos for pos, value in enumerate(values)} for col, values in reference["axes"]}
+        self._names = list(self._lookups) + [PROBABILITY]
+        self._window = {name: np.zeros(len(reference["counts"][name]), dtype=np.int64) for name in self._names}
+        self._total = {name: counts.copy() for name, counts in self._window.items()}
+        self._window_count = 0
+        self._total_count = 0
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def observe(self, features, prob):
+        """Count one served prediction and make sure the scheduled checks run."""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+                    self._worker.start()
+        self.add(features, prob)
+
+    def add(self, features, prob):
+        """Count one prediction (canonical features + probability); values outside the domain are skipped."""
+        with self._lock:
+            for col, lookup in self._lookups.items():
+                pos = lookup.get(features[col])
+                if pos is None:
+                    self.outside += 1
+                else:
+                    self._window[col][pos] += 1
+            self._window[PROBABILITY][probability_bin(prob)] += 1
+            self._window_count += 1
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                report = self.check()
+            except Exception as e:
+                # Monitor tidak boleh mengganggu layanan utama
+                logger.warning("Drift check gagal: %s", e)
+                continue
+            if report is None:
+                continue
+            for name, result in report["features"].items():
+                if result["severity"] == "significant":
+                    logger.warning("Drift %r: PSI %.3f over the last %d predictions",
+                                   name, result["psi"], report["window_count"])
+
+    def _probability_is_current(self):
+        try:
+            return resources.bundle_digest(self.model_path) == self.reference["bundle_sha256"]
+        except OSError:
+            return False
+
+    def check(self, force=False):
+        """Compare the window (if it has ``min_count`` answers, or ``force``) and the totals.
+
+        Returns the report (also kept as ``last_report``), or None when the
+        window is still too small.
+        """
+        with self._lock:
+            if self._window_count == 0 or (self._window_count < self.min_count and not force):
+                return None
+            window = {name: counts.copy() for name, counts in self._window.items()}
+            for name, counts in self._window.items():
+                self._total[name] += counts
+                counts[:] = 0
+            window_count, self._window_count = self._window_count, 0
+            self._total_count += window_count
+            total = {name: counts.copy() for name, counts in self._total.items()}
+            total_count = self._total_count
+
+        report = compare(self.reference, window, total, skip_probability=not self._probability_is_current())
+        report.update(time=time.time(), window_count=window_count, total_count=total_count)
+        with self._lock:
+            self.checks += 1
+            self.last_report = report
+        return report
+
+    def gauges(self):
+        """Latest PSI per feature as extra gauges for metrics.export_text()."""
+        gauges = {"app_drift_checks": ("Drift checks run.", self.checks)}
+        report = self.last_report
+        if report is not None:
+            for name, result in report["features"].items():
+                gauges[f'app_drift_psi{{feature="{name}",scope="window"}}'] = (
+                    "PSI of live inputs against the training reference.", result["psi"])
+                gauges[f'app_drift_psi{{feature="{name}",scope="total"}}'] = (
+                    "PSI of live inputs against the training reference.", result["total_psi"])
+        return gauges
+
+
+def compare(reference, window, total=None, skip_probability=False):
+    """{"features": {name: {psi, kl, total_psi, total_kl, severity}}} for every histogram."""
+    results = {}
+    for name, ref_counts in reference["counts"].items():
+        if name == PROBABILITY and skip_probability:
+            continue
+        result = {"psi": psi(ref_counts, window[name]), "kl": kl_divergence(ref_counts, window[name])}
+        if total is not None:
+            result.update(total_psi=psi(ref_counts, total[name]), total_kl=kl_divergence(ref_counts, total[name]))
+        result["severity"] = severity(result["psi"])
+        results[name] = result
+    return {"features": results, "probability_skipped": skip_probability}
+
+
+def from_env(path=resources.DRIFT_REFERENCE_PATH):
+    """DriftMonitor on the built reference, or None (DRIFT_MONITOR=0 or no reference)."""
+    if os.environ.get("DRIFT_MONITOR", "1").strip() == "0" or not os.path.exists(path):
+        return None
+    try:
+        reference = load_reference(path)
+    except (OSError, ValueError) as e:
+        logger.warning("Drift monitor dimatikan: %s", e)
+        return None
+    return DriftMonitor(reference, interval=float(os.environ.get("DRIFT_INTERVAL", "") or 300))
+
+
+# Satu monitor per proses server (None = dimatikan / belum ada referensi)
+default_monitor = from_env()
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+def check_audit_log(reference, path, model_path=resources.MODEL_PATH):
+    """Drift report of every prediction recorded by audit_log.py at ``path``."""
+    monitor = DriftMonitor(reference, model_path=model_path)
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+        cursor = conn.execute("SELECT * FROM predictions")
+        names = [d[0] for d in cursor.description]
+        for row in cursor:
+            row = dict(zip(names, row))
+            monitor.add(row, row["probability"])
+    return monitor.check(force=True)
+
+
+def main(argv=None):
+    import audit_log
+
+    parser = argparse.ArgumentParser(description="Build the drift reference or check logged predictions against it.")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="model bundle (.joblib)")
+    parser.add_argument("--reference", default=str(resources.DRIFT_REFERENCE_PATH))
+    parser.add_argument("--audit-log", default=str(audit_log.DEFAULT_PATH), help="predictions to check")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        frame = resources.load_dataset()
+        reference = build_reference(resources.load_predictor(args.model), frame, args.reference,
+                                    resources.bundle_digest(args.model))
+        bins = sum(len(counts) for counts in reference["counts"].values())
+        print(f"✅ Wrote {args.reference} ({reference['rows']:,} rows, {bins} bins "
+              f"in {time.perf_counter() - start:.2f}s)")
+        return 0
+
+    if not os.path.exists(args.audit_log):
+        print(f"❌ {args.audit_log}: no audit log", file=sys.stderr)
+        return 1
+    try:
+        reference = load_reference(args.reference)
+        report = check_audit_log(reference, args.audit_log, args.model)
+    except (OSError, ValueError, LookupError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if report is None:
+        print(f"❌ {args.audit_log}: no predictions logged", file=sys.stderr)
+        return 1
+
+    print(f"{report['window_count']:,} logged predictions vs {reference['rows']:,} training rows")
+    print(f"{'feature':<40} {'PSI':>7} {'KL':>7}  severity")
+    for name, result in sorted(report["features"].items(), key=lambda item: -item[1]["psi"]):
+        print(f"{name:<40} {result['psi']:>7.3f} {result['kl']:>7.3f}  {result['severity']}")
+    if report["probability_skipped"]:
+        print("(probability skipped: reference built from another bundle, run `python drift.py build`)")
+    worst = max(result["psi"] for result in report["features"].values())
+    print(("⚠️ Significant drift" if worst >= SIGNIFICANT_PSI else "✅ No significant drift") + f" (max PSI {worst:.3f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
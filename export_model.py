@@ -0,0 +1,61 @@
+"""\
+export_model.py
+-----------------
+Export model_depression.joblib to the slim, pickle-free model format.
+
+The slim file (versioned JSON, see scoring.Predictor.to_slim) holds the
+encoder class lists, scaler mean/scale, logistic coef/intercept, threshold
+and the SHA-256 of the bundle it came from. At load time the scaler is folded
+into the coefficients (scoring.fold_linear), so scoring is one dot product
+and a sigmoid, using NumPy only.
+
+Before writing, the exported scorer is checked against
+model.predict_proba(scaler.transform(X)) on a probe matrix and on the merged
+dataset, and also after a JSON round trip; the export aborts if they disagree
+beyond --atol. resources.load_predictor() then prefers this file over
+unpickling the bundle for as long as the bundle bytes are unchanged.
+
+Run:
+    python export_model.py                      # -> model_depression.json
+    python export_model.py -o slim.json --atol 1e-12
+"""
+
+import argparse
+import sys
+
+import resources
+from scoring import DEFAULT_THRESHOLD, Predictor, encode_frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the slim (pickle-free) model.")
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="model bundle (.joblib)")
+    parser.add_argument("-o", "--output", default=str(resources.MODEL_PATH.with_suffix(".json")))
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"default: bundle threshold, else {DEFAULT_THRESHOLD}")
+    parser.add_argument("--atol", type=float, default=1e-9, help="max allowed probability difference")
+    args = parser.parse_args(argv)
+
+    bundle = resources.load_bundle(args.model)
+    predictor = Predictor.from_bundle(bundle, threshold=args.threshold, check=False,
+                                      source_sha256=resources.bundle_digest(args.model))
+
+    try:
+        diff = predictor.verify(bundle, atol=args.atol)
+        df = resources.load_dataset()
+        X = encode_frame(df, bundle["encoders"])
+        diff_data = predictor.verify(bundle, X=X, atol=args.atol)
+        # Pastikan hasil setelah round trip JSON tetap sama
+        Predictor.from_slim(predictor.to_slim()).verify(bundle, X=X, atol=args.atol)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    predictor.save(args.output)
+    print(f"✅ Wrote {args.output}")
+    print(f"   max |diff| probe={diff:.3g}  dataset={diff_data:.3g}  (n={len(df)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""\
+ingest.py
+-----------------
+Out-of-core ingestion of raw survey exports into the dataset store.
+
+Real exports use many spellings for the same answer ("5 - 6 hrs", "5–6 jam",
+"YES", "Ya", "tidak", "Laki-laki", ...). Each file is streamed in blocks
+(pyarrow.csv.open_csv), and every column of a block is dictionary-encoded
+first, so the normalizer only sees that block's *distinct* raw values (a
+handful per column). Mapping all rows is then one NumPy take per column.
+
+Rows that still do not fit dataset_store.SCHEMA (unknown category, empty
+answer, out-of-range or non-integer number) go to a quarantine CSV with the
+raw values, the file line number (header = line 1, the numbering editors
+and pyarrow use) and the reasons; lines with the wrong number of fields are
+quarantined with their line number and text. Clean rows are
+appended to dataset.arrow, together with the source file's SHA-256; a file
+that was already ingested is refused unless --force is given.
+
+Memory stays at a few blocks regardless of file size: clean blocks are
+staged in an Arrow file next to the store and then copied, batch by batch,
+into the new store.
+
+Run:
+    python ingest.py survey_export.csv
+    python ingest.py big_export.csv --quarantine rejected.csv --block-size 64
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+import dataset_store
+import resources
+from dataset_store import CATEGORIES, COLUMNS, SchemaError
+from scoring import NUMERIC_RANGES
+
+# ------------------------------------------------------------------
+# Normalisasi nilai
+# ------------------------------------------------------------------
+_YES_NO = {
+    "yes": "Yes", "y": "Yes", "ya": "Yes", "iya": "Yes", "true": "Yes", "1": "Yes",
+    "no": "No", "n": "No", "tidak": "No", "tdk": "No", "false": "No", "0": "No",
+}
+
+# Kunci sudah melalui normalize_key()
+ALIASES = {
+    "Gender": {
+        "male": "Male", "m": "Male", "man": "Male", "laki-laki": "Male", "laki laki": "Male", "pria": "Male",
+        "female": "Female", "f": "Female", "woman": "Female", "perempuan": "Female", "wanita": "Female",
+    },
+    "Sleep Duration": {
+        "less than 5 hours": "Less than 5 hours", "<5 hours": "Less than 5 hours",
+        "under 5 hours": "Less than 5 hours", "kurang dari 5 hours": "Less than 5 hours",
+        "5-6 hours": "5-6 hours",
+        "7-8 hours": "7-8 hours",
+        "more than 8 hours": "More than 8 hours", ">8 hours": "More than 8 hours",
+        "over 8 hours": "More than 8 hours", "lebih dari 8 hours": "More than 8 hours",
+    },
+    "Dietary Habits": {
+        "healthy": "Healthy", "sehat": "Healthy",
+        "moderate": "Moderate", "sedang": "Moderate", "average": "Moderate",
+        "unhealthy": "Unhealthy", "tidak sehat": "Unhealthy", "not healthy": "Unhealthy",
+    },
+    "Have you ever had suicidal thoughts ?": _YES_NO,
+    "Family History of Mental Illness": _YES_NO,
+    "Depression": _YES_NO,
+}
+
+# Baris karantina: nilai mentah + nomor baris file (header = 1) + alasan
+QUARANTINE_SCHEMA = pa.schema([(col, pa.string()) for col in COLUMNS] + [("line", pa.int64()), ("reason", pa.string())])
+
+_DASHES = re.compile(r"\s*[-\u2010-\u2015]\s*")
+_HOURS = re.compile(r"\b(?:hours?|hrs?|h|jam)\b\.?")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_key(value):
+    """Lowercase, unify dashes, spaces and hour units: ' 5 – 6 Hrs ' -> '5-6 hours'."""
+    key = _SPACES.sub(" ", value.strip().strip("\"'").lower())
+    key = _DASHES.sub("-", key)
+    key = _HOURS.sub("hours", key)
+    return re.sub(r"([<>])\s+", r"\1", key)
+
+
+def category_lookup(col, uniques):
+    """Raw distinct values -> (int8 codes with -1 for unknown, reason per value)."""
+    categories = CATEGORIES[col]
+    codes = np.full(len(uniques), -1, dtype=np.int8)
+    reasons = []
+    for i, raw in enumerate(uniques):
+        canonical = ALIASES[col].get(normalize_key(raw))
+        if canonical is None:
+            reasons.append(f"{col}: empty" if not raw.strip() else f"{col}: unknown value {raw!r}")
+        else:
+            codes[i] = categories.index(canonical)
+            reasons.append(None)
+    return codes, reasons
+
+
+def number_lookup(col, uniques):
+    """Raw distinct values -> (int8 values, reason per value) for a numeric column."""
+    lo, hi = NUMERIC_RANGES.get(col, (-128, 127))
+    values = np.zeros(len(uniques), dtype=np.int8)
+    reasons = []
+    for i, raw in enumerate(uniques):
+        text = raw.strip().replace(",", ".")
+        try:
+            number = float(text)
+        except ValueError:
+            reasons.append(f"{col}: empty" if not text else f"{col}: not a number {raw!r}")
+            continue
+        if number != round(number) or not lo <= number <= hi:
+            reasons.append(f"{col}: {raw!r} not a whole number in [{lo}, {hi}]")
+            continue
+        values[i] = int(number)
+        reasons.append(None)
+    return values, reasons
+
+
+def normalize_batch(batch):
+    """One CSV block (all string columns) -> (codes per column, bad-row mask, reasons for the bad rows)."""
+    codes, bad = {}, np.zeros(batch.num_rows, dtype=bool)
+    parts = []
+    for col in COLUMNS:
+        encoded = batch.column(col).dictionary_encode()
+        uniques = encoded.dictionary.to_pylist()
+        index = encoded.indices.to_numpy()
+
+        lookup = category_lookup if col in CATEGORIES else number_lookup
+        values, reasons = lookup(col, uniques)
+        codes[col] = values[index]
+
+        col_bad = np.array([reason is not None for reason in reasons])[index]
+        if col_bad.any():
+            bad |= col_bad
+            parts.append((pa.array(reasons, type=pa.string()), index))
+
+    # Alasan per baris: gabung alasan tiap kolom, null (kolom valid) dilewati
+    rows = np.flatnonzero(bad)
+    reasons = pc.binary_join_element_wise(
+        *(per_value.take(index[rows]) for per_value, index in parts), "; ", null_handling="skip"
+    ) if parts else pa.array([], type=pa.string())
+    return codes, bad, reasons
+
+
+# ------------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------------
+def _malformed_table(invalid_rows):
+    reasons = [f"malformed: expected {row.expected_columns} fields, got {row.actual_columns}: {row.text[:200]!r}"
+               for row in invalid_rows]
+    columns = [pa.nulls(len(reasons), pa.string()) for _ in COLUMNS]
+    lines = pa.array([row.number for row in invalid_rows], pa.int64())
+    return pa.Table.from_arrays(columns + [lines, pa.array(reasons, pa.string())], schema=QUARANTINE_SCHEMA)
+
+
+def file_lines(data_rows, malformed_lines):
+    """File line numbers (header = 1) of 0-based data row indices.
+
+    ``malformed_lines`` are the (sorted) line numbers of the skipped lines;
+    every one of them before a row pushes it one line further down. Assumes
+    no line breaks inside quoted values, as pyarrow's own numbering does.
+    """
+    malformed = np.asarray(malformed_lines, dtype=np.int64)
+    # Jumlah baris data sebelum tiap baris rusak
+    before = malformed - 2 - np.arange(len(malformed))
+    return data_rows + 2 + np.searchsorted(before, data_rows, side="right")
+
+
+def ingest_csv(src, store_path, quarantine_path, block_size=8 << 20, force=False, progress=None):
+    """Normalize ``src`` and append its clean rows to the store.
+
+    Returns {"rows", "clean", "quarantined", "bytes"}. Raises SchemaError if
+    required columns are missing or the file was already ingested.
+    """
+    sha256 = resources.file_digest(src)
+    if os.path.exists(store_path) and not force:
+        _, meta = dataset_store.open_table(store_path, verify=False)
+        if any(source["sha256"] == sha256 for source in meta["sources"]):
+            raise SchemaError(f"{src} was already ingested (use --force to append it again)")
+
+    with open(src, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    missing = [col for col in COLUMNS if col not in header]
+    if missing:
+        raise SchemaError(f"{src}: missing columns {missing}")
+
+    invalid_rows = []
+    malformed_lines = []
+    reader = pa_csv.open_csv(
+        src,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        parse_options=pa_csv.ParseOptions(invalid_row_handler=lambda row: invalid_rows.append(row) or "skip"),
+        convert_options=pa_csv.ConvertOptions(column_types={col: pa.string() for col in COLUMNS},
+                                              include_columns=COLUMNS),
+    )
+
+    stats = {"rows": 0, "clean": 0, "quarantined": 0, "bytes": os.path.getsize(src)}
+    staging_path = f"{store_path}.ingest"
+    quarantine = None
+
+    def reject(table):
+        nonlocal quarantine
+        if quarantine is None:
+            quarantine = pa_csv.CSVWriter(quarantine_path, QUARANTINE_SCHEMA)
+        quarantine.write_table(table)
+        stats["quarantined"] += table.num_rows
+
+    try:
+        with pa.OSFile(staging_path, "wb") as sink, pa.ipc.new_file(sink, dataset_store.SCHEMA) as staging:
+            for batch in reader:
+                codes, bad, reasons = normalize_batch(batch)
+                good = ~bad
+                if good.any():
+                    staging.write_table(dataset_store.from_codes({col: v[good] for col, v in codes.items()}))
+                # Baris rusak di blok ini sudah dilaporkan saat blok di-parse
+                if invalid_rows:
+                    malformed_lines.extend(row.number for row in invalid_rows)
+                    malformed_lines.sort()
+                    reject(_malformed_table(invalid_rows))
+                    invalid_rows.clear()
+                if bad.any():
+                    lines = file_lines(stats["rows"] + np.flatnonzero(bad), malformed_lines)
+                    reject(pa.Table.from_batches([batch.filter(pa.array(bad))]).append_column(
+                        "line", pa.array(lines, type=pa.int64())).append_column("reason", reasons))
+                stats["rows"] += batch.num_rows
+                stats["clean"] += int(good.sum())
+                if progress is not None:
+                    progress(stats)
+
+        if stats["clean"]:
+            staged = pa.ipc.open_file(pa.memory_map(staging_path, "r")).read_all()
+            source = {"name": os.path.basename(src), "sha256": sha256, "rows": stats["clean"]}
+            dataset_store.append_store(store_path, staged, source)
+    finally:
+        if quarantine is not None:
+            quarantine.close()
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize a raw survey export and append it to the dataset store.")
+    parser.add_argument("input", help="survey CSV (Sekunder column names; extra columns are ignored)")
+    parser.add_argument("--store", default=str(resources.DATASET_STORE_PATH))
+    parser.add_argument("--quarantine", help="rejected rows CSV (default: <input>.quarantine.csv)")
+    parser.add_argument("--block-size", type=int, default=8, help="CSV block size in MB")
+    parser.add_argument("--force", action="store_true", help="append even if this file was ingested before")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    quarantine_path = args.quarantine or os.path.splitext(args.input)[0] + ".quarantine.csv"
+    start = time.perf_counter()
+
+    def progress(stats):
+        if not args.quiet:
+            print(f"\r{stats['rows']:,} rows  ({stats['rows'] / (time.perf_counter() - start):,.0f} rows/s)",
+                  end="", file=sys.stderr)
+
+    try:
+        stats = ingest_csv(args.input, args.store, quarantine_path, args.block_size << 20, args.force, progress)
+    except (OSError, SchemaError, pa.ArrowInvalid) as e:
+        print(f"\n❌ {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"✅ {stats['rows']:,} rows in {elapsed:.2f}s ({stats['bytes'] / elapsed / 1e6:,.0f} MB/s): "
+          f"{stats['clean']:,} appended to {args.store}, {stats['quarantined']:,} quarantined")
+    if stats["quarantined"]:
+        print(f"   see {quarantine_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,427 @@
+"""\
+loadtest.py
+-----------------
+Concurrent-session load test for apps.py (local, no external services).
+
+Every simulated session is a streamlit.testing AppTest driven from its own
+thread. That is the Streamlit server's model too: one process, each
+session's script reruns on its own thread, and all sessions share the GIL
+and the module-level caches (resources, prediction cache, model registry).
+A session behaves like a user:
+- now and then switches language (which, as in the app, resets the page)
+- moves between Home, About and Prediksi Depresi
+- on the prediction page fills the form with random valid answers (a
+  st.form: nothing reruns until Predict is clicked), submits it, and
+  sometimes plays with the what-if panel
+with an exponentially distributed think time (--think-ms) between actions.
+
+For each concurrency level (--sessions 1 2 4 ...), run for --duration s:
+- rerun latency p50/p95/p99, overall and per action
+- throughput (reruns/s) and failed reruns
+- process RSS growth per session for the level
+- with --stages, the app's own per-stage timings (metrics.py)
+Before the levels, the Python heap held per session is measured once with
+tracemalloc (a session that has visited every page and predicted).
+
+Saturation point: the first level where rerun p95 exceeds --slo-ms, a rerun
+fails, or throughput grows by less than half of the added sessions (with
+think time, throughput should scale with the number of sessions until the
+CPU is the bottleneck). Levels stop once p95 is past twice the SLO.
+
+AppTest also converts each rerun's output into an element tree, work a
+browser session does not put on the server, so absolute latencies are an
+upper bound; compare runs on the same machine. Running sessions side by
+side in one process needs a few patches to Streamlit internals, so the
+load test refuses any Streamlit release other than the one they were
+checked against (TESTED_STREAMLIT). The audit log and drift
+monitor are switched off (bench_app.disable_side_effects), so the synthetic
+forms are never recorded as real predictions.
+
+Run:
+    python loadtest.py
+    python loadtest.py --sessions 1 2 4 8 16 32 --duration 20 -o load.json
+    python loadtest.py --think-ms 0 --stages
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from collections import defaultdict
+from pathlib import Path
+
+import metrics
+from bench_app import _app_test, disable_side_effects, git_commit, summarize
+from scoring import FEATURE_COLUMNS
+
+LANGUAGE_LABEL = "🌐 Pilih Bahasa / Choose Language"
+PAGE_LABEL = {"Indonesia": "Pilih Halaman", "English": "Choose Page"}
+PAGES = {
+    "Indonesia": {"home": "Beranda", "about": "Tentang", "predict": "Prediksi Depresi"},
+    "English": {"home": "Home", "about": "About", "predict": "Depression Prediction"},
+}
+PLACEHOLDERS = ("- Pilih -", "- Select -")
+PREDICT_BUTTONS = ("Prediksi", "Predict")
+
+# share_server_state() mengganti bagian internal Streamlit; diverifikasi
+# dengan versi minor ini. Versi lain ditolak sampai patch-nya dicek ulang.
+TESTED_STREAMLIT = "1.65"
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def check_streamlit_internals():
+    """Raise RuntimeError unless Streamlit is the tested version with every patched attribute present.
+
+    The patches in share_server_state() target private objects that can move
+    in any release; without this check an upgrade would break the sessions
+    silently (failed reruns that look like app bugs).
+    """
+    import streamlit
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test, local_script_runner, util
+
+    version = ".".join(streamlit.__version__.split(".")[:2])
+    if version != TESTED_STREAMLIT:
+        raise RuntimeError(f"loadtest.py patches Streamlit internals verified on {TESTED_STREAMLIT}.x, "
+                           f"found {streamlit.__version__}: re-check share_server_state() and "
+                           f"update TESTED_STREAMLIT")
+    targets = [(app_test, "Runtime"), (app_test, "ScriptCache"), (app_test, "patch_config_options"),
+               (local_script_runner, "ScriptCache"), (config, "get_option"), (Runtime, "_instance"),
+               (util, "build_mock_config_get_option")]
+    missing = [f"{obj.__name__}.{attr}" for obj, attr in targets if not hasattr(obj, attr)]
+    if missing:
+        raise RuntimeError(f"Streamlit internals patched by loadtest.py are missing: {', '.join(missing)}")
+
+
+def share_server_state():
+    """Make concurrent AppTests share what the Streamlit server shares across sessions.
+
+    - Runtime: AppTest.run() installs a mock Runtime as the process-wide
+      instance and resets it to None when it returns, which breaks every
+      other session whose script is still running. AppTest gets a subclass
+      whose _instance assignments keep the latest mock installed instead.
+    - ScriptCache: each AppTest run compiles apps.py again; the server
+      compiles it once for all sessions (and CPython 3.11's compile() is not
+      safe to run from several threads at once).
+    - Config: every run patches config.get_option for its duration;
+      overlapping patches are undone out of order, leaving some runs
+      without the test config (widgets then miss their format_func).
+      The override is installed once for the whole process instead.
+
+    Only for the tested Streamlit version (see check_streamlit_internals).
+    """
+    check_streamlit_internals()
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import build_mock_config_get_option
+
+    class KeepInstance(type):
+        def __setattr__(cls, name, value):
+            if name != "_instance":
+                super().__setattr__(name, value)
+            elif value is not None:
+                Runtime._instance = value
+
+    class SharedRuntime(Runtime, metaclass=KeepInstance):
+        pass
+
+    script_cache = ScriptCache()
+    app_test.Runtime = SharedRuntime
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+
+# ------------------------------------------------------------------
+# Simulated user
+# ------------------------------------------------------------------
+class Session:
+    def __init__(self, seed, think):
+        self.rng = random.Random(seed)
+        self.think = think
+        self.at = _app_test()
+        self.lang = "Indonesia"
+        self.page = "home"
+        self.predicted = False
+        self.samples = defaultdict(list)  # aksi -> detik per rerun
+        self.errors = 0
+        self.error_messages = set()
+
+    def rerun(self, action):
+        start = time.perf_counter()
+        try:
+            self.at.run()
+            failed = bool(self.at.exception)
+            if failed:
+                self.error_messages.add(self.at.exception[0].message)
+        except Exception as e:
+            failed = True
+            self.error_messages.add(repr(e))
+        self.samples[action].append(time.perf_counter() - start)
+        self.errors += failed
+
+    def _select(self, label, value):
+        for box in self.at.selectbox:
+            if box.label == label:
+                box.set_value(value)
+                return
+        raise LookupError(label)
+
+    # -- actions --------------------------------------------------------
+    def switch_language(self):
+        self.lang = "English" if self.lang == "Indonesia" else "Indonesia"
+        self._select(LANGUAGE_LABEL, self.lang)
+        self.rerun("language")
+        # Label selectbox halaman berganti -> widget baru, kembali ke halaman pertama
+        self.page, self.predicted = "home", False
+
+    def navigate(self, page):
+        self._select(PAGE_LABEL[self.lang], PAGES[self.lang][page])
+        self.rerun("page")
+        self.page, self.predicted = page, False
+
+    def _form_boxes(self):
+        # Hanya kotak form: opsi pertamanya placeholder
+        return [b for b in self.at.main.selectbox if b.options and b.options[0] in PLACEHOLDERS]
+
+    def fill_and_predict(self):
+        # Form: jawaban baru dikirim bersama tombol Prediksi, jadi mengisi
+        # pertanyaan tidak memicu rerun; satu rerun saat submit
+        for box in self._form_boxes():
+            box.set_value(self.rng.choice(box.options[1:]))
+        for number in self.at.main.number_input:
+            number.set_value(self.rng.randint(int(number.min), int(number.max)))
+        for button in self.at.main.button:
+            if button.label in PREDICT_BUTTONS:
+                button.click()
+                self.rerun("predict")
+                self.predicted = True
+                return
+
+    def what_if(self):
+        # Kotak what-if: [pertanyaan pertama, pertanyaan kedua]; nilainya nama kolom
+        # (opsi yang tampil adalah label), jadi diisi lewat set_value
+        boxes = [b for b in self.at.main.selectbox if b.options and b.options[0] not in PLACEHOLDERS]
+        if len(boxes) != 2:
+            return
+        first, second = boxes
+        if self.rng.random() < 0.5:
+            first.set_value(self.rng.choice(FEATURE_COLUMNS))
+        else:
+            second.set_value(self.rng.choice([None] + [col for col in FEATURE_COLUMNS if col != first.value]))
+        self.rerun("whatif")
+
+    def step(self):
+        r = self.rng.random()
+        if r < 0.1:
+            self.switch_language()
+        elif self.page != "predict":
+            others = [p for p in PAGES[self.lang] if p != self.page]
+            self.navigate(self.rng.choices(others, weights=[3 if p == "predict" else 1 for p in others])[0])
+        elif r < 0.25:
+            self.navigate(self.rng.choice(["home", "about"]))
+        elif self.predicted and r < 0.45:
+            self.what_if()
+        else:
+            self.fill_and_predict()
+
+    def run_until(self, deadline):
+        while time.perf_counter() < deadline:
+            try:
+                self.step()
+            except LookupError as e:
+                # Rerun sebelumnya gagal, widget hilang: muat ulang seperti pengguna
+                self.errors += 1
+                self.error_messages.add(f"widget not found: {e}")
+                self.at, self.lang, self.page, self.predicted = _app_test(), "Indonesia", "home", False
+                self.rerun("start")
+            if self.think:
+                time.sleep(max(0.0, min(self.rng.expovariate(1 / self.think), deadline - time.perf_counter())))
+
+
+# ------------------------------------------------------------------
+# Measurements
+# ------------------------------------------------------------------
+def memory_per_session(sessions=4, seed=0):
+    """Python heap (tracemalloc) kept alive per session after a full visit."""
+    warm = Session(seed, 0)
+    warm.rerun("start")
+    warm.navigate("predict")
+    warm.fill_and_predict()  # cache bersama sudah terisi sebelum diukur
+
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    alive = []
+    for i in range(sessions):
+        session = Session(seed + 1 + i, 0)
+        session.rerun("start")
+        session.navigate("about")
+        session.navigate("predict")
+        session.fill_and_predict()
+        alive.append(session)
+    gc.collect()
+    per_session = (tracemalloc.get_traced_memory()[0] - base) / sessions
+    tracemalloc.stop()
+    return per_session
+
+
+def run_level(n, duration, think, seed):
+    gc.collect()
+    rss_before = rss_bytes()
+    metrics.registry.reset()
+    sessions = [Session(seed * 10_000 + i, think) for i in range(n)]
+    ready = threading.Barrier(n + 1)
+    go = threading.Event()
+    window = {}
+
+    def worker(session):
+        session.rerun("start")
+        ready.wait()
+        go.wait()
+        session.run_until(window["deadline"])
+
+    threads = [threading.Thread(target=worker, args=(s,), daemon=True) for s in sessions]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    rss_ready = rss_bytes()
+
+    start = time.perf_counter()
+    window["deadline"] = start + duration
+    go.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    by_action = defaultdict(list)
+    for session in sessions:
+        for action, samples in session.samples.items():
+            if action != "start":
+                by_action[action].extend(samples)
+    all_samples = [s for samples in by_action.values() for s in samples]
+    result = {
+        "sessions": n,
+        "seconds": elapsed,
+        "reruns": len(all_samples),
+        "reruns_per_s": len(all_samples) / elapsed,
+        "errors": sum(s.errors for s in sessions),
+        "error_messages": sorted(set().union(*(s.error_messages for s in sessions)))[:10],
+        "latency": summarize(all_samples) if all_samples else None,
+        "by_action": {action: summarize(samples) for action, samples in sorted(by_action.items())},
+        "first_run": summarize([s.samples["start"][0] for s in sessions]),
+        "rss_mb": rss_bytes() / 1e6,
+        "rss_per_session_mb": max(0, rss_ready - rss_before) / n / 1e6,
+    }
+    if metrics.registry.enabled:
+        result["stages"] = metrics.registry.summary()
+    return result
+
+
+def find_saturation(levels, slo_ms):
+    """First level past the SLO, with errors, or where throughput stops scaling."""
+    previous = None
+    for level in levels:
+        if level["errors"]:
+            return {"sessions": level["sessions"], "reason": f"{level['errors']} failed reruns"}
+        if level["latency"] and level["latency"]["p95_ms"] > slo_ms:
+            return {"sessions": level["sessions"],
+                    "reason": f"p95 {level['latency']['p95_ms']:.0f} ms > SLO {slo_ms:.0f} ms"}
+        if previous and previous["reruns_per_s"] and level["sessions"] > previous["sessions"]:
+            growth = level["reruns_per_s"] / previous["reruns_per_s"] - 1
+            ideal = level["sessions"] / previous["sessions"] - 1
+            if growth < 0.5 * ideal:
+                return {"sessions": level["sessions"],
+                        "reason": f"throughput +{growth:.0%} for +{ideal:.0%} sessions"}
+        previous = level
+    return None
+
+
+def print_level(level):
+    lat = level["latency"] or {"p50_ms": float("nan"), "p95_ms": float("nan"), "p99_ms": float("nan")}
+    print(f"{level['sessions']:>8} {level['reruns_per_s']:>10.1f} {lat['p50_ms']:>8.0f} {lat['p95_ms']:>8.0f} "
+          f"{lat['p99_ms']:>8.0f} {level['errors']:>7} {level['rss_per_session_mb']:>13.1f}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent Streamlit sessions against apps.py.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrency levels, run in this order")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="mean think time between actions")
+    parser.add_argument("--slo-ms", type=float, default=1000.0, help="rerun p95 latency objective")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", action="store_true", help="also collect the app's per-stage timings")
+    parser.add_argument("-o", "--output", help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.CRITICAL)  # "missing ScriptRunContext" dari thread AppTest
+    # Form acak tidak boleh masuk ke predictions.sqlite / histogram drift yang asli
+    disable_side_effects()
+    if args.stages:
+        metrics.enable()
+    try:
+        share_server_state()
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    heap = memory_per_session(seed=args.seed)
+    print(f"Python heap per session: {heap / 1e6:.2f} MB", flush=True)
+    print(f"{'sessions':>8} {'reruns/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} "
+          f"{'RSS/sess MB':>13}", flush=True)
+
+    levels = []
+    for n in args.sessions:
+        level = run_level(n, args.duration, args.think_ms / 1000, args.seed)
+        levels.append(level)
+        print_level(level)
+        if level["latency"] and level["latency"]["p95_ms"] > 2 * args.slo_ms:
+            print("stopping: p95 is more than twice the SLO", file=sys.stderr)
+            break
+
+    saturation = find_saturation(levels, args.slo_ms)
+    if saturation is None:
+        print(f"✅ Not saturated up to {levels[-1]['sessions']} sessions")
+    else:
+        within = [level["sessions"] for level in levels if level["sessions"] < saturation["sessions"]]
+        print(f"⚠️ Saturation at {saturation['sessions']} sessions ({saturation['reason']}); "
+              f"last good level: {within[-1] if within else 'none'}")
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "cpus": os.cpu_count(),
+            "settings": {"duration": args.duration, "think_ms": args.think_ms, "slo_ms": args.slo_ms,
+                         "seed": args.seed},
+            "heap_per_session_mb": heap / 1e6,
+            "levels": levels,
+            "saturation": saturation,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""\
+metrics.py
+-----------------
+Per-stage timing instrumentation with a Prometheus-style text export.
+
+Usage:
+    with metrics.timer("predict.encode"):
+        ...
+
+Each stage keeps
+- a cumulative histogram (fixed buckets, seconds) for the text export
+- a rolling window of the last WINDOW samples for p50/p95 in the debug panel
+
+Disabled by default. When disabled, timer() hands back one shared
+nullcontext and observe() returns immediately, so instrumented code pays
+roughly one attribute check per stage.
+
+Enable with APP_METRICS=1 (or metrics.enable()). With METRICS_PORT set as
+well, start_http_exporter() serves /metrics from a daemon thread, because
+Streamlit itself cannot add routes. server.py exposes the same text on
+GET /metrics.
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+WINDOW = 1024
+
+_NOOP = contextlib.nullcontext()
+
+
+class StageStats:
+    __slots__ = ("counts", "total", "count", "recent")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # +Inf di akhir
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=WINDOW)
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+
+class Registry:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.observe(seconds)
+
+    def timer(self, stage):
+        if not self.enabled:
+            return _NOOP
+        return self._timer(stage)
+
+    @contextlib.contextmanager
+    def _timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def summary(self):
+        """{stage: {count, mean_ms, p50_ms, p95_ms}} over the rolling window."""
+        with self._lock:
+            items = [(stage, stats.count, sorted(stats.recent)) for stage, stats in self._stages.items()]
+        out = {}
+        for stage, count, recent in sorted(items):
+            if not recent:
+                continue
+            out[stage] = {
+                "count": count,
+                "mean_ms": 1000 * sum(recent) / len(recent),
+                "p50_ms": 1000 * recent[len(recent) // 2],
+                "p95_ms": 1000 * recent[min(len(recent) - 1, int(0.95 * len(recent)))],
+            }
+        return out
+
+    def export_text(self, extra_gauges=None):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            "# HELP app_stage_seconds Time spent per instrumented stage.",
+            "# TYPE app_stage_seconds histogram",
+        ]
+        with self._lock:
+            snapshot = [(stage, list(s.counts), s.total, s.count) for stage, s in sorted(self._stages.items())]
+        for stage, counts, total, count in snapshot:
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for le, n in zip(list(BUCKETS) + ["+Inf"], counts):
+                cumulative += n
+                lines.append(f'app_stage_seconds_bucket{{stage="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'app_stage_seconds_sum{{stage="{label}"}} {total!r}')
+            lines.append(f'app_stage_seconds_count{{stage="{label}"}} {count}')
+        described = set()
+        for name, (help_text, value) in sorted((extra_gauges or {}).items()):
+            # name boleh berlabel, mis. app_model_served{model="candidate"}
+            base = name.split("{", 1)[0]
+            if base not in described:
+                described.add(base)
+                lines.append(f"# HELP {base} {help_text}")
+                lines.append(f"# TYPE {base} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry(enabled=os.environ.get("APP_METRICS", "") == "1")
+
+# Alias modul-level agar pemanggil cukup: metrics.timer("...")
+timer = registry.timer
+observe = registry.observe
+
+
+def enable(on=True):
+    registry.enabled = on
+
+
+def is_enabled():
+    return registry.enabled
+
+
+def cache_gauges():
+    """Prediction cache counters as extra gauges for export_text()."""
+    import prediction_cache
+
+    stats = prediction_cache.default_cache.stats()
+    return {
+        "app_prediction_cache_hits": ("Prediction cache hits.", stats["hits"]),
+        "app_prediction_cache_misses": ("Prediction cache misses.", stats["misses"]),
+        "app_prediction_cache_evictions": ("Prediction cache evictions.", stats["evictions"]),
+        "app_prediction_cache_size": ("Entries in the prediction cache.", stats["size"]),
+    }
+
+
+def export_text():
+    gauges = cache_gauges()
+    # Statistik per model hanya bila model_registry memang dipakai proses ini
+    model_registry = sys.modules.get("model_registry")
+    if model_registry is not None:
+        gauges.update(model_registry.default_registry.gauges())
+    audit_log = sys.modules.get("audit_log")
+    if audit_log is not None and audit_log.default_log is not None:
+        gauges.update(audit_log.default_log.gauges())
+    drift = sys.modules.get("drift")
+    if drift is not None and drift.default_monitor is not None:
+        gauges.update(drift.default_monitor.gauges())
+    return registry.export_text(gauges)
+
+
+# ------------------------------------------------------------------
+# HTTP exporter (untuk proses Streamlit)
+# ------------------------------------------------------------------
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = export_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_http_exporter(port=None, host="127.0.0.1"):
+    """Serve /metrics once per process (METRICS_PORT env var if ``port`` is None)."""
+    global _exporter
+    port = port or os.environ.get("METRICS_PORT")
+    if not port:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_exporter.serve_forever, name="metrics-exporter", daemon=True).start()
+    return _exporter
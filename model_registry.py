@@ -0,0 +1,215 @@
+"""\
+model_registry.py
+-----------------
+Several model versions side by side, with A/B routing and shadow scoring.
+
+- Entries are named ("production", "candidate", ...) and resolved through
+  resources.load_predictor on every call, so each one hot-reloads and the
+  Predictor objects are the process-wide cached ones shared by all sessions;
+  equal encoder / scaler tables are shared between entries as well
+- A/B routing: ``fraction`` of routing keys (one per Streamlit session, so a
+  user sticks to one model) is served by the candidate, the rest by the
+  primary model
+- Shadow scoring: every other entry scores the same features on a daemon
+  worker thread fed by a bounded queue. The user-facing request only pays
+  a queue put; when the queue is full the shadow job is dropped (counted),
+  never waited for
+- Per-model stats: served / shadow counts, served latency (including the
+  prediction cache) and shadow latency p50/p95, and agreement with the
+  served model (same decision at each model's own threshold, mean
+  |delta probability|)
+
+Configuration for apps.py (environment):
+    CANDIDATE_MODEL_PATH   bundle (.joblib) or slim model (.json) to trial
+    CANDIDATE_FRACTION     share of sessions served by the candidate (0-1,
+                           default 0: shadow only)
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+
+import metrics
+import resources
+from prediction_cache import PredictionCache, default_cache, model_version
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile_us(ordered, q):
+    return 1e6 * ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+
+class ModelEntry:
+    def __init__(self, name, path, cache):
+        self.name = name
+        self.path = path
+        self.cache = cache
+        self.served = 0
+        self.shadowed = 0
+        self.agreed = 0
+        self.abs_diff = 0.0
+        self.latency = metrics.StageStats()         # dilayani ke pengguna
+        self.shadow_latency = metrics.StageStats()  # dinilai di background
+
+    def predictor(self):
+        return resources.load_predictor(self.path)
+
+
+class ModelRegistry:
+    def __init__(self, shadow_queue=1024):
+        self.entries = {}
+        self.primary = None
+        self.candidate = None
+        self.fraction = 0.0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=shadow_queue)
+        self._worker = None
+
+    def register(self, name, path, primary=False, cache=None):
+        """Add a model; the primary one defaults to the shared prediction cache."""
+        if cache is None:
+            cache = default_cache if primary else PredictionCache(maxsize=default_cache.maxsize)
+        self.entries[name] = ModelEntry(name, path, cache)
+        if primary or self.primary is None:
+            self.primary = name
+        return self.entries[name]
+
+    def set_candidate(self, name, fraction):
+        if name not in self.entries:
+            raise KeyError(name)
+        self.candidate = name
+        self.fraction = min(max(float(fraction), 0.0), 1.0)
+
+    # -- routing --------------------------------------------------------
+    def route(self, key):
+        """Model name serving routing ``key`` (stable: same key -> same model)."""
+        if self.candidate is None or self.fraction <= 0.0:
+            return self.primary
+        digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest, "big") / 2 ** 64
+        return self.candidate if bucket < self.fraction else self.primary
+
+    def predict(self, features, key, compute=None):
+        """Serve one prediction; returns (probability, model name, predictor).
+
+        ``compute`` replaces the default (cached Predictor) scoring for the
+        primary model, e.g. to go through the risk table or server.py.
+        Every other entry is scored in the background.
+        """
+        name = self.route(key)
+        entry = self.entries[name]
+        predictor = entry.predictor()
+
+        start = time.perf_counter()
+        if name == self.primary and compute is not None:
+            prob = compute()
+        else:
+            prob = entry.cache.get_or_compute(features, model_version(predictor),
+                                              lambda: predictor.predict_proba(features))
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            entry.served += 1
+            entry.latency.observe(elapsed)
+        if len(self.entries) > 1:
+            self._enqueue(features, name, prob >= predictor.threshold, prob)
+        return prob, name, predictor
+
+    # -- shadow ---------------------------------------------------------
+    def _enqueue(self, features, served_name, served_decision, served_prob):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+                    self._worker.start()
+        try:
+            self._queue.put_nowait((dict(features), served_name, served_decision, served_prob))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            features, served_name, served_decision, served_prob = self._queue.get()
+            try:
+                self.shadow_score(features, served_name, served_decision, served_prob)
+            except Exception as e:
+                # Shadow tidak boleh mengganggu layanan utama
+                logger.warning("Shadow scoring gagal: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def shadow_score(self, features, served_name, served_decision, served_prob):
+        """Score ``features`` with every entry except the served one and record agreement."""
+        for name, entry in list(self.entries.items()):
+            if name == served_name:
+                continue
+            predictor = entry.predictor()
+            start = time.perf_counter()
+            prob = predictor.predict_proba(features)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry.shadowed += 1
+                entry.agreed += (prob >= predictor.threshold) == served_decision
+                entry.abs_diff += abs(prob - served_prob)
+                entry.shadow_latency.observe(elapsed)
+
+    def drain(self, timeout=5.0):
+        """Wait until queued shadow jobs are done (tests / benchmarks)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    # -- stats ----------------------------------------------------------
+    def stats(self):
+        out = {}
+        with self._lock:
+            for name, entry in self.entries.items():
+                served = sorted(entry.latency.recent)
+                shadow = sorted(entry.shadow_latency.recent)
+                out[name] = {
+                    "path": str(entry.path),
+                    "role": "primary" if name == self.primary else
+                            "candidate" if name == self.candidate else "shadow",
+                    "fraction": self.fraction if name == self.candidate else None,
+                    "served": entry.served,
+                    "shadowed": entry.shadowed,
+                    "agreement": entry.agreed / entry.shadowed if entry.shadowed else None,
+                    "mean_abs_diff": entry.abs_diff / entry.shadowed if entry.shadowed else None,
+                    "p50_us": _percentile_us(served, 0.5),
+                    "p95_us": _percentile_us(served, 0.95),
+                    "shadow_p50_us": _percentile_us(shadow, 0.5),
+                    "shadow_p95_us": _percentile_us(shadow, 0.95),
+                }
+        return out
+
+    def gauges(self):
+        """Per-model counters as extra gauges for metrics.export_text()."""
+        gauges = {"app_shadow_dropped": ("Shadow jobs dropped because the queue was full.", self.dropped)}
+        for name, stats in self.stats().items():
+            gauges[f'app_model_served{{model="{name}"}}'] = ("Predictions served per model.", stats["served"])
+            gauges[f'app_model_shadowed{{model="{name}"}}'] = ("Shadow predictions per model.", stats["shadowed"])
+            if stats["agreement"] is not None:
+                gauges[f'app_model_agreement{{model="{name}"}}'] = (
+                    "Share of shadow decisions equal to the served decision.", stats["agreement"])
+        return gauges
+
+
+def from_env(model_path=resources.MODEL_PATH):
+    """Registry with the production model plus CANDIDATE_MODEL_PATH, if set."""
+    registry = ModelRegistry()
+    registry.register("production", model_path, primary=True)
+    candidate = os.environ.get("CANDIDATE_MODEL_PATH", "").strip()
+    if candidate:
+        registry.register("candidate", candidate)
+        registry.set_candidate("candidate", os.environ.get("CANDIDATE_FRACTION", "0") or 0)
+    return registry
+
+
+# Satu registry per proses server
+default_registry = from_env()
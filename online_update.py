@@ -0,0 +1,331 @@
+"""\
+online_update.py
+-----------------
+Incremental model updates from newly ingested survey responses.
+
+Instead of a full retrain (train.py), each update touches only the rows of
+store sources the model has not learned yet (see ingest.py / dataset_store):
+
+- Running scaler: StandardScaler.partial_fit on the new rows only
+- Encoder check: the bundle's LabelEncoder classes must equal the store's
+  categories (so store codes are the model's codes); otherwise the update is
+  refused and a full retrain is needed
+- Logistic update: Laplace-approximated online Bayesian logistic regression.
+  The bundle keeps the posterior precision (an 11x11 matrix, in raw-feature
+  coordinates so it survives scaler updates); the new rows are fitted by
+  Newton steps with that precision as a Gaussian prior around the current
+  coefficients, and their Hessian is added to it. One update costs
+  O(new rows x 11^2) per Newton step, independent of history size.
+
+A bootstrap ensemble (bootstrap.py) is shifted by the same raw-coordinate
+step as the point model, so every member keeps its offset from it and
+Predictor.interval stays centred on the updated probability; the spread
+still reflects the data the ensemble was fitted on (run bootstrap.py again
+to refit it, bundle["bootstrap"]["shifted"] counts the shifts since).
+
+The first update of a bundle without online state builds the precision once
+from the rows the bundle was trained on (Primer + Sekunder by default), plus
+the L2 prior implied by the model's C.
+
+Publishing (atomic, versioned):
+1. model_versions/model_depression.v0001.joblib   (outgoing bundle, as is)
+   model_versions/model_depression.v0002.joblib   (new bundle)
+2. model_depression.joblib                        (temp file + os.replace)
+3. model_depression.json                          (slim export, same way)
+4. risk_table.npy, if it was built from the replaced bundle (rebuilt)
+(steps 2-4: train.publish_bundle). The app's resource cache notices the new
+bundle on the next rerun; a stale slim export or risk table in between is
+never used (see resources.py). --rollback publishes an archived version
+again the same way.
+
+Run:
+    python ingest.py new_responses.csv
+    python online_update.py
+    python online_update.py --dry-run
+    python online_update.py --rollback                # previous version
+    python online_update.py --rollback 1
+"""
+
+import argparse
+import copy
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import dataset_store
+import resources
+from scoring import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, TARGET_COLUMN
+from train import publish_bundle, write_bundle
+
+VERSIONS_DIR = "model_versions"  # relatif terhadap folder bundle
+
+
+class IncompatibleBundleError(ValueError):
+    """The bundle's encoders do not match the dataset store (retrain with train.py)."""
+
+
+def check_encoders(bundle):
+    for col in CATEGORICAL_COLUMNS:
+        classes = bundle["encoders"][col].classes_.tolist()
+        if classes != dataset_store.CATEGORIES[col]:
+            raise IncompatibleBundleError(f"{col!r}: bundle classes {classes} != store {dataset_store.CATEGORIES[col]}")
+    if bundle["encoders"][TARGET_COLUMN].classes_.tolist() != [0, 1]:
+        raise IncompatibleBundleError("target encoder is not {0, 1}")
+
+
+def design_matrix(table):
+    """(X raw features in FEATURE_COLUMNS order, y 0/1) from store rows."""
+    codes = dataset_store.to_codes(table)
+    X = np.column_stack([codes[col].astype(np.float64) for col in FEATURE_COLUMNS])
+    return X, codes[TARGET_COLUMN].astype(np.float64)
+
+
+# ------------------------------------------------------------------
+# Laplace update (NumPy)
+# ------------------------------------------------------------------
+def scaled_to_raw(mean, scale):
+    """T with theta_raw = T @ theta_scaled, theta = [coef..., intercept]."""
+    d = len(mean)
+    T = np.zeros((d + 1, d + 1))
+    T[:d, :d] = np.diag(1.0 / scale)
+    T[d, :d] = -mean / scale
+    T[d, d] = 1.0
+    return T
+
+
+def _sigmoid(z):
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+def hessian(X1, theta):
+    p = _sigmoid(X1 @ theta)
+    return (X1.T * (p * (1.0 - p))) @ X1
+
+
+def laplace_update(theta, precision, X1, y, max_iter=50, tol=1e-10):
+    """MAP estimate for the new rows under N(theta, precision^-1); returns (theta, precision).
+
+    Newton steps with backtracking: the loss is convex, but a full step from
+    a confident, wrong start can overshoot.
+    """
+    def objective(t):
+        z = X1 @ t
+        d = t - theta
+        return np.sum(np.logaddexp(0.0, z) - y * z) + 0.5 * d @ precision @ d
+
+    new, value = theta.copy(), objective(theta)
+    for _ in range(max_iter):
+        grad = X1.T @ (_sigmoid(X1 @ new) - y) + precision @ (new - theta)
+        step = np.linalg.solve(hessian(X1, new) + precision, grad)
+        rate = 1.0
+        while True:
+            candidate = new - rate * step
+            candidate_value = objective(candidate)
+            if candidate_value <= value - 1e-4 * rate * (grad @ step) or rate < 1e-8:
+                break
+            rate *= 0.5
+        new, value = candidate, candidate_value
+        if np.max(np.abs(rate * step)) < tol:
+            break
+    return new, precision + hessian(X1, new)
+
+
+def log_loss(X1, y, theta):
+    z = X1 @ theta
+    return float(np.mean(np.logaddexp(0.0, z) - y * z)) if len(y) else float("nan")
+
+
+# ------------------------------------------------------------------
+# Update
+# ------------------------------------------------------------------
+def initial_state(bundle, table, meta, trained_on):
+    """Online state for a bundle from train.py: precision from its training rows + L2 prior."""
+    X, _ = design_matrix(dataset_store.source_rows(table, meta, trained_on))
+    if not len(X):
+        raise ValueError("none of the bundle's training files are store sources (see --trained-on)")
+    scaler, model = bundle["scaler"], bundle["model"]
+    X1 = np.column_stack([(X - scaler.mean_) / scaler.scale_, np.ones(len(X))])
+    theta = np.append(model.coef_[0], model.intercept_[0])
+    prior = np.diag(np.append(np.full(len(FEATURE_COLUMNS), 1.0 / model.C), 0.0))
+    precision_scaled = hessian(X1, theta) + prior
+    T_inv = np.linalg.inv(scaled_to_raw(scaler.mean_, scaler.scale_))
+    return {
+        "version": 1,
+        "sources": sorted(trained_on),
+        "rows_seen": int(len(X)),
+        "precision_raw": (T_inv.T @ precision_scaled @ T_inv).tolist(),
+    }
+
+
+def update_bundle(bundle, table, meta, trained_on):
+    """Return (new bundle, report) learning the store sources not in the bundle's state.
+
+    ``bundle`` is not modified. The report has rows, loss before/after, and
+    the learned source names; new bundle is None when nothing is new.
+    """
+    import pandas as pd
+
+    check_encoders(bundle)
+    state = bundle.get("online") or initial_state(bundle, table, meta, trained_on)
+    new_sources = [s["sha256"] for s in meta["sources"] if s["sha256"] not in state["sources"]]
+    report = {"sources": [s["name"] for s in meta["sources"] if s["sha256"] in new_sources], "rows": 0}
+    if not new_sources:
+        return None, report
+
+    X, y = design_matrix(dataset_store.source_rows(table, meta, set(new_sources)))
+    old_scaler, model = bundle["scaler"], bundle["model"]
+    theta_raw = scaled_to_raw(old_scaler.mean_, old_scaler.scale_) @ np.append(model.coef_[0], model.intercept_[0])
+
+    scaler = copy.deepcopy(old_scaler)
+    scaler.partial_fit(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+
+    # Parameter + presisi ke koordinat scaler baru
+    T = scaled_to_raw(scaler.mean_, scaler.scale_)
+    theta = np.linalg.solve(T, theta_raw)
+    precision = T.T @ np.asarray(state["precision_raw"]) @ T
+
+    X1 = np.column_stack([scaler.transform(pd.DataFrame(X, columns=FEATURE_COLUMNS)), np.ones(len(X))])
+    loss_before = log_loss(X1, y, theta)
+    theta, precision = laplace_update(theta, precision, X1, y)
+
+    model = copy.deepcopy(model)
+    model.coef_ = theta[None, :-1].copy()
+    model.intercept_ = theta[-1:].copy()
+
+    T_inv = np.linalg.inv(T)
+    new_bundle = dict(bundle, model=model, scaler=scaler)
+    new_bundle["version"] = bundle.get("version", 1) + 1
+    new_bundle["online"] = {
+        "version": 1,
+        "sources": sorted(set(state["sources"]) | set(new_sources)),
+        "rows_seen": state["rows_seen"] + len(X),
+        "precision_raw": (T_inv.T @ precision @ T_inv).tolist(),
+    }
+    if bundle.get("bootstrap") is not None:
+        # Ensemble bootstrap (bootstrap.py) ikut digeser sebesar langkah model
+        # di koordinat raw: interval tetap mengelilingi probabilitas baru
+        shift = T @ theta - theta_raw
+        ensemble = bundle["bootstrap"]
+        new_bundle["bootstrap"] = dict(
+            ensemble,
+            weights=np.asarray(ensemble["weights"]) + shift[:-1],
+            bias=np.asarray(ensemble["bias"]) + shift[-1],
+            shifted=ensemble.get("shifted", 0) + 1,
+        )
+    report.update(rows=int(len(X)), loss_before=loss_before, loss_after=log_loss(X1, y, theta))
+    return new_bundle, report
+
+
+def _archive_path(model_path, versions_dir, version):
+    return versions_dir / f"{model_path.stem}.v{version:04d}{model_path.suffix}"
+
+
+def archived_versions(model_path, versions_dir=VERSIONS_DIR):
+    """{version: archived bundle path} of ``model_path``."""
+    model_path = Path(model_path)
+    found = {}
+    for path in (model_path.parent / versions_dir).glob(f"{model_path.stem}.v*{model_path.suffix}"):
+        number = path.name[len(model_path.stem) + 2:-len(model_path.suffix) or None]
+        if number.isdigit():
+            found[int(number)] = path
+    return found
+
+
+def _archive_current(model_path, versions_dir):
+    # Bundle yang akan diganti diarsipkan apa adanya (byte yang sama), sekali per versi
+    if not model_path.exists():
+        return None
+    archived = _archive_path(model_path, versions_dir, resources.load_bundle(model_path).get("version", 1))
+    if not archived.exists():
+        tmp = f"{archived}.tmp"
+        shutil.copyfile(model_path, tmp)
+        os.replace(tmp, archived)
+    return archived
+
+
+def publish(bundle, model_path, versions_dir=VERSIONS_DIR):
+    """Archive the outgoing and the new bundle, then atomically publish the new one.
+
+    The new bundle gets the next free version number (a version abandoned by
+    a rollback is never overwritten). Returns the new bundle's archive path.
+    """
+    model_path = Path(model_path)
+    directory = model_path.parent / versions_dir
+    directory.mkdir(exist_ok=True)
+    _archive_current(model_path, directory)
+    taken = archived_versions(model_path, versions_dir)
+    bundle["version"] = max([bundle.get("version", 1)] + [v + 1 for v in taken])
+    archived = _archive_path(model_path, directory, bundle["version"])
+    write_bundle(bundle, archived)
+    publish_bundle(bundle, model_path)
+    return archived
+
+
+def rollback(model_path, version=None, versions_dir=VERSIONS_DIR):
+    """Publish the archived bundle ``version`` again (default: the newest one before the current).
+
+    Returns the archive path that was restored.
+    """
+    model_path = Path(model_path)
+    versions = archived_versions(model_path, versions_dir)
+    if version is None:
+        current = resources.load_bundle(model_path).get("version", 1)
+        older = [v for v in versions if v < current]
+        if not older:
+            raise ValueError(f"no archived version older than v{current} in {model_path.parent / versions_dir}")
+        version = max(older)
+    if version not in versions:
+        raise ValueError(f"v{version} is not archived (have {sorted(versions)})")
+    _archive_current(model_path, model_path.parent / versions_dir)
+    publish_bundle(resources.load_bundle(versions[version]), model_path)
+    return versions[version]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the model incrementally on newly ingested responses.")
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="model bundle (.joblib)")
+    parser.add_argument("--store", default=str(resources.DATASET_STORE_PATH))
+    parser.add_argument("--trained-on", nargs="+", default=[str(resources.PRIMER_PATH), str(resources.SEKUNDER_PATH)],
+                        help="CSVs the bundle was trained on (used once, for bundles without online state)")
+    parser.add_argument("--dry-run", action="store_true", help="report only, publish nothing")
+    parser.add_argument("--rollback", nargs="?", type=int, const=0, metavar="VERSION",
+                        help="publish an archived version again (default: the one before the current)")
+    args = parser.parse_args(argv)
+
+    if args.rollback is not None:
+        try:
+            restored = rollback(args.model, args.rollback or None)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        print(f"✅ Rolled {args.model} back to {restored}")
+        return 0
+
+    start = time.perf_counter()
+    try:
+        table, meta = dataset_store.open_table(args.store)
+        trained_on = {resources.file_digest(p) for p in args.trained_on if os.path.exists(p)}
+        bundle, report = update_bundle(resources.load_bundle(args.model), table, meta, trained_on)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if bundle is None:
+        print("Nothing new to learn: every store source is already in the model.")
+        return 0
+    elapsed = time.perf_counter() - start
+    print(f"{report['rows']:,} new rows from {report['sources']} in {elapsed:.2f}s "
+          f"(log loss {report['loss_before']:.4f} -> {report['loss_after']:.4f})")
+    if args.dry_run:
+        return 0
+    archived = publish(bundle, args.model)
+    print(f"✅ Published v{bundle['version']} to {args.model} (archived as {archived})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
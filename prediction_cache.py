@@ -0,0 +1,98 @@
+"""\
+prediction_cache.py
+-----------------
+Process-wide LRU cache of prediction probabilities, shared by every
+Streamlit session (and usable by server.py).
+
+- Key: canonical 10-feature tuple in FEATURE_COLUMNS order, with the English
+  category values the encoders use (so "Ya" and "Yes" hit the same entry)
+- Value: P(depression); the threshold is applied by the caller, so a new
+  calibrated threshold does not need a cache flush
+- Bounded: least recently used entries are evicted past ``maxsize``
+- Invalidated: the cache is cleared whenever the model version (bundle
+  SHA-256) changes, e.g. after a hot reload
+- hits / misses / evictions / invalidations counters via stats()
+
+Size: PREDICTION_CACHE_SIZE env var (default 4096 entries, ~1 MB).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from scoring import FEATURE_COLUMNS
+
+
+def cache_key(features):
+    """Canonical, hashable key for a canonical feature dict."""
+    return tuple(features[col] for col in FEATURE_COLUMNS)
+
+
+def model_version(predictor):
+    """Identity of the model behind ``predictor`` (bundle SHA-256 when known)."""
+    return predictor.source_sha256 or f"id:{id(predictor)}"
+
+
+class PredictionCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, features, version, compute):
+        """Cached probability for ``features`` under model ``version``.
+
+        ``compute()`` runs outside the lock, so a slow backend (e.g. the HTTP
+        server) never blocks other sessions' cache hits.
+        """
+        key = cache_key(features)
+        with self._lock:
+            if version != self.version:
+                if self._data:
+                    self.invalidations += 1
+                self._data.clear()
+                self.version = version
+            prob = self._data.get(key)
+            if prob is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return prob
+            self.misses += 1
+
+        prob = compute()
+
+        with self._lock:
+            if version == self.version:
+                self._data[key] = prob
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        return prob
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "version": self.version,
+            }
+
+
+# Satu cache per proses server
+default_cache = PredictionCache(maxsize=int(os.environ.get("PREDICTION_CACHE_SIZE", "4096")))
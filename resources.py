@@ -0,0 +1,292 @@
+"""\
+resources.py
+-----------------
+Process-wide assets shared by every Streamlit session (and by the CLI tools):
+- Model bundle: model_depression.joblib -> {"model", "scaler", "encoders"}
+- Predictor built from that bundle, or from its slim JSON export when that
+  matches the bundle (see scoring.py / export_model.py)
+- Precomputed risk table, if built for that bundle (see risk_table.py)
+- Dataset: Depression Student Dataset Primer.csv + Sekunder.csv (merged),
+  read from the typed, memory-mapped dataset.arrow when it was built from
+  exactly those CSVs (see dataset_store.py); the whole store, ingested rows
+  included, only on request (load_store)
+- Home page image (Depresi.jpeg), pre-scaled to its display width
+
+Each asset is loaded once per process and kept in a module-level cache.
+On every access the source files are stat()-ed (mtime + size); only when
+that signature changes is the file content hashed again, and the asset is
+reloaded only if the bytes really differ. Swapping model_depression.joblib
+therefore takes effect on the next rerun without restarting the server.
+
+Cached objects are shared across sessions: treat them as read-only.
+Predictors loaded side by side (production + candidate, see
+model_registry.py) also share equal encoder and scaler tables.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from pathlib import Path
+
+import metrics
+from risk_table import RiskTable, StaleTableError
+from scoring import Predictor
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Lokasi file
+# ------------------------------------------------------------------
+BASE_DIR = Path(__file__).resolve().parent
+PRIMER_PATH = BASE_DIR / "Depression Student Dataset Primer.csv"
+SEKUNDER_PATH = BASE_DIR / "Depression Student Dataset Sekunder.csv"
+MODEL_PATH = BASE_DIR / "model_depression.joblib"
+RISK_TABLE_PATH = BASE_DIR / "risk_table.npy"
+RISK_TABLE_META_PATH = BASE_DIR / "risk_table.json"
+DATASET_STORE_PATH = BASE_DIR / "dataset.arrow"
+IMAGE_PATH = BASE_DIR / "Depresi.jpeg"
+DRIFT_REFERENCE_PATH = BASE_DIR / "drift_reference.json"
+
+
+# ------------------------------------------------------------------
+# File fingerprint helpers
+# ------------------------------------------------------------------
+def file_signature(path):
+    """Cheap change detector: (mtime_ns, size) from a single stat()."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_digest(*paths):
+    """SHA-256 over the content of one or more files (in order)."""
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+class CacheEntry:
+    __slots__ = ("value", "signature", "digest")
+
+    def __init__(self, value, signature, digest):
+        self.value = value
+        self.signature = signature
+        self.digest = digest
+
+
+class ResourceCache:
+    """Loads a value from a set of files once and reloads it when they change."""
+
+    def __init__(self):
+        self._lock = threading.RLock()  # reentrant: loaders may load other entries
+        self._entries = {}
+
+    def get(self, name, paths, loader):
+        paths = tuple(Path(p) for p in paths)
+        key = (name, paths)
+        signature = tuple(file_signature(p) for p in paths)
+
+        # Fast path: tanpa lock, cukup stat()
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                return entry
+
+            digest = file_digest(*paths)
+            if entry is not None and entry.digest == digest:
+                # File di-touch / disalin ulang dengan isi yang sama
+                entry.signature = signature
+                return entry
+
+            entry = CacheEntry(loader(*paths), signature, digest)
+            self._entries[key] = entry
+            return entry
+
+    def values(self, *names):
+        """Currently cached values of the entries called ``names``."""
+        with self._lock:
+            return [entry.value for (name, _), entry in self._entries.items() if name in names]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = ResourceCache()
+
+
+# ------------------------------------------------------------------
+# Loaders
+# ------------------------------------------------------------------
+# joblib (-> sklearn), pandas dan pyarrow diimpor di dalam loader saja, supaya
+# proses yang cukup dengan model slim tidak membayar impor tersebut.
+def _read_bundle(path):
+    import joblib
+
+    with metrics.timer("load.joblib"):
+        return joblib.load(path)
+
+
+def _read_dataset(primer_path, sekunder_path):
+    import pandas as pd
+
+    # Load dan gabung tanpa ubah kolom
+    with metrics.timer("load.csv"):
+        df_primer = pd.read_csv(primer_path)
+        df_sekunder = pd.read_csv(sekunder_path)
+        return pd.concat([df_primer, df_sekunder], ignore_index=True)
+
+
+def load_bundle(path=MODEL_PATH):
+    """Return the shared {"model", "scaler", "encoders"} bundle."""
+    return _cache.get("bundle", (path,), _read_bundle).value
+
+
+def bundle_digest(path=MODEL_PATH):
+    """SHA-256 of the bundle file (hashed only, never unpickled)."""
+    return _cache.get("sha256", (path,), lambda p: None).digest
+
+
+def _share_tables(predictor):
+    # Tabel read-only (kelas encoder, lookup kode, mean/scale scaler) dipakai
+    # bersama dengan model lain yang sudah dimuat (mis. produksi + kandidat)
+    for other in _cache.values("predictor", "slim"):
+        if other is not predictor:
+            predictor.share_tables(other)
+    return predictor
+
+
+def _read_predictor(path):
+    bundle = load_bundle(path)
+    with metrics.timer("load.predictor_build"):
+        return _share_tables(Predictor.from_bundle(bundle, source_sha256=bundle_digest(path)))
+
+
+def _read_slim(path):
+    with metrics.timer("load.slim"):
+        return _share_tables(Predictor.load(path))
+
+
+def load_predictor(path=MODEL_PATH):
+    """Return the shared scoring.Predictor.
+
+    ``path`` is a .joblib bundle or a slim .json model (export_model.py).
+    For a bundle, the slim export next to it (model_depression.json) is used
+    instead when it was exported from exactly these bundle bytes, so serving
+    needs neither pickle nor sklearn. A stale export falls back to the bundle.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        return _cache.get("slim", (path,), _read_slim).value
+
+    slim_path = path.with_suffix(".json")
+    if slim_path.exists():
+        predictor = _cache.get("slim", (slim_path,), _read_slim).value
+        if not path.exists() or predictor.source_sha256 == bundle_digest(path):
+            return predictor
+    return _cache.get("predictor", (path,), _read_predictor).value
+
+
+def _read_risk_table(table_path, meta_path, model_path):
+    try:
+        return RiskTable.open(table_path, meta_path, bundle_sha256=bundle_digest(model_path))
+    except StaleTableError as e:
+        # Tabel lama tidak pernah dipakai; fallback ke predictor
+        logger.warning("Risk table diabaikan: %s", e)
+        return None
+
+
+def load_risk_table(path=MODEL_PATH, table_path=RISK_TABLE_PATH, meta_path=RISK_TABLE_META_PATH):
+    """Return the shared RiskTable for the current bundle, or None if missing/stale."""
+    try:
+        return _cache.get("risk_table", (table_path, meta_path, path), _read_risk_table).value
+    except FileNotFoundError:
+        return None
+
+
+def _read_store(store_path):
+    import dataset_store
+
+    with metrics.timer("load.store"):
+        table, meta = dataset_store.open_table(store_path)
+        return dataset_store.to_frame(table), meta
+
+
+def load_store(store_path=DATASET_STORE_PATH):
+    """Return (DataFrame, metadata) of the whole dataset store, rows appended by ingest.py included."""
+    return _cache.get("dataset_store", (store_path,), _read_store).value
+
+
+def _read_matching_store(store_path, csv_paths):
+    frame, meta = load_store(store_path)
+    recorded = meta["sources"]
+    # Hanya bila sumber store tepat sama dengan CSV yang diminta (urutan juga);
+    # CSV yang tidak ada dicocokkan lewat nama file saja
+    matches = len(recorded) == len(csv_paths) and all(
+        source["sha256"] == file_digest(path) if Path(path).exists() else source["name"] == Path(path).name
+        for source, path in zip(recorded, csv_paths)
+    )
+    if not matches:
+        # Store dengan baris hasil ingest.py atau CSV yang sudah berubah tidak dipakai; fallback ke CSV
+        names = [source["name"] for source in recorded]
+        logger.warning("Dataset store diabaikan: sumbernya %s, bukan tepat %s", names, [Path(p).name for p in csv_paths])
+        return None
+    return frame
+
+
+def load_dataset(primer_path=PRIMER_PATH, sekunder_path=SEKUNDER_PATH, store_path=DATASET_STORE_PATH):
+    """Return the shared Primer + Sekunder DataFrame.
+
+    Served from the dataset store (categorical / int8 columns) when it exists
+    and its recorded sources are exactly these CSVs, in this order (a CSV
+    that is not present is matched by file name); otherwise the CSVs are
+    parsed. Rows appended by ingest.py are never included: use load_store()
+    for those.
+    """
+    if Path(store_path).exists():
+        csv_paths = (primer_path, sekunder_path)
+        present = tuple(p for p in csv_paths if Path(p).exists())
+        # CSV yang ada ikut di kunci cache: perubahan isinya memicu pengecekan ulang
+        frame = _cache.get("dataset_matching_store", (store_path,) + present,
+                           lambda store, *_: _read_matching_store(store, csv_paths)).value
+        if frame is not None:
+            return frame
+    return _cache.get("dataset", (primer_path, sekunder_path), _read_dataset).value
+
+
+def _read_image(path, width):
+    from PIL import Image
+
+    # Sama seperti st.image(width=...): bilinear, tinggi dibulatkan ke bawah,
+    # JPEG kualitas 90. Bytes hasilnya sudah selebar tampilan, jadi Streamlit
+    # tidak perlu decode + resize + encode lagi di setiap rerun.
+    with metrics.timer("load.image"):
+        with open(path, "rb") as f:
+            data = f.read()
+        if width is None:
+            return data
+        with Image.open(path) as image:
+            if image.width <= width:
+                return data
+            height = int(1.0 * image.height * width / image.width)
+            resized = image.resize((width, height), resample=Image.BILINEAR)
+            out = io.BytesIO()
+            resized.save(out, format=image.format, quality=90)
+            return out.getvalue()
+
+
+def load_image(path=IMAGE_PATH, width=None):
+    """Return the shared image bytes, downscaled to ``width`` pixels if wider."""
+    return _cache.get(f"image@{width}", (path,), lambda p: _read_image(p, width)).value
+
+
+def clear_cache():
+    _cache.clear()
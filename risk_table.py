@@ -0,0 +1,199 @@
+"""\
+risk_table.py
+-----------------
+Precomputed P(depression) for every answer combination the form allows:
+2 gender x 17 age x 5 x 5 x 4 sleep x 3 diet x 2 x 13 study hours x 6 x 2
+= 3,182,400 cells, float64 (~25 MB), axes in FEATURE_COLUMNS order.
+float64 keeps every cell equal to Predictor.predict_proba_matrix, so a
+looked-up answer is classified exactly like a computed one even right at
+the threshold (float32 differed by ~1e-8).
+
+Files (next to the model bundle):
+- risk_table.npy   plain .npy array, opened with mmap_mode="r" so every
+                   worker process shares the same page-cache pages
+- risk_table.json  axes, shape, SHA-256 of the table and SHA-256 of the
+                   model bundle it was built from
+
+A cell is addressed by its mixed-radix position (row-major over the axes),
+so serving is ten dict lookups and one array read. A table built from a
+different bundle than the one being served is rejected (StaleTableError).
+
+Run:
+    python risk_table.py build
+    python risk_table.py check
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from scoring import FEATURE_COLUMNS, NUMERIC_RANGES
+
+FORMAT_VERSION = 1
+
+
+class StaleTableError(ValueError):
+    """The table does not belong to the current bundle (or is corrupted)."""
+
+
+def table_axes(classes):
+    """[(column, [values...]), ...] in FEATURE_COLUMNS order."""
+    axes = []
+    for col in FEATURE_COLUMNS:
+        if col in NUMERIC_RANGES:
+            lo, hi = NUMERIC_RANGES[col]
+            axes.append((col, list(range(lo, hi + 1))))
+        else:
+            axes.append((col, list(classes[col])))
+    return axes
+
+
+# ------------------------------------------------------------------
+# Build
+# ------------------------------------------------------------------
+def build_table(predictor, table_path, meta_path, bundle_sha256):
+    """Score every cell with ``predictor`` and write table + metadata atomically."""
+    # resources mengimpor modul ini; impornya ditunda sampai dipakai
+    import resources
+
+    axes = table_axes(predictor.classes)
+    shape = tuple(len(values) for _, values in axes)
+
+    # Nilai ter-encode per sumbu (kategori -> kode, numerik -> nilai)
+    encoded = [
+        np.arange(len(values), dtype=np.float64) if col in predictor.classes else np.array(values, dtype=np.float64)
+        for col, values in axes
+    ]
+
+    # Satu blok = semua kombinasi 8 sumbu terakhir (93,600 baris);
+    # diulang untuk setiap (gender, usia) agar memori tetap kecil.
+    inner = np.meshgrid(*encoded[2:], indexing="ij")
+    X = np.empty((inner[0].size, len(FEATURE_COLUMNS)), dtype=np.float64)
+    for k, grid in enumerate(inner, start=2):
+        X[:, k] = grid.ravel()
+
+    tmp_table = f"{table_path}.tmp"
+    table = np.lib.format.open_memmap(tmp_table, mode="w+", dtype=np.float64, shape=shape)
+    for i, gender in enumerate(encoded[0]):
+        X[:, 0] = gender
+        for j, age in enumerate(encoded[1]):
+            X[:, 1] = age
+            table[i, j] = predictor.predict_proba_matrix(X).reshape(shape[2:])
+    table.flush()
+    del table
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "dtype": "float64",
+        "shape": list(shape),
+        "axes": axes,
+        "bundle_sha256": bundle_sha256,
+        "table_sha256": resources.file_digest(tmp_table),
+    }
+    tmp_meta = f"{meta_path}.tmp"
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    os.replace(tmp_table, table_path)
+    os.replace(tmp_meta, meta_path)
+    return meta
+
+
+# ------------------------------------------------------------------
+# Serve
+# ------------------------------------------------------------------
+class RiskTable:
+    """Read-only, memory-mapped view of a built table."""
+
+    def __init__(self, table, meta):
+        self.table = table
+        self.meta = meta
+        self._flat = table.reshape(-1)
+
+        # Stride (dalam jumlah sel) per sumbu, row-major
+        strides = np.cumprod([1] + meta["shape"][:0:-1])[::-1].tolist()
+        self._fields = [
+            (col, {value: pos for pos, value in enumerate(values)}, stride)
+            for (col, values), stride in zip(meta["axes"], strides)
+        ]
+
+    @classmethod
+    def open(cls, table_path, meta_path, bundle_sha256=None, verify=True):
+        import resources
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise StaleTableError(f"{meta_path}: unsupported table version {meta.get('version')!r}")
+        if bundle_sha256 is not None and meta["bundle_sha256"] != bundle_sha256:
+            raise StaleTableError(f"{table_path} was built from a different model bundle")
+        if verify and resources.file_digest(table_path) != meta["table_sha256"]:
+            raise StaleTableError(f"{table_path}: checksum mismatch")
+
+        table = np.load(table_path, mmap_mode="r")
+        if list(table.shape) != meta["shape"] or [c for c, _ in meta["axes"]] != FEATURE_COLUMNS:
+            raise StaleTableError(f"{table_path}: layout does not match {meta_path}")
+        return cls(table, meta)
+
+    def index(self, features):
+        """Flat mixed-radix position of a canonical feature dict."""
+        idx = 0
+        for col, lookup, stride in self._fields:
+            try:
+                idx += lookup[features[col]] * stride
+            except KeyError:
+                raise ValueError(f"{col!r} value {features[col]!r} is outside the table domain") from None
+        return idx
+
+    def lookup(self, features):
+        """P(depression) for one canonical feature dict."""
+        return float(self._flat[self.index(features)])
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+def main(argv=None):
+    import resources
+
+    parser = argparse.ArgumentParser(description="Build or check the precomputed risk table.")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="model bundle (.joblib)")
+    parser.add_argument("--table", default=str(resources.RISK_TABLE_PATH))
+    parser.add_argument("--meta", default=str(resources.RISK_TABLE_META_PATH))
+    args = parser.parse_args(argv)
+
+    digest = resources.bundle_digest(args.model)
+
+    if args.command == "build":
+        predictor = resources.load_predictor(args.model)
+        start = time.perf_counter()
+        meta = build_table(predictor, args.table, args.meta, digest)
+        elapsed = time.perf_counter() - start
+        cells = int(np.prod(meta["shape"]))
+        print(f"✅ Wrote {args.table} ({cells:,} cells in {elapsed:.2f}s, {cells / elapsed:,.0f} cells/s)")
+        return 0
+
+    try:
+        table = RiskTable.open(args.table, args.meta, bundle_sha256=digest)
+    except (OSError, StaleTableError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    # Cocokkan sampel sel acak dengan predictor
+    predictor = resources.load_predictor(args.model)
+    rng = np.random.default_rng(0)
+    worst = 0.0
+    for _ in range(1000):
+        features = {col: values[rng.integers(len(values))] for col, values in table.meta["axes"]}
+        worst = max(worst, abs(table.lookup(features) - predictor.predict_proba(features)))
+    print(f"✅ {args.table} matches bundle {digest[:12]} (max |diff| over 1000 cells: {worst:.3g})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+"""\
+scoring.py
+-----------------
+Shared scoring helpers used by apps.py and the command-line tools:
+- Feature schema (column order the scaler/model were fitted on)
+- Vectorized encoding of whole DataFrames with the bundle's LabelEncoders
+- encode -> scale -> predict_proba for many rows at once
+- Predictor: StandardScaler + LogisticRegression folded into one linear
+  scorer (x @ weights + bias -> sigmoid) for single rows and batches
+- Per-feature log-odds contributions coef * (x - mean) / scale, computed in
+  the same pass as the probability (explain / explain_matrix)
+- What-if grids: one feature dict with one or two features swept over
+  alternative values, scored as one batch (what_if)
+- Slim model format: versioned JSON with encoder classes, scaler mean/scale,
+  coef, intercept and threshold; loading it needs only NumPy (no pickle)
+"""
+
+import json
+import math
+
+import numpy as np
+
+import metrics
+
+# pandas / sklearn tidak diimpor di sini: hanya dipakai (lazy) oleh
+# predict_proba_matrix dan Predictor.verify saat bundle .joblib dipakai.
+
+# ------------------------------------------------------------------
+# Schema
+# ------------------------------------------------------------------
+FEATURE_COLUMNS = [
+    "Gender",
+    "Age",
+    "Academic Pressure",
+    "Study Satisfaction",
+    "Sleep Duration",
+    "Dietary Habits",
+    "Have you ever had suicidal thoughts ?",
+    "Study Hours",
+    "Financial Stress",
+    "Family History of Mental Illness",
+]
+
+CATEGORICAL_COLUMNS = [
+    "Gender",
+    "Sleep Duration",
+    "Dietary Habits",
+    "Have you ever had suicidal thoughts ?",
+    "Family History of Mental Illness",
+]
+
+TARGET_COLUMN = "Depression"
+
+# Rentang nilai numerik (inklusif) sesuai widget di show_predict()
+NUMERIC_RANGES = {
+    "Age": (18, 34),
+    "Academic Pressure": (1, 5),
+    "Study Satisfaction": (1, 5),
+    "Study Hours": (0, 12),
+    "Financial Stress": (0, 5),
+}
+
+# Ambang batas default (sama dengan show_predict)
+DEFAULT_THRESHOLD = 0.3
+
+# Slim model format: JSON tanpa pickle (lihat Predictor.to_slim)
+SLIM_FORMAT = "prediksi-depresi-slim"
+SLIM_VERSION = 1
+
+
+# ------------------------------------------------------------------
+# Batch helpers
+# ------------------------------------------------------------------
+def encode_frame(frame, encoders):
+    """Encode the feature columns of ``frame`` into a float matrix (FEATURE_COLUMNS order).
+
+    Raises ValueError (from LabelEncoder) if a categorical column holds an
+    unseen value.
+    """
+    X = np.empty((len(frame), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for j, col in enumerate(FEATURE_COLUMNS):
+        if col in CATEGORICAL_COLUMNS:
+            X[:, j] = encoders[col].transform(frame[col].to_numpy())
+        else:
+            X[:, j] = frame[col].to_numpy(dtype=np.float64)
+    return X
+
+
+def predict_proba_matrix(X, model, scaler):
+    """P(depression) for an encoded feature matrix (sklearn path)."""
+    import pandas as pd
+
+    with metrics.timer("sklearn.scaler_transform"):
+        X_scaled = scaler.transform(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+    with metrics.timer("sklearn.predict_proba"):
+        return model.predict_proba(X_scaled)[:, 1]
+
+
+def score_frame(frame, bundle, threshold=DEFAULT_THRESHOLD):
+    """Return (probability, prediction) arrays for every row of ``frame``."""
+    X = encode_frame(frame, bundle["encoders"])
+    prob = predict_proba_matrix(X, bundle["model"], bundle["scaler"])
+    return prob, (prob >= threshold).astype(np.int8)
+
+
+# ------------------------------------------------------------------
+# Folded linear scorer (scaler + logistic regression -> satu dot product)
+# ------------------------------------------------------------------
+def fold_linear(mean, scale, coef, intercept):
+    """Fold StandardScaler statistics into the logistic coefficients.
+
+    ((x - mean) / scale) @ coef + intercept  ==  x @ weights + bias
+    """
+    mean = np.asarray(mean, dtype=np.float64)
+    scale = np.asarray(scale, dtype=np.float64)
+    coef = np.asarray(coef, dtype=np.float64)
+    weights = coef / scale
+    bias = float(intercept - np.dot(coef, mean / scale))
+    return weights, bias
+
+
+def _sigmoid(z):
+    # stabil untuk z besar negatif/positif
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+def _sigmoid_array(z):
+    """Vectorized _sigmoid (same stable form) for the matrix paths."""
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+def probe_matrix(classes, mean, scale, n=256, seed=0):
+    """Deterministic encoded rows spanning every category and +-3 std of each numeric feature."""
+    rng = np.random.default_rng(seed)
+    X = np.empty((n, len(FEATURE_COLUMNS)), dtype=np.float64)
+    for j, col in enumerate(FEATURE_COLUMNS):
+        if col in classes:
+            X[:, j] = rng.integers(0, len(classes[col]), size=n)
+        else:
+            X[:, j] = rng.uniform(mean[j] - 3 * scale[j], mean[j] + 3 * scale[j], size=n)
+    return X
+
+
+class Predictor:
+    """Headless predictor running the folded linear model.
+
+    Category -> code lookups and the folded weights are prepared once, so a
+    single prediction is ten dict lookups plus one short float loop, and a
+    batch is one matrix-vector product. No sklearn or DataFrame calls on the
+    hot path; only NumPy is needed.
+
+    ``features`` maps FEATURE_COLUMNS to canonical (English) values, e.g.
+    {"Gender": "Male", "Age": 22, "Sleep Duration": "5-6 hours", ...}.
+    """
+
+    def __init__(self, classes, mean, scale, coef, intercept, threshold=DEFAULT_THRESHOLD, source_sha256=None,
+                 bootstrap=None):
+        self.classes = {col: list(classes[col]) for col in CATEGORICAL_COLUMNS}
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.threshold = threshold
+        self.source_sha256 = source_sha256
+
+        self.weights, self.bias = fold_linear(self.mean, self.scale, self.coef, self.intercept)
+        self.codes = {
+            col: {cls: float(code) for code, cls in enumerate(self.classes[col])}
+            for col in CATEGORICAL_COLUMNS
+        }
+        # (kolom, lookup kategori atau None untuk numerik)
+        self._fields = [(col, self.codes.get(col)) for col in FEATURE_COLUMNS]
+        self._weights = self.weights.tolist()
+        # weights * mean: kontribusi = x * weights - offsets (0 untuk responden rata-rata)
+        self.offsets = self.weights * self.mean
+        self._offsets = self.offsets.tolist()
+
+        # Ensemble bootstrap (opsional, lihat bootstrap.py): bobot raw (n x 10) + bias
+        self.bootstrap = None
+        if bootstrap is not None:
+            self.bootstrap = {
+                "weights": np.asarray(bootstrap["weights"], dtype=np.float64),
+                "bias": np.asarray(bootstrap["bias"], dtype=np.float64),
+                "level": float(bootstrap["level"]),
+            }
+            n = len(self.bootstrap["bias"])
+            # Indeks order statistic batas bawah / atas interval
+            tail = (1.0 - self.bootstrap["level"]) / 2
+            self._interval_ranks = [int(math.floor(tail * (n - 1))), int(math.ceil((1.0 - tail) * (n - 1)))]
+            # Bias sebagai kolom terakhir: satu matmul dengan [x..., 1]
+            self._bootstrap_aug = np.column_stack([self.bootstrap["weights"], self.bootstrap["bias"]])
+
+    @classmethod
+    def from_bundle(cls, bundle, threshold=None, check=True, source_sha256=None):
+        """Fold the bundle's scaler + model; with ``check`` verify against sklearn.
+
+        ``threshold`` defaults to bundle["threshold"] (see calibrate.py), else 0.3.
+        """
+        if threshold is None:
+            threshold = bundle.get("threshold", DEFAULT_THRESHOLD)
+        scaler = bundle["scaler"]
+        model = bundle["model"]
+        predictor = cls(
+            {col: bundle["encoders"][col].classes_.tolist() for col in CATEGORICAL_COLUMNS},
+            scaler.mean_,
+            scaler.scale_,
+            model.coef_[0],
+            model.intercept_[0],
+            threshold,
+            source_sha256,
+            bundle.get("bootstrap"),
+        )
+        if check:
+            predictor.verify(bundle)
+        return predictor
+
+    def share_tables(self, other):
+        """Reuse ``other``'s encoder lookups and scaler arrays where they are equal.
+
+        Production and candidate models trained on the same survey usually
+        have identical category tables (and often the same scaler); sharing
+        them keeps one copy per process. Returns True if anything was shared.
+        """
+        shared = False
+        if self.classes == other.classes and self.codes is not other.codes:
+            self.classes, self.codes, self._fields = other.classes, other.codes, other._fields
+            shared = True
+        if (self.mean is not other.mean and np.array_equal(self.mean, other.mean)
+                and np.array_equal(self.scale, other.scale)):
+            self.mean, self.scale = other.mean, other.scale
+            shared = True
+        return shared
+
+    # -- slim format ---------------------------------------------------------
+    def to_slim(self):
+        """Plain-JSON representation (see SLIM_FORMAT)."""
+        return {
+            "format": SLIM_FORMAT,
+            "version": SLIM_VERSION,
+            "features": FEATURE_COLUMNS,
+            "classes": self.classes,
+            "scaler": {"mean": self.mean.tolist(), "scale": self.scale.tolist()},
+            "model": {"coef": self.coef.tolist(), "intercept": self.intercept},
+            "threshold": self.threshold,
+            "source_sha256": self.source_sha256,
+            "bootstrap": None if self.bootstrap is None else {
+                "weights": self.bootstrap["weights"].tolist(),
+                "bias": self.bootstrap["bias"].tolist(),
+                "level": self.bootstrap["level"],
+            },
+        }
+
+    @classmethod
+    def from_slim(cls, data):
+        if data.get("format") != SLIM_FORMAT or data.get("version") != SLIM_VERSION:
+            raise ValueError(f"unsupported model format {data.get('format')!r} v{data.get('version')!r}")
+        if data["features"] != FEATURE_COLUMNS:
+            raise ValueError("feature order does not match FEATURE_COLUMNS")
+        return cls(
+            data["classes"],
+            data["scaler"]["mean"],
+            data["scaler"]["scale"],
+            data["model"]["coef"],
+            data["model"]["intercept"],
+            data["threshold"],
+            data.get("source_sha256"),
+            data.get("bootstrap"),
+        )
+
+    def save(self, path):
+        """Write the slim JSON model (floats round-trip exactly via repr)."""
+        with open(path, "w") as f:
+            json.dump(self.to_slim(), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_slim(json.load(f))
+
+    def verify(self, bundle, X=None, atol=1e-9):
+        """Check against model.predict_proba(scaler.transform(X)); return max abs diff.
+
+        ``X`` defaults to a deterministic probe matrix (see probe_matrix).
+        Raises ValueError if any probability differs by more than ``atol``.
+        """
+        scaler = bundle["scaler"]
+        if X is None:
+            X = probe_matrix(self.classes, scaler.mean_, scaler.scale_)
+        expected = predict_proba_matrix(X, bundle["model"], scaler)
+        diff = float(np.max(np.abs(self.predict_proba_matrix(X) - expected)))
+        if not diff <= atol:
+            raise ValueError(f"folded scorer deviates from model.predict_proba by {diff:.3g} (atol={atol})")
+        return diff
+
+    # -- single row -------------------------------------------------------
+    def encode(self, features):
+        """Canonical feature dict -> list of 10 floats in FEATURE_COLUMNS order."""
+        x = []
+        for col, lookup in self._fields:
+            value = features[col]
+            if lookup is None:
+                x.append(float(value))
+            else:
+                try:
+                    x.append(lookup[value])
+                except KeyError:
+                    raise ValueError(f"{col!r} contains previously unseen label: {value!r}") from None
+        return x
+
+    def predict_proba_encoded(self, x):
+        """P(depression) for an encoded row (see encode)."""
+        z = 0.0
+        for v, w in zip(x, self._weights):
+            z += v * w
+        z += self.bias
+        return _sigmoid(z)
+
+    def predict_proba(self, features):
+        return self.predict_proba_encoded(self.encode(features))
+
+    def predict(self, features):
+        """Return (probability, prediction) for one canonical feature dict."""
+        prob = self.predict_proba(features)
+        return prob, 1 if prob >= self.threshold else 0
+
+    def explain_encoded(self, x):
+        """(P(depression), per-feature log-odds contributions) for an encoded row.
+
+        Contributions are coef * scaled input, i.e. relative to an average
+        respondent; they sum to logit(P) - intercept.
+        """
+        contributions = [v * w - o for v, w, o in zip(x, self._weights, self._offsets)]
+        z = sum(contributions) + self.intercept
+        return _sigmoid(z), contributions
+
+    def explain(self, features):
+        """Return (probability, {column: log-odds contribution}) for one canonical feature dict."""
+        prob, contributions = self.explain_encoded(self.encode(features))
+        return prob, dict(zip(FEATURE_COLUMNS, contributions))
+
+    def interval_encoded(self, x):
+        """(low, high) bootstrap interval of P(depression) for an encoded row, or None.
+
+        One (members x 10) product for all member logits; only the two order
+        statistics go through the sigmoid (it is monotonic).
+        """
+        if self.bootstrap is None:
+            return None
+        z = self._bootstrap_aug @ np.array(list(x) + [1.0])
+        z.partition(self._interval_ranks)
+        low, high = self._interval_ranks
+        return _sigmoid(float(z[low])), _sigmoid(float(z[high]))
+
+    def interval(self, features):
+        return self.interval_encoded(self.encode(features))
+
+    # -- batch ------------------------------------------------------------
+    def encode_frame(self, frame):
+        """Vectorized encode of a DataFrame (same codes as the LabelEncoders)."""
+        X = np.empty((len(frame), len(FEATURE_COLUMNS)), dtype=np.float64)
+        for j, (col, lookup) in enumerate(self._fields):
+            if lookup is None:
+                X[:, j] = frame[col].to_numpy(dtype=np.float64)
+            else:
+                codes = frame[col].map(lookup)
+                if codes.isna().any():
+                    unseen = sorted(set(frame[col][codes.isna()].astype(str)))
+                    raise ValueError(f"{col!r} contains previously unseen labels: {unseen}")
+                X[:, j] = codes.to_numpy(dtype=np.float64)
+        return X
+
+    def predict_proba_matrix(self, X):
+        """P(depression) for an encoded matrix: one dot product + sigmoid."""
+        z = X @ self.weights
+        z += self.bias
+        return _sigmoid_array(z)
+
+    def interval_matrix(self, X):
+        """(low, high) arrays of the bootstrap interval for an encoded matrix, or None."""
+        if self.bootstrap is None:
+            return None
+        Z = X @ self.bootstrap["weights"].T
+        Z += self.bootstrap["bias"]
+        Z.partition(self._interval_ranks, axis=1)
+        bounds = _sigmoid_array(Z[:, self._interval_ranks])
+        return bounds[:, 0], bounds[:, 1]
+
+    def explain_matrix(self, X):
+        """(P(depression), contribution matrix) for an encoded matrix, in one pass."""
+        contributions = X * self.weights
+        contributions -= self.offsets
+        z = contributions.sum(axis=1)
+        z += self.intercept
+        return _sigmoid_array(z), contributions
+
+    def what_if(self, features, axes):
+        """P(depression) over a grid of alternative values, everything else fixed.
+
+        ``axes`` is [(column, [canonical values...]), ...] for one or two
+        columns; returns an array of shape (len(values_1), [len(values_2)])
+        scored as one batch.
+        """
+        base = self.encode(features)
+        encoded = []
+        for col, values in axes:
+            lookup = self.codes.get(col)
+            try:
+                encoded.append([float(v) if lookup is None else lookup[v] for v in values])
+            except KeyError as e:
+                raise ValueError(f"{col!r} contains previously unseen label: {e.args[0]!r}") from None
+        shape = tuple(len(values) for values in encoded)
+
+        X = np.tile(np.array(base, dtype=np.float64), (int(np.prod(shape)), 1))
+        grids = np.meshgrid(*encoded, indexing="ij")
+        for (col, _), grid in zip(axes, grids):
+            X[:, FEATURE_COLUMNS.index(col)] = grid.ravel()
+        return self.predict_proba_matrix(X).reshape(shape)
+
+    def score_frame(self, frame, explain=False):
+        """Return (probability, prediction) arrays for every row of ``frame``.
+
+        With ``explain`` a third item is added: the (rows x features)
+        log-odds contribution matrix, FEATURE_COLUMNS order.
+        """
+        X = self.encode_frame(frame)
+        if explain:
+            prob, contributions = self.explain_matrix(X)
+            return prob, (prob >= self.threshold).astype(np.int8), contributions
+        prob = self.predict_proba_matrix(X)
+        return prob, (prob >= self.threshold).astype(np.int8)
@@ -0,0 +1,326 @@
+"""\
+server.py
+-----------------
+Standalone async HTTP inference service (stdlib asyncio only, runs locally).
+
+Endpoints:
+- GET  /healthz   liveness (process is up)
+- GET  /readyz    readiness (model bundle loaded and verified, micro-batcher
+                  running), 503 otherwise
+- GET  /schema    feature names, categorical values and numeric ranges
+- GET  /metrics   Prometheus text (stage timings need APP_METRICS=1)
+- POST /predict   one feature object, or a list of them
+
+Request bodies use the 10-feature schema with the canonical English
+category values known to the label encoders, e.g.
+    {"Gender": "Male", "Age": 22, "Academic Pressure": 4, "Study Satisfaction": 2,
+     "Sleep Duration": "5-6 hours", "Dietary Habits": "Unhealthy",
+     "Have you ever had suicidal thoughts ?": "Yes", "Study Hours": 10,
+     "Financial Stress": 4, "Family History of Mental Illness": "No"}
+
+Every batch is validated in one pass (validation.py). An invalid object is
+answered with 400 and {"error": ..., "fields": {column: reason}}; in a list,
+the valid items are still scored and each invalid one gets that error
+object in its place (status 200).
+
+Concurrent requests are coalesced by MicroBatcher: rows arriving within
+--max-wait-ms of each other (up to --max-batch rows) are scored with a single
+vectorized predict_proba_matrix call.
+
+Run:
+    python server.py --port 8600
+    PREDICT_API_URL=http://127.0.0.1:8600 streamlit run apps.py
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import urllib.request
+
+import metrics
+import resources
+import validation
+from scoring import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERIC_RANGES
+
+logger = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+MAX_BODY = 1 << 20
+
+
+class InvalidInput(ValueError):
+    """A request row failed validation; ``fields`` maps each bad field to its reason."""
+
+    def __init__(self, fields):
+        super().__init__("invalid input: " + "; ".join(f"{col!r}: {text}" for col, text in fields.items()))
+        self.fields = fields
+
+
+# ------------------------------------------------------------------
+# Micro-batching
+# ------------------------------------------------------------------
+class MicroBatcher:
+    """Collects single rows from many callers and scores them in one batch."""
+
+    def __init__(self, get_predictor, max_batch=64, max_wait=0.005):
+        self.get_predictor = get_predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def running(self):
+        """True while the batching task is alive (False before start() and after it ended)."""
+        return self._task is not None and not self._task.done()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, features):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                self._score(batch)
+            except Exception as e:
+                # Error tak terduga hanya menggagalkan batch ini; loop tetap jalan
+                logger.warning("Batch scoring gagal (%d baris): %r", len(batch), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _score(self, batch):
+        try:
+            predictor = self.get_predictor()
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Satu pass validasi untuk seluruh batch; baris tidak valid ditolak
+        # sendiri-sendiri (dengan alasan per field), sisanya tetap diproses
+        checked = validation.compile_schema(predictor.classes).validate_records([features for features, _ in batch])
+        for row in checked.invalid_rows:
+            future = batch[row][1]
+            if not future.done():
+                future.set_exception(InvalidInput(checked.row_errors(row)))
+        futures = [future for (_, future), ok in zip(batch, checked.valid) if ok]
+        if not futures:
+            return
+
+        with metrics.timer("server.batch_score"):
+            prob = predictor.predict_proba_matrix(checked.X[checked.valid])
+        self.batches += 1
+        self.rows += len(futures)
+        for p, future in zip(prob.tolist(), futures):
+            if not future.done():
+                future.set_result({
+                    "probability": p,
+                    "prediction": 1 if p >= predictor.threshold else 0,
+                    "threshold": predictor.threshold,
+                })
+
+
+# ------------------------------------------------------------------
+# HTTP
+# ------------------------------------------------------------------
+class InferenceServer:
+    def __init__(self, model_path=resources.MODEL_PATH, max_batch=64, max_wait=0.005):
+        self.model_path = model_path
+        self.batcher = MicroBatcher(self.predictor, max_batch=max_batch, max_wait=max_wait)
+
+    def predictor(self):
+        # Dicek ulang tiap batch: bundle baru langsung dipakai (hot reload)
+        return resources.load_predictor(self.model_path)
+
+    def schema(self):
+        predictor = self.predictor()
+        return {
+            "features": FEATURE_COLUMNS,
+            "categorical": {col: predictor.classes[col] for col in CATEGORICAL_COLUMNS},
+            "numeric_ranges": NUMERIC_RANGES,
+            "threshold": predictor.threshold,
+        }
+
+    async def handle(self, method, path, body):
+        if path == "/healthz":
+            return 200, {"status": "ok"}
+        if path == "/readyz":
+            if not self.batcher.running:
+                return 503, {"status": "unavailable", "error": "micro-batcher is not running"}
+            try:
+                self.predictor()
+            except Exception as e:
+                return 503, {"status": "unavailable", "error": str(e)}
+            return 200, {"status": "ready", "model_sha256": resources.bundle_digest(self.model_path)}
+        if path == "/schema":
+            return 200, self.schema()
+        if path == "/metrics":
+            gauges = {
+                "app_server_batches": ("Scoring batches run by the micro-batcher.", self.batcher.batches),
+                "app_server_rows": ("Rows scored by the micro-batcher.", self.batcher.rows),
+            }
+            return 200, metrics.registry.export_text(gauges)
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                payload = json.loads(body)
+            except ValueError as e:
+                return 400, {"error": f"invalid JSON: {e}"}
+            items = payload if isinstance(payload, list) else [payload]
+            if not all(isinstance(item, dict) for item in items):
+                return 400, {"error": "expected an object or a list of objects"}
+            results = await asyncio.gather(*(self.batcher.predict(item) for item in items), return_exceptions=True)
+            results = [self._error(r) if isinstance(r, Exception) else r for r in results]
+            if isinstance(payload, list):
+                # Daftar: baris valid tetap dinilai, baris tidak valid membawa alasannya
+                return 200, results
+            return (400 if "error" in results[0] else 200), results[0]
+        return 404, {"error": f"unknown path {path}"}
+
+    @staticmethod
+    def _error(exc):
+        if isinstance(exc, InvalidInput):
+            return {"error": str(exc), "fields": exc.fields}
+        return {"error": str(exc)}
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, close=True)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "bad content-length"}, close=True)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.handle(method.upper(), target.split("?", 1)[0], body)
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+
+                close = headers.get("connection", "").lower() == "close"
+                await self._respond(writer, status, payload, close=close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, close=False):
+        if isinstance(payload, str):
+            data, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            data, content_type = json.dumps(payload).encode(), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def run(self, host, port, ready=None):
+        self.batcher.start()
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+# ------------------------------------------------------------------
+# Client (dipakai apps.py bila PREDICT_API_URL di-set)
+# ------------------------------------------------------------------
+def remote_predict(url, features, timeout=5.0):
+    """POST one canonical feature dict to a running server; returns its JSON result."""
+    request = urllib.request.Request(
+        url.rstrip("/") + "/predict",
+        data=json.dumps(features).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Async HTTP inference service with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--model", default=str(resources.MODEL_PATH), help="model bundle (.joblib)")
+    parser.add_argument("--max-batch", type=int, default=64, help="max rows per scoring call")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="latency window for coalescing")
+    args = parser.parse_args(argv)
+
+    app = InferenceServer(args.model, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    # Muat model lebih awal agar /readyz langsung siap
+    app.predictor()
+    print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(app.run(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""\
+conftest.py
+-----------------
+Shared setup for the pytest suite: the modules live at the repository root
+(run as scripts, not as a package), and the tests must never write to the
+real audit log or drift histograms.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ["AUDIT_LOG"] = "0"
+os.environ["DRIFT_MONITOR"] = "0"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import resources  # noqa: E402
+from scoring import FEATURE_COLUMNS  # noqa: E402
+
+VALID_FEATURES = {
+    "Gender": "Male",
+    "Age": 22,
+    "Academic Pressure": 4,
+    "Study Satisfaction": 2,
+    "Sleep Duration": "Less than 5 hours",
+    "Dietary Habits": "Unhealthy",
+    "Have you ever had suicidal thoughts ?": "Yes",
+    "Study Hours": 10,
+    "Financial Stress": 4,
+    "Family History of Mental Illness": "Yes",
+}
+
+
+@pytest.fixture
+def features():
+    return dict(VALID_FEATURES)
+
+
+@pytest.fixture(scope="session")
+def predictor():
+    return resources.load_predictor()
+
+
+@pytest.fixture(scope="session")
+def sklearn_proba():
+    """The original encode -> scale -> predict_proba path, as the reference."""
+    import pandas as pd
+
+    bundle = resources.load_bundle()
+
+    def proba(frame):
+        encoded = pd.DataFrame({
+            col: bundle["encoders"][col].transform(frame[col]) if col in bundle["encoders"] else frame[col]
+            for col in FEATURE_COLUMNS
+        })
+        return bundle["model"].predict_proba(bundle["scaler"].transform(encoded))[:, 1]
+
+    return proba
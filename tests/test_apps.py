@@ -0,0 +1,24 @@
+import pytest
+
+import content
+import loadtest
+
+
+@pytest.mark.parametrize("name", list(content.LANGUAGES))
+def test_form_answers_cover_the_model_categories(name, predictor):
+    language = content.LANGUAGES[name]
+    assert list(language.questions) == list(language.domains)
+    for col, lookup in predictor.codes.items():
+        assert {value for _, value in language.domains[col]} == set(lookup), col
+        for label, value in language.domains[col]:
+            assert language.answer_label(col, value) == label
+
+
+def test_predict_page_shows_a_result():
+    session = loadtest.Session(seed=0, think=0)
+    session.rerun("start")
+    session.navigate("predict")
+    session.fill_and_predict()
+    assert session.predicted and session.errors == 0, session.error_messages
+    shown = [e.value for e in list(session.at.main.error) + list(session.at.main.success)]
+    assert any("Hasil Prediksi" in text for text in shown)
@@ -0,0 +1,44 @@
+import sqlite3
+
+import audit_log
+from audit_log import AuditLog
+
+
+def rows(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute("SELECT * FROM predictions ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_logged_rows_are_written_with_hashed_sessions(tmp_path, features):
+    log = AuditLog(tmp_path / "predictions.sqlite", flush_interval=0.01, salt=b"secret")
+    for i in range(5):
+        assert log.log(features, 0.2 * i, 0.5, model="production", model_version="abc", session="browser-1")
+    log.drain()
+
+    written = rows(log.path)
+    assert [row["decision"] for row in written] == [0, 0, 0, 1, 1]
+    assert {row["session"] for row in written} == {audit_log.hash_session("browser-1", b"secret")}
+    assert "browser-1" not in {row["session"] for row in written}
+    assert all(row[col] == features[col] for row in written for col in features)
+    assert log.stats()["logged"] == 5 and log.stats()["dropped"] == 0
+
+
+def test_drop_mode_stores_no_session(tmp_path, features):
+    log = AuditLog(tmp_path / "predictions.sqlite", flush_interval=0.01, session_mode="drop")
+    log.log(features, 0.9, 0.5, session="browser-1")
+    log.drain()
+    assert rows(log.path)[0]["session"] is None
+
+
+def test_rotation_keeps_the_newest_files(tmp_path, features):
+    log = AuditLog(tmp_path / "predictions.sqlite", max_rows=2, keep=2)
+    row = (0.0, None, None, None, 0.1, 0.5, 0) + tuple(features.values())
+    for _ in range(5):
+        log.write([row, row])
+    assert log.stats()["rotations"] == 4
+    assert len(audit_log.rotated_files(log.path)) == 2
+    assert len(rows(log.path)) == 2
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+import batch_score
+import resources
+from scoring import FEATURE_COLUMNS
+
+
+def test_chunked_scoring_matches_the_sklearn_pipeline(tmp_path):
+    src = tmp_path / "export.csv"
+    src.write_text("".join(open(resources.SEKUNDER_PATH).readlines()[:26]))
+    out = tmp_path / "scored.csv"
+    assert batch_score.main([str(src), "-o", str(out), "--chunksize", "7", "--threshold", "0.5", "-q"]) == 0
+
+    frame = pd.read_csv(src)
+    bundle = resources.load_bundle()
+    encoded = pd.DataFrame({
+        col: bundle["encoders"][col].transform(frame[col]) if col in bundle["encoders"] else frame[col]
+        for col in FEATURE_COLUMNS
+    })
+    expected = bundle["model"].predict_proba(bundle["scaler"].transform(encoded))[:, 1]
+
+    scored = pd.read_csv(out)
+    assert len(scored) == 25
+    np.testing.assert_allclose(scored["probability"], expected, rtol=1e-9)
+    assert (scored["prediction"] == (scored["probability"] >= 0.5)).all()
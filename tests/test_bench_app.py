@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+import bench_app
+import dataset_store
+import resources
+
+SECTIONS = ["cold", "loading", "rerun", "single", "batch"]
+
+
+@pytest.mark.parametrize("section", SECTIONS)
+def test_section_runs_quick(section, tmp_path, monkeypatch):
+    # Store sementara supaya read_store_uncached ikut jalan tanpa dataset.arrow lokal
+    store = tmp_path / "dataset.arrow"
+    dataset_store.build_store([resources.PRIMER_PATH, resources.SEKUNDER_PATH], store)
+    monkeypatch.setattr(resources, "DATASET_STORE_PATH", store)
+
+    output = tmp_path / "bench.json"
+    assert bench_app.main(["--sections", section, "--quick", "-o", str(output)]) == 0
+    results = json.loads(output.read_text())["results"][section]
+    assert bench_app.flatten(results)
+    if section == "loading":
+        assert "read_store_uncached" in results
+
+
+def test_compare_flags_regressions(capsys):
+    old = {"results": {"single": {"predictor": {"p50_ms": 1.0}, "legacy": {"p50_ms": 2.0}}}}
+    new = {"results": {"single": {"predictor": {"p50_ms": 1.5}, "legacy": {"p50_ms": 2.0}}}}
+    bench_app.compare(new, old)
+    lines = {line.split()[0]: line for line in capsys.readouterr().out.splitlines()[1:]}
+    assert lines["single.predictor"].endswith("REGRESSION")
+    assert not lines["single.legacy"].endswith("REGRESSION")
+
+
+def test_side_effects_are_switched_off(monkeypatch):
+    import audit_log
+    import drift
+
+    monkeypatch.delenv("AUDIT_LOG")
+    monkeypatch.delenv("DRIFT_MONITOR")
+    monkeypatch.setattr(audit_log, "default_log", object())
+    monkeypatch.setattr(drift, "default_monitor", object())
+    bench_app.disable_side_effects()
+    assert audit_log.default_log is None and drift.default_monitor is None
+    assert audit_log.from_env() is None and drift.from_env() is None
@@ -0,0 +1,25 @@
+import json
+
+import bench_models
+
+
+def test_pareto_front_and_recommendation():
+    results = {
+        "fast": {"roc_auc": 0.90, "single_us": 2.0},
+        "slow_best": {"roc_auc": 0.93, "single_us": 50.0},
+        "dominated": {"roc_auc": 0.89, "single_us": 10.0},
+        "close": {"roc_auc": 0.928, "single_us": 5.0},
+    }
+    assert bench_models.pareto_front(results, "single_us") == ["slow_best", "close", "fast"]
+    assert bench_models.recommend(results, tolerance=0.005) == "close"
+    assert bench_models.recommend(results, tolerance=0.0) == "slow_best"
+
+
+def test_quick_run_reports_every_candidate(tmp_path):
+    out = tmp_path / "models.json"
+    assert bench_models.main(["--quick", "--candidates", "current", "tree_d3", "--n-jobs", "1",
+                              "--batch-size", "100", "-o", str(out)]) == 0
+    report = json.loads(out.read_text())
+    assert set(report["results"]) == {"current", "tree_d3"}
+    assert report["recommended"] in report["results"]
+    assert report["results"]["current"]["folded"] and 0.5 < report["results"]["current"]["roc_auc"] <= 1.0
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import bootstrap
+import resources
+from scoring import TARGET_COLUMN, Predictor, encode_frame
+from train import target_values
+
+
+@pytest.fixture(scope="module")
+def data():
+    bundle = resources.load_bundle()
+    df = resources.load_dataset()
+    X = encode_frame(df, bundle["encoders"])
+    y = bundle["encoders"][TARGET_COLUMN].transform(target_values(df))
+    return bundle, X, y
+
+
+@pytest.fixture(scope="module")
+def ensemble_predictor(data):
+    bundle, X, y = data
+    weights, bias = bootstrap.build_ensemble(bundle, X, y, n=20, n_jobs=1)
+    return Predictor.from_bundle(dict(bundle, bootstrap={"weights": weights, "bias": bias, "level": 0.9}))
+
+
+def test_members_do_not_depend_on_worker_count(data):
+    bundle, X, y = data
+    serial = bootstrap.build_ensemble(bundle, X, y, n=6, n_jobs=1)
+    parallel = bootstrap.build_ensemble(bundle, X, y, n=6, n_jobs=2)
+    np.testing.assert_allclose(parallel[0], serial[0])
+    np.testing.assert_allclose(parallel[1], serial[1])
+
+
+def test_interval_brackets_the_point_probability(ensemble_predictor, data):
+    _, X, _ = data
+    low, high = ensemble_predictor.interval_matrix(X)
+    prob = ensemble_predictor.predict_proba_matrix(X)
+    assert np.all(low <= high)
+    assert np.mean((low <= prob) & (prob <= high)) > 0.9
+    for i in range(0, len(X), 97):
+        assert ensemble_predictor.interval_encoded(X[i].tolist()) == pytest.approx((low[i], high[i]), rel=1e-12)
+
+
+def test_slim_export_keeps_the_ensemble(ensemble_predictor, features, tmp_path):
+    path = tmp_path / "model.json"
+    ensemble_predictor.save(path)
+    assert Predictor.load(path).interval(features) == pytest.approx(ensemble_predictor.interval(features))
+    assert resources.load_predictor().interval(features) is None
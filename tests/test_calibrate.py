@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import resources
+from calibrate import choose_threshold, metrics_at, threshold_curves
+from scoring import DEFAULT_THRESHOLD, Predictor
+
+
+PROB = np.array([0.9, 0.8, 0.8, 0.6, 0.3, 0.1])
+Y = np.array([1, 1, 0, 1, 0, 0])
+
+
+def test_curves_merge_tied_scores():
+    curves = threshold_curves(PROB, Y)
+    assert curves["thresholds"].tolist() == [0.9, 0.8, 0.6, 0.3, 0.1]
+    assert curves["tp"].tolist() == [1, 2, 3, 3, 3]
+    assert curves["fp"].tolist() == [0, 1, 1, 2, 3]
+    assert (curves["tp"] + curves["fn"] == 3).all()
+
+
+def test_metrics_at_matches_direct_count():
+    curves = threshold_curves(PROB, Y)
+    for threshold in (0.95, 0.85, 0.7, 0.5, 0.05):
+        pred = PROB >= threshold
+        row = metrics_at(curves, threshold)
+        assert row["tp"] == int((pred & (Y == 1)).sum())
+        assert row["fp"] == int((pred & (Y == 0)).sum())
+
+
+def test_choose_threshold_objectives():
+    curves = threshold_curves(PROB, Y, cost_fn=5.0)
+    # F1 terbaik di 0.6 (tp=3, fp=1); ambang diletakkan di tengah ke skor berikutnya
+    assert choose_threshold(curves, "f1") == pytest.approx(0.45)
+    assert choose_threshold(curves, "recall", min_recall=0.6) == pytest.approx(0.7)
+    assert choose_threshold(curves, "cost") == pytest.approx(0.45)
+    with pytest.raises(ValueError):
+        choose_threshold(curves, "accuracy")
+
+
+def test_bundle_threshold_reaches_the_predictor():
+    bundle = dict(resources.load_bundle(), threshold=0.42)
+    assert Predictor.from_bundle(bundle).threshold == 0.42
+    del bundle["threshold"]
+    assert Predictor.from_bundle(bundle).threshold == DEFAULT_THRESHOLD
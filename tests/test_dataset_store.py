@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+import dataset_store
+import resources
+from scoring import CATEGORICAL_COLUMNS, FEATURE_COLUMNS
+
+
+@pytest.fixture(scope="module")
+def csv_frame():
+    return pd.concat([pd.read_csv(resources.PRIMER_PATH), pd.read_csv(resources.SEKUNDER_PATH)], ignore_index=True)
+
+
+def test_store_round_trips_the_csvs(tmp_path, csv_frame):
+    store = tmp_path / "dataset.arrow"
+    meta = dataset_store.build_store([resources.PRIMER_PATH, resources.SEKUNDER_PATH], store)
+    assert meta["rows"] == len(csv_frame)
+    assert [source["name"] for source in meta["sources"]] == [resources.PRIMER_PATH.name, resources.SEKUNDER_PATH.name]
+
+    table, read_meta = dataset_store.open_table(store)
+    assert read_meta["content_sha256"] == dataset_store.content_hash(table) == meta["content_sha256"]
+    frame = dataset_store.to_frame(table)
+    for col in dataset_store.COLUMNS:
+        if col in CATEGORICAL_COLUMNS or col not in FEATURE_COLUMNS:
+            assert isinstance(frame[col].dtype, pd.CategoricalDtype)
+            assert frame[col].astype(str).tolist() == csv_frame[col].astype(str).tolist()
+        else:
+            assert frame[col].dtype == "int8"
+            assert frame[col].tolist() == csv_frame[col].tolist()
+
+
+def test_values_outside_the_schema_are_rejected(csv_frame):
+    frame = csv_frame.head(3).copy()
+    frame.loc[0, "Gender"] = "Robot"
+    frame.loc[1, "Age"] = 500
+    with pytest.raises(dataset_store.SchemaError, match="Gender.*Age|Age.*Gender"):
+        dataset_store.to_table(frame)
+
+
+def test_load_dataset_reads_the_store(tmp_path, csv_frame):
+    store = tmp_path / "dataset.arrow"
+    dataset_store.build_store([resources.PRIMER_PATH, resources.SEKUNDER_PATH], store)
+    frame = resources.load_dataset(store_path=store)
+    assert len(frame) == len(csv_frame)
+    assert isinstance(frame["Gender"].dtype, pd.CategoricalDtype)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import drift
+
+
+def test_identical_distributions_do_not_drift():
+    counts = [50, 30, 20]
+    assert drift.psi(counts, counts) == pytest.approx(0.0)
+    assert drift.kl_divergence(counts, [5, 3, 2]) == pytest.approx(0.0, abs=1e-3)
+    assert drift.severity(drift.psi(counts, counts)) == "stable"
+
+
+def test_psi_is_symmetric_and_kl_is_not():
+    ref, live = [90, 10], [40, 60]
+    assert drift.psi(ref, live) == pytest.approx(drift.psi(live, ref))
+    assert drift.kl_divergence(ref, live) != pytest.approx(drift.kl_divergence(live, ref))
+    assert drift.severity(drift.psi(ref, live)) == "significant"
+
+
+def test_empty_bin_stays_finite():
+    # Smoothing: kategori yang tidak pernah muncul di referensi tidak menghasilkan inf
+    assert np.isfinite(drift.psi([100, 0], [50, 50]))
+    assert np.isfinite(drift.kl_divergence([100, 0], [50, 50]))
+
+
+def test_probability_bin_clamps():
+    assert drift.probability_bin(0.0) == 0
+    assert drift.probability_bin(1.0) == drift.PROB_BINS - 1
+    assert drift.probability_bin(-0.1) == 0
+
+
+def _reference():
+    return {
+        "axes": [["Gender", ["Male", "Female"]]],
+        "counts": {"Gender": [50, 50], drift.PROBABILITY: [10] * drift.PROB_BINS},
+        "bundle_sha256": "not-the-current-bundle",
+    }
+
+
+def test_monitor_window_and_totals():
+    monitor = drift.DriftMonitor(_reference(), min_count=10)
+    for _ in range(5):
+        monitor.add({"Gender": "Male"}, 0.5)
+    assert monitor.check() is None
+
+    for _ in range(5):
+        monitor.add({"Gender": "Male"}, 0.5)
+    monitor.add({"Gender": "Other"}, 0.5)
+    report = monitor.check()
+    assert report["window_count"] == 11 and report["total_count"] == 11
+    assert monitor.outside == 1
+    assert report["features"]["Gender"]["severity"] == "significant"
+    # Referensi dibuat untuk bundle lain: histogram probabilitas tidak dibandingkan
+    assert report["probability_skipped"] and drift.PROBABILITY not in report["features"]
+
+    # Jendela dikosongkan, total tetap
+    monitor.add({"Gender": "Female"}, 0.5)
+    report = monitor.check(force=True)
+    assert report["window_count"] == 1 and report["total_count"] == 12
+    assert 'app_drift_psi{feature="Gender",scope="total"}' in monitor.gauges()
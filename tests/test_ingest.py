@@ -0,0 +1,89 @@
+import csv
+
+import numpy as np
+import pytest
+
+import dataset_store
+import ingest
+import resources
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "dataset.arrow"
+    dataset_store.build_store([resources.PRIMER_PATH, resources.SEKUNDER_PATH], path)
+    return path
+
+
+def _export(path, rows):
+    with open(resources.SEKUNDER_PATH, newline="") as f:
+        reader = csv.DictReader(f)
+        template = next(reader)
+        fields = reader.fieldnames
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fields)
+        writer.writeheader()
+        for changes in rows:
+            writer.writerow(dict(template, **changes))
+    return path
+
+
+def test_normalize_key():
+    assert ingest.normalize_key(" 5 – 6 Hrs ") == "5-6 hours"
+    assert ingest.normalize_key("Less than  5 JAM") == "less than 5 hours"
+
+
+def test_variant_spellings_are_normalized(tmp_path, store):
+    src = _export(tmp_path / "export.csv", [
+        {"Gender": "laki-laki", "Sleep Duration": "7 – 8 jam", "Dietary Habits": "sehat",
+         "Family History of Mental Illness": "YA"},
+        {"Age": "abc"},
+    ])
+    quarantine = tmp_path / "quarantine.csv"
+    stats = ingest.ingest_csv(str(src), str(store), str(quarantine))
+    assert (stats["rows"], stats["clean"], stats["quarantined"]) == (2, 1, 1)
+
+    table, meta = dataset_store.open_table(store)
+    last = dataset_store.to_frame(table).iloc[-1]
+    assert (last["Gender"], last["Sleep Duration"], last["Dietary Habits"],
+            last["Family History of Mental Illness"]) == ("Male", "7-8 hours", "Healthy", "Yes")
+    assert meta["sources"][-1]["name"] == "export.csv"
+    with open(quarantine, newline="") as f:
+        assert "Age: not a number 'abc'" in next(csv.DictReader(f))["reason"]
+
+
+def test_same_file_is_refused_twice(tmp_path, store):
+    src = _export(tmp_path / "export.csv", [{}])
+    quarantine = str(tmp_path / "quarantine.csv")
+    ingest.ingest_csv(str(src), str(store), quarantine)
+    with pytest.raises(dataset_store.SchemaError, match="already ingested"):
+        ingest.ingest_csv(str(src), str(store), quarantine)
+    assert ingest.ingest_csv(str(src), str(store), quarantine, force=True)["clean"] == 1
+
+
+def test_file_lines_skip_malformed_lines():
+    # header = baris 1; baris 3 dan 5 rusak
+    rows = np.array([0, 1, 2])
+    assert ingest.file_lines(rows, []).tolist() == [2, 3, 4]
+    assert ingest.file_lines(rows, [3, 5]).tolist() == [2, 4, 6]
+
+
+def test_quarantine_reports_file_lines(tmp_path):
+    store = tmp_path / "dataset.arrow"
+    dataset_store.build_store([resources.PRIMER_PATH, resources.SEKUNDER_PATH], store)
+
+    header, first, second = open(resources.SEKUNDER_PATH).readlines()[:3]
+    bad = first.rstrip("\n").split(",")
+    bad[-2] = "bukan kategori"
+    src = tmp_path / "export.csv"
+    # baris 1 header, 2 valid, 3 rusak (kolom kurang), 4 nilai salah, 5 valid
+    src.write_text(header + first + "1,2\n" + ",".join(bad) + "\n" + second)
+    quarantine = tmp_path / "quarantine.csv"
+    stats = ingest.ingest_csv(str(src), str(store), str(quarantine))
+
+    assert stats["quarantined"] == 2
+    with open(quarantine, newline="") as fh:
+        rejected = {int(row["line"]): row["reason"] for row in csv.DictReader(fh)}
+    assert sorted(rejected) == [3, 4]
+    assert rejected[3].startswith("malformed:")
+    assert "line" not in rejected[4] and "row" not in rejected[4]
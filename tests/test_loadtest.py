@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import streamlit
+from streamlit.testing.v1 import app_test
+
+import loadtest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def level(sessions, reruns_per_s, p95_ms=100.0, errors=0):
+    return {"sessions": sessions, "reruns_per_s": reruns_per_s, "errors": errors,
+            "latency": {"p95_ms": p95_ms}}
+
+
+def test_find_saturation():
+    assert loadtest.find_saturation([level(1, 10), level(2, 19), level(4, 36)], slo_ms=1000) is None
+    assert loadtest.find_saturation([level(1, 10), level(2, 19, p95_ms=1500)], slo_ms=1000)["sessions"] == 2
+    assert loadtest.find_saturation([level(1, 10), level(2, 19, errors=3)], slo_ms=1000)["reason"] == "3 failed reruns"
+    # 4x sesi, throughput hanya +20%
+    found = loadtest.find_saturation([level(1, 10), level(4, 12)], slo_ms=1000)
+    assert found["sessions"] == 4 and "throughput" in found["reason"]
+
+
+def test_short_run_has_no_errors(tmp_path):
+    # Proses terpisah: share_server_state() mem-patch Streamlit untuk seluruh proses
+    out = tmp_path / "load.json"
+    subprocess.run([sys.executable, "loadtest.py", "--sessions", "2", "--duration", "1", "--think-ms", "0",
+                    "-o", str(out)], cwd=ROOT, check=True, capture_output=True, timeout=300)
+    (run,) = json.loads(out.read_text())["levels"]
+    assert run["sessions"] == 2 and run["errors"] == 0 and run["reruns"] > 0
+
+
+def test_tested_streamlit_is_installed():
+    # Gagal di sini = Streamlit di-upgrade: cek ulang patch share_server_state()
+    loadtest.check_streamlit_internals()
+
+
+def test_other_streamlit_version_is_refused(monkeypatch):
+    monkeypatch.setattr(streamlit, "__version__", "99.0.0")
+    with pytest.raises(RuntimeError, match="TESTED_STREAMLIT"):
+        loadtest.check_streamlit_internals()
+
+
+def test_missing_internal_is_refused(monkeypatch):
+    monkeypatch.delattr(app_test, "patch_config_options")
+    with pytest.raises(RuntimeError, match="patch_config_options"):
+        loadtest.check_streamlit_internals()
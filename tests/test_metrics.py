@@ -0,0 +1,28 @@
+import metrics
+
+
+def test_disabled_registry_records_nothing():
+    registry = metrics.Registry(enabled=False)
+    with registry.timer("stage"):
+        pass
+    assert registry.summary() == {}
+
+
+def test_stage_histogram_and_gauges():
+    registry = metrics.Registry(enabled=True)
+    for seconds in (0.0007, 0.002, 0.002, 7.0):
+        registry.observe("predict.score", seconds)
+    with registry.timer("predict.encode"):
+        pass
+
+    summary = registry.summary()
+    assert summary["predict.score"]["count"] == 4
+    assert summary["predict.encode"]["count"] == 1
+
+    text = registry.export_text({"app_things": ("Things.", 3)})
+    lines = text.splitlines()
+    assert 'app_stage_seconds_bucket{stage="predict.score",le="0.001"} 1' in lines
+    assert 'app_stage_seconds_bucket{stage="predict.score",le="0.005"} 3' in lines
+    assert 'app_stage_seconds_bucket{stage="predict.score",le="+Inf"} 4' in lines
+    assert 'app_stage_seconds_count{stage="predict.score"} 4' in lines
+    assert "# TYPE app_things gauge" in lines and "app_things 3" in lines
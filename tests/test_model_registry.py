@@ -0,0 +1,68 @@
+import shutil
+
+import pytest
+
+import resources
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+
+
+@pytest.fixture
+def registry(tmp_path):
+    candidate = tmp_path / "candidate.joblib"
+    shutil.copy(resources.MODEL_PATH, candidate)
+    registry = ModelRegistry()
+    registry.register("production", resources.MODEL_PATH, primary=True, cache=PredictionCache())
+    registry.register("candidate", candidate)
+    return registry
+
+
+def test_routing_is_stable_and_splits_by_fraction(registry):
+    assert {registry.route(k) for k in range(100)} == {"production"}
+    registry.set_candidate("candidate", 0.3)
+    routed = [registry.route(f"session-{k}") for k in range(2000)]
+    assert routed == [registry.route(f"session-{k}") for k in range(2000)]
+    assert 0.25 < routed.count("candidate") / len(routed) < 0.35
+    registry.set_candidate("candidate", 1.0)
+    assert registry.route("anyone") == "candidate"
+    with pytest.raises(KeyError):
+        registry.set_candidate("missing", 0.5)
+
+
+def test_other_models_score_in_the_shadow(registry, features):
+    for age in range(18, 28):
+        prob, name, predictor = registry.predict(dict(features, Age=age), key="session")
+        assert name == "production" and prob == pytest.approx(predictor.predict_proba(dict(features, Age=age)))
+    registry.drain()
+
+    stats = registry.stats()
+    assert stats["production"]["served"] == 10 and stats["production"]["shadowed"] == 0
+    # Kandidat = salinan bundle yang sama: keputusan selalu sama
+    assert stats["candidate"]["served"] == 0 and stats["candidate"]["shadowed"] == 10
+    assert stats["candidate"]["agreement"] == 1.0
+    assert stats["candidate"]["mean_abs_diff"] == pytest.approx(0.0, abs=1e-12)
+    assert registry.gauges()['app_model_shadowed{model="candidate"}'][1] == 10
+
+
+def test_compute_override_only_applies_to_the_primary(registry, features):
+    prob, name, _ = registry.predict(features, key="a", compute=lambda: 0.5)
+    assert (prob, name) == (0.5, "production")
+    registry.set_candidate("candidate", 1.0)
+    prob, name, predictor = registry.predict(features, key="a", compute=lambda: 0.5)
+    assert name == "candidate" and prob == pytest.approx(predictor.predict_proba(features))
+    registry.drain()
+
+
+def test_entries_share_read_only_tables(tmp_path):
+    # Salinan bundle tanpa export slim: dibangun lewat joblib, bukan dari JSON
+    candidate = tmp_path / "candidate.joblib"
+    shutil.copy(resources.MODEL_PATH, candidate)
+    registry = ModelRegistry()
+    registry.register("production", resources.MODEL_PATH, primary=True)
+    registry.register("candidate", candidate)
+
+    production = registry.entries["production"].predictor()
+    other = registry.entries["candidate"].predictor()
+    assert other is not production
+    assert other.codes is production.codes and other.classes is production.classes
+    assert other.mean is production.mean and other.scale is production.scale
@@ -0,0 +1,132 @@
+import shutil
+
+import numpy as np
+import pytest
+
+import dataset_store
+import ingest
+import online_update
+import resources
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Copy of the shipped bundle plus a store with one newly ingested export."""
+    model_path = tmp_path / "model.joblib"
+    shutil.copy(resources.MODEL_PATH, model_path)
+    store = tmp_path / "dataset.arrow"
+    dataset_store.build_store([resources.PRIMER_PATH, resources.SEKUNDER_PATH], store)
+    export = tmp_path / "export.csv"
+    export.write_text("".join(open(resources.SEKUNDER_PATH).readlines()[:41]))
+    ingest.ingest_csv(str(export), str(store), str(tmp_path / "quarantine.csv"))
+    trained_on = {resources.file_digest(resources.PRIMER_PATH), resources.file_digest(resources.SEKUNDER_PATH)}
+    return model_path, store, trained_on
+
+
+def update(model_path, store, trained_on):
+    table, meta = dataset_store.open_table(store)
+    bundle, _ = online_update.update_bundle(resources.load_bundle(model_path), table, meta, trained_on)
+    return online_update.publish(bundle, model_path)
+
+
+def test_update_learns_only_new_sources(workspace):
+    model_path, store, trained_on = workspace
+    table, meta = dataset_store.open_table(store)
+    bundle, report = online_update.update_bundle(resources.load_bundle(model_path), table, meta, trained_on)
+    assert report["sources"] == ["export.csv"] and report["rows"] == 40
+    assert bundle["version"] == 2 and bundle["online"]["rows_seen"] > 40
+    # Sumber yang sudah dipelajari tidak dipelajari lagi
+    again, report = online_update.update_bundle(bundle, table, meta, trained_on)
+    assert again is None and report["rows"] == 0
+
+
+def test_publish_replaces_bundle_and_slim_export(workspace):
+    model_path, store, trained_on = workspace
+    original = resources.load_predictor(model_path)
+
+    archived = update(model_path, store, trained_on)
+    assert archived.name == "model.v0002.joblib"
+    assert resources.load_bundle(model_path)["version"] == 2
+    predictor = resources.load_predictor(model_path)
+    assert not np.allclose(predictor.weights, original.weights)
+    slim = resources.Predictor.load(model_path.with_suffix(".json"))
+    assert slim.source_sha256 == resources.file_digest(model_path)
+    np.testing.assert_allclose(slim.weights, predictor.weights)
+
+
+def test_update_then_rollback_restores_original(workspace):
+    model_path, store, trained_on = workspace
+    original = resources.load_predictor(model_path)
+    original_bytes = model_path.read_bytes()
+
+    archived = update(model_path, store, trained_on)
+    assert archived.name == "model.v0002.joblib"
+    assert resources.load_bundle(model_path)["version"] == 2
+    assert not np.allclose(resources.load_predictor(model_path).weights, original.weights)
+    # Bundle yang diganti tersimpan apa adanya
+    assert online_update.archived_versions(model_path)[1].read_bytes() == original_bytes
+
+    restored = online_update.rollback(model_path)
+    assert restored.name == "model.v0001.joblib"
+    predictor = resources.load_predictor(model_path)
+    assert predictor.source_sha256 == resources.file_digest(model_path)
+    assert np.allclose(predictor.weights, original.weights) and predictor.bias == pytest.approx(original.bias)
+    assert resources.load_bundle(model_path).get("version", 1) == 1
+
+
+def test_update_after_rollback_never_overwrites_an_archive(workspace):
+    model_path, store, trained_on = workspace
+    update(model_path, store, trained_on)
+    abandoned = online_update.archived_versions(model_path)[2].read_bytes()
+    online_update.rollback(model_path)
+
+    archived = update(model_path, store, trained_on)
+    assert archived.name == "model.v0003.joblib"
+    versions = online_update.archived_versions(model_path)
+    assert sorted(versions) == [1, 2, 3]
+    assert versions[2].read_bytes() == abandoned
+
+
+def test_rollback_without_archive_fails(workspace):
+    model_path, _, _ = workspace
+    with pytest.raises(ValueError):
+        online_update.rollback(model_path)
+
+
+def test_update_shifts_bootstrap_ensemble_with_the_model(workspace, features):
+    model_path, store, trained_on = workspace
+    bundle = dict(resources.load_bundle(model_path))
+    point = resources.load_predictor(model_path)
+    rng = np.random.default_rng(0)
+    bundle["bootstrap"] = {
+        "weights": point.weights + rng.normal(scale=0.05, size=(50, len(point.weights))),
+        "bias": point.bias + rng.normal(scale=0.05, size=50),
+        "level": 0.9,
+    }
+    online_update.publish(bundle, model_path)
+    before = resources.load_bundle(model_path)["bootstrap"]
+
+    update(model_path, store, trained_on)
+    predictor = resources.load_predictor(model_path)
+    after = resources.load_bundle(model_path)["bootstrap"]
+    assert after["shifted"] == 1
+    # Selisih anggota terhadap model titik tidak berubah
+    assert np.allclose(after["weights"] - predictor.weights, before["weights"] - point.weights)
+    low, high = predictor.interval(features)
+    assert low <= predictor.predict_proba(features) <= high
+
+
+def test_laplace_update_matches_joint_fit():
+    # Prior dari batch pertama (prior datar lemah) + update dengan batch kedua
+    # = fit MAP gabungan, persis untuk model kuadratik dan mendekati untuk logistik
+    rng = np.random.default_rng(0)
+    X1 = np.c_[np.ones(400), rng.normal(size=(400, 2))]
+    y = (rng.random(400) < 1 / (1 + np.exp(-(X1 @ [0.5, 1.0, -2.0])))).astype(float)
+    prior = np.eye(3) * 1e-3
+    theta, precision = online_update.laplace_update(np.zeros(3), prior, X1[:200], y[:200])
+    theta, precision = online_update.laplace_update(theta, precision, X1[200:], y[200:])
+    joint, _ = online_update.laplace_update(np.zeros(3), prior, X1, y)
+    np.testing.assert_allclose(theta, joint, atol=0.05)
+    assert online_update.log_loss(X1, y, theta) <= online_update.log_loss(X1, y, np.zeros(3))
+    # Presisi bertambah dengan data: posterior lebih sempit dari prior
+    assert np.all(np.linalg.eigvalsh(precision - prior) > 0)
@@ -0,0 +1,33 @@
+import resources
+from prediction_cache import PredictionCache, model_version
+
+
+def test_hit_miss_and_eviction(features):
+    cache = PredictionCache(maxsize=1)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 0.25
+
+    assert cache.get_or_compute(features, "v1", compute) == 0.25
+    assert cache.get_or_compute(dict(features), "v1", compute) == 0.25
+    assert len(calls) == 1
+
+    other = dict(features, Gender="Female")
+    cache.get_or_compute(other, "v1", compute)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 2, 1, 1)
+
+
+def test_new_model_version_invalidates(features):
+    cache = PredictionCache()
+    cache.get_or_compute(features, "v1", lambda: 0.25)
+    assert cache.get_or_compute(features, "v2", lambda: 0.75) == 0.75
+    assert cache.stats()["invalidations"] == 1
+    # Hasil yang dihitung untuk versi lama tidak disimpan setelah model berganti
+    assert cache.get_or_compute(features, "v2", lambda: 0.5) == 0.75
+
+
+def test_model_version_follows_the_bundle(predictor):
+    assert model_version(predictor) == predictor.source_sha256 == resources.bundle_digest()
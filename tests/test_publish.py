@@ -0,0 +1,55 @@
+import json
+import shutil
+
+import numpy as np
+
+import resources
+import risk_table
+from train import publish_bundle
+
+
+def test_publish_refreshes_slim_export_and_risk_table(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    table_path, meta_path = tmp_path / "risk_table.npy", tmp_path / "risk_table.json"
+    shutil.copy(resources.MODEL_PATH, model_path)
+    risk_table.build_table(resources.load_predictor(model_path), table_path, meta_path,
+                           resources.file_digest(model_path))
+
+    bundle = dict(resources.load_bundle(model_path), threshold=0.42)
+    published = publish_bundle(bundle, model_path, table_path, meta_path)
+
+    digest = resources.file_digest(model_path)
+    slim = json.loads(published["slim"].read_text())
+    assert slim["source_sha256"] == digest
+    predictor = resources.load_predictor(model_path)
+    assert predictor.threshold == 0.42 and predictor.source_sha256 == digest
+
+    assert published["risk_table"] == table_path
+    table = risk_table.RiskTable.open(table_path, meta_path, bundle_sha256=digest)
+    features = {col: values[0] for col, values in table.meta["axes"]}
+    assert np.isclose(table.lookup(features), predictor.predict_proba(features), atol=1e-6)
+
+
+def test_publish_leaves_other_bundles_risk_table_alone(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    meta_path = tmp_path / "risk_table.json"
+    meta_path.write_text(json.dumps({"bundle_sha256": "0" * 64}))
+    shutil.copy(resources.MODEL_PATH, model_path)
+
+    published = publish_bundle(resources.load_bundle(model_path), model_path, tmp_path / "risk_table.npy", meta_path)
+    assert published["risk_table"] is None
+    assert json.loads(meta_path.read_text()) == {"bundle_sha256": "0" * 64}
+
+
+def test_publishing_a_copy_leaves_the_original_table_alone(tmp_path):
+    original, copy = tmp_path / "a", tmp_path / "b"
+    original.mkdir()
+    copy.mkdir()
+    shutil.copy(resources.MODEL_PATH, original / "model.joblib")
+    shutil.copy(resources.MODEL_PATH, copy / "model.joblib")
+    meta_path = original / "risk_table.json"
+    meta_path.write_text(json.dumps({"bundle_sha256": resources.file_digest(original / "model.joblib")}))
+
+    published = publish_bundle(dict(resources.load_bundle(copy / "model.joblib"), threshold=0.4), copy / "model.joblib")
+    assert published["risk_table"] is None
+    assert json.loads(meta_path.read_text())["bundle_sha256"] == resources.file_digest(original / "model.joblib")
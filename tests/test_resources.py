@@ -0,0 +1,55 @@
+import os
+
+import dataset_store
+import ingest
+import resources
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_asset_is_loaded_once_and_reloaded_only_on_new_content(tmp_path):
+    path = tmp_path / "asset.txt"
+    _write(path, "one", 1_000_000_000)
+    cache = resources.ResourceCache()
+    calls = []
+
+    def loader(p):
+        calls.append(p)
+        return p.read_text()
+
+    assert cache.get("asset", (path,), loader).value == "one"
+    assert cache.get("asset", (path,), loader).value == "one"
+    assert len(calls) == 1
+
+    # Di-touch / disalin ulang dengan isi sama: signature berubah, tidak dimuat ulang
+    _write(path, "one", 2_000_000_000)
+    assert cache.get("asset", (path,), loader).value == "one"
+    assert len(calls) == 1
+
+    _write(path, "two", 3_000_000_000)
+    assert cache.get("asset", (path,), loader).value == "two"
+    assert len(calls) == 2
+
+
+def test_shared_assets_are_the_same_objects():
+    assert resources.load_bundle() is resources.load_bundle()
+    assert resources.load_dataset() is resources.load_dataset()
+
+
+def test_load_dataset_ignores_ingested_rows(tmp_path):
+    store = tmp_path / "dataset.arrow"
+    dataset_store.build_store([resources.PRIMER_PATH, resources.SEKUNDER_PATH], store)
+    base = len(resources.load_dataset(store_path=store))
+
+    extra = tmp_path / "export.csv"
+    extra.write_text("".join(open(resources.SEKUNDER_PATH).readlines()[:3]))
+    ingest.ingest_csv(str(extra), str(store), str(tmp_path / "quarantine.csv"))
+
+    frame, meta = resources.load_store(store)
+    assert len(frame) == base + 2
+    assert [source["name"] for source in meta["sources"]][-1] == "export.csv"
+    # Primer + Sekunder tetap persis isi kedua CSV, bukan store yang sudah diperluas
+    assert len(resources.load_dataset(store_path=store)) == base
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import resources
+import risk_table
+
+
+@pytest.fixture
+def built(tmp_path, predictor):
+    table_path, meta_path = tmp_path / "risk_table.npy", tmp_path / "risk_table.json"
+    risk_table.build_table(predictor, table_path, meta_path, "sha")
+    return table_path, meta_path
+
+
+def test_table_matches_predictor_at_full_precision(built, predictor):
+    table_path, meta_path = built
+    table = risk_table.RiskTable.open(table_path, meta_path, bundle_sha256="sha")
+    assert table.table.dtype == np.float64
+    assert table.meta["table_sha256"] == resources.file_digest(table_path)
+
+    rng = np.random.default_rng(0)
+    rows = [{col: values[rng.integers(len(values))] for col, values in table.meta["axes"]} for _ in range(500)]
+    looked_up = np.array([table.lookup(features) for features in rows])
+    computed = predictor.predict_proba_matrix(np.array([predictor.encode(features) for features in rows]))
+    assert np.max(np.abs(looked_up - computed)) < 1e-12
+
+
+def test_table_of_another_bundle_is_stale(built):
+    with pytest.raises(risk_table.StaleTableError, match="different model bundle"):
+        risk_table.RiskTable.open(*built, bundle_sha256="other")
+
+
+def test_corrupted_table_is_rejected(built):
+    table_path, meta_path = built
+    with open(table_path, "r+b") as f:
+        f.seek(-8, 2)
+        f.write(b"\xff" * 8)
+    with pytest.raises(risk_table.StaleTableError, match="checksum"):
+        risk_table.RiskTable.open(table_path, meta_path, bundle_sha256="sha")
+
+
+def test_value_outside_domain_is_rejected(built, features):
+    table = risk_table.RiskTable.open(*built, bundle_sha256="sha")
+    with pytest.raises(ValueError, match="Age"):
+        table.lookup(dict(features, Age=200))
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+import resources
+from scoring import FEATURE_COLUMNS, _sigmoid, _sigmoid_array, probe_matrix
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return resources.load_dataset().sample(n=200, random_state=0).reset_index(drop=True)
+
+
+def test_predictor_matches_sklearn(predictor, sklearn_proba, rows):
+    single = [predictor.predict_proba({col: row[col] for col in FEATURE_COLUMNS}) for _, row in rows.iterrows()]
+    np.testing.assert_allclose(single, sklearn_proba(rows), rtol=1e-9, atol=1e-12)
+
+
+def test_prediction_uses_threshold(predictor, features):
+    prob, prediction = predictor.predict(features)
+    assert prediction == int(prob >= predictor.threshold)
+
+
+def test_unseen_label_is_rejected(predictor, features):
+    with pytest.raises(ValueError, match="Gender"):
+        predictor.predict(dict(features, Gender="Unknown"))
+
+
+def test_folded_matrix_path_matches_single_rows(predictor, sklearn_proba, rows):
+    X = predictor.encode_frame(rows)
+    single = [predictor.predict_proba_encoded(x) for x in X.tolist()]
+    np.testing.assert_allclose(predictor.predict_proba_matrix(X), single, rtol=1e-12)
+    np.testing.assert_allclose(predictor.predict_proba_matrix(X), sklearn_proba(rows), rtol=1e-9, atol=1e-12)
+
+
+def test_verify_against_bundle(predictor):
+    assert predictor.verify(resources.load_bundle()) < 1e-9
+
+
+def test_contributions_sum_to_logit_minus_intercept(predictor, rows):
+    prob, contributions = predictor.explain_matrix(predictor.encode_frame(rows))
+    np.testing.assert_allclose(prob, predictor.predict_proba_matrix(predictor.encode_frame(rows)), rtol=1e-12)
+    np.testing.assert_allclose(contributions.sum(axis=1), np.log(prob / (1 - prob)) - predictor.intercept, atol=1e-9)
+
+    features = {col: rows.loc[0, col] for col in FEATURE_COLUMNS}
+    single, by_column = predictor.explain(features)
+    assert list(by_column) == FEATURE_COLUMNS
+    assert single == pytest.approx(prob[0], rel=1e-12)
+    np.testing.assert_allclose(list(by_column.values()), contributions[0], atol=1e-12)
+
+
+def test_what_if_grid_matches_single_predictions(predictor, features):
+    ages, hours = [18, 22, 30], [0, 4, 8, 12]
+    grid = predictor.what_if(features, [("Age", ages), ("Study Hours", hours)])
+    assert grid.shape == (3, 4)
+    for i, age in enumerate(ages):
+        for j, h in enumerate(hours):
+            assert grid[i, j] == pytest.approx(predictor.predict_proba(dict(features, Age=age, **{"Study Hours": h})))
+
+    line = predictor.what_if(features, [("Gender", ["Male", "Female"])])
+    assert line.tolist() == pytest.approx([predictor.predict_proba(dict(features, Gender=g)) for g in ["Male", "Female"]])
+    with pytest.raises(ValueError, match="Gender"):
+        predictor.what_if(features, [("Gender", ["Unknown"])])
+
+
+def test_scalar_and_vector_sigmoid_agree():
+    z = np.array([-800.0, -40.0, -1.5, 0.0, 1.5, 40.0, 800.0])
+    np.testing.assert_allclose(_sigmoid_array(z), [_sigmoid(v) for v in z], rtol=1e-15, atol=0)
+
+
+def test_single_matrix_and_explain_paths_agree(predictor):
+    X = probe_matrix(predictor.classes, predictor.mean, predictor.scale)
+    single = [predictor.predict_proba_encoded(row) for row in X.tolist()]
+    explained = [predictor.explain_encoded(row)[0] for row in X.tolist()]
+    matrix = predictor.predict_proba_matrix(X)
+    explain_matrix, contributions = predictor.explain_matrix(X)
+    np.testing.assert_allclose(matrix, single, rtol=1e-12)
+    np.testing.assert_allclose(explain_matrix, explained, rtol=1e-12)
+    np.testing.assert_allclose(explain_matrix, matrix, rtol=1e-12)
+    assert contributions.shape == X.shape
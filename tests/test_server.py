@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import pytest
+
+from server import InferenceServer, MicroBatcher, remote_predict
+
+
+def test_concurrent_requests_are_coalesced(predictor, features):
+    async def scenario():
+        app = InferenceServer(max_wait=0.01)
+        app.batcher.start()
+        try:
+            bodies = [json.dumps(dict(features, Age=18 + i % 17)).encode() for i in range(20)]
+            responses = await asyncio.wait_for(
+                asyncio.gather(*(app.handle("POST", "/predict", body) for body in bodies)), 5)
+            return responses, app.batcher.batches
+        finally:
+            await app.batcher.stop()
+
+    responses, batches = asyncio.run(scenario())
+    assert [status for status, _ in responses] == [200] * 20
+    for i, (_, result) in enumerate(responses):
+        assert result["probability"] == pytest.approx(predictor.predict_proba(dict(features, Age=18 + i % 17)))
+        assert result["prediction"] == int(result["probability"] >= result["threshold"])
+    # Satu panggilan scoring untuk banyak request
+    assert batches < 20
+
+
+def test_http_round_trip(predictor, features):
+    async def scenario():
+        app = InferenceServer()
+        started = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(app.run("127.0.0.1", 0, ready=started.set_result))
+        server = await asyncio.wait_for(started, 5)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, remote_predict, url, features)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    result = asyncio.run(scenario())
+    assert result["probability"] == pytest.approx(predictor.predict_proba(features))
+
+
+def test_request_errors():
+    async def scenario():
+        app = InferenceServer()
+        app.batcher.start()
+        try:
+            return [
+                await app.handle("GET", "/predict", b""),
+                await app.handle("POST", "/predict", b"{not json"),
+                await app.handle("POST", "/predict", b"[1, 2]"),
+                await asyncio.wait_for(app.handle("POST", "/predict", b'{"Gender": "Male"}'), 2),
+                await app.handle("GET", "/nope", b""),
+                await app.handle("GET", "/healthz", b""),
+            ]
+        finally:
+            await app.batcher.stop()
+
+    responses = asyncio.run(scenario())
+    assert [status for status, _ in responses] == [405, 400, 400, 400, 404, 200]
+    assert all("error" in body for _, body in responses[:5])
+
+
+def test_schema_lists_the_encoder_classes(predictor):
+    status, schema = asyncio.run(InferenceServer().handle("GET", "/schema", b""))
+    assert status == 200
+    assert schema["categorical"]["Gender"] == predictor.classes["Gender"]
+    assert schema["threshold"] == predictor.threshold
+
+
+class FlakyPredictor:
+    """Wraps a Predictor; the first ``failures`` batch calls raise."""
+
+    def __init__(self, predictor, failures=1):
+        self.predictor = predictor
+        self.failures = failures
+        self.classes = predictor.classes
+        self.threshold = predictor.threshold
+
+    def predict_proba_matrix(self, X):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("boom")
+        return self.predictor.predict_proba_matrix(X)
+
+
+def test_batch_error_fails_only_that_batch(predictor, features):
+    async def scenario():
+        batcher = MicroBatcher(lambda: flaky, max_wait=0.001)
+        batcher.start()
+        try:
+            # Timeout: batcher yang mati membuat future menggantung selamanya
+            first = await asyncio.gather(asyncio.wait_for(batcher.predict(features), 2), return_exceptions=True)
+            second = await asyncio.wait_for(batcher.predict(features), 2)
+            return first[0], second, batcher.running
+        finally:
+            await batcher.stop()
+
+    flaky = FlakyPredictor(predictor)
+    first, second, running = asyncio.run(scenario())
+    assert isinstance(first, RuntimeError)
+    assert 0.0 <= second["probability"] <= 1.0
+    assert running
+
+
+def test_readyz_requires_running_batcher():
+    async def scenario():
+        app = InferenceServer()
+        before = await app.handle("GET", "/readyz", b"")
+        app.batcher.start()
+        during = await app.handle("GET", "/readyz", b"")
+        await app.batcher.stop()
+        after = await app.handle("GET", "/readyz", b"")
+        return before, during, after
+
+    before, during, after = asyncio.run(scenario())
+    assert before[0] == 503
+    assert during[0] == 200
+    assert after[0] == 503
+
+
+def test_malformed_row_does_not_block_the_next_request(features):
+    async def scenario():
+        app = InferenceServer()
+        app.batcher.start()
+        try:
+            bad = await asyncio.wait_for(
+                app.handle("POST", "/predict", json.dumps(dict(features, Gender=["Male"])).encode()), 2)
+            good = await asyncio.wait_for(app.handle("POST", "/predict", json.dumps(features).encode()), 2)
+            mixed = await asyncio.wait_for(
+                app.handle("POST", "/predict", json.dumps([dict(features, Age={"x": 1}), features]).encode()), 2)
+            ready = await app.handle("GET", "/readyz", b"")
+            return bad, good, mixed, ready
+        finally:
+            await app.batcher.stop()
+
+    bad, good, mixed, ready = asyncio.run(scenario())
+    assert bad[0] == 400 and set(bad[1]["fields"]) == {"Gender"}
+    assert good[0] == 200 and 0.0 <= good[1]["probability"] <= 1.0
+    assert mixed[0] == 200
+    assert set(mixed[1][0]["fields"]) == {"Age"} and "probability" in mixed[1][1]
+    assert ready[0] == 200
+
+
+def test_bad_content_length_gets_400():
+    async def request(app, server, content_length):
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /predict HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode())
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 2)
+        writer.close()
+        return response
+
+    async def scenario():
+        app = InferenceServer()
+        server = await asyncio.start_server(app.serve_connection, "127.0.0.1", 0)
+        async with server:
+            return [await request(app, server, value) for value in ("abc", "-1")]
+
+    for response in asyncio.run(scenario()):
+        head, _, body = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 400")
+        assert json.loads(body) == {"error": "bad content-length"}
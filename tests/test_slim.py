@@ -0,0 +1,39 @@
+import json
+import shutil
+import subprocess
+import sys
+
+import resources
+from scoring import Predictor
+
+
+def test_slim_round_trip(tmp_path, predictor, features):
+    path = tmp_path / "model.json"
+    predictor.save(path)
+    loaded = Predictor.load(path)
+    assert loaded.predict(features) == predictor.predict(features)
+    assert loaded.classes == predictor.classes
+
+
+def test_bundle_uses_matching_slim_export_only(tmp_path):
+    bundle_path = tmp_path / "model.joblib"
+    slim_path = tmp_path / "model.json"
+    shutil.copy(resources.MODEL_PATH, bundle_path)
+    Predictor.from_bundle(resources.load_bundle(), source_sha256=resources.file_digest(bundle_path)).save(slim_path)
+    assert resources.load_predictor(bundle_path) is resources.load_predictor(slim_path)
+
+    # Export basi (dari bundle lain): fallback ke bundle
+    data = json.loads(slim_path.read_text())
+    data["source_sha256"] = "0" * 64
+    slim_path.write_text(json.dumps(data))
+    predictor = resources.load_predictor(bundle_path)
+    assert predictor is not resources.load_predictor(slim_path)
+    assert predictor.source_sha256 == resources.file_digest(bundle_path)
+
+
+def test_serving_from_slim_skips_sklearn_and_pandas():
+    code = ("import sys, resources; resources.load_predictor(); "
+            "print(sorted(m for m in ('sklearn', 'joblib', 'pandas') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=resources.BASE_DIR, capture_output=True, text=True,
+                         check=True).stdout
+    assert out.strip() == "[]"
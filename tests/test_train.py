@@ -0,0 +1,23 @@
+import joblib
+import numpy as np
+
+import resources
+import train
+from scoring import Predictor
+
+GRID = {"model__C": [0.1, 1.0], "model__class_weight": [None]}
+
+
+def test_training_is_reproducible_and_usable(tmp_path):
+    df = resources.load_dataset()
+    first, metrics = train.train_bundle(df, folds=3, n_jobs=1, param_grid=GRID)
+    second, _ = train.train_bundle(df, folds=3, n_jobs=1, param_grid=GRID)
+    np.testing.assert_array_equal(first["model"].coef_, second["model"].coef_)
+    assert metrics["rows"]["total"] == len(df)
+    assert len(metrics["cv_results"]) == 2
+    assert metrics["test"]["roc_auc"] > 0.5
+
+    path = tmp_path / "model.joblib"
+    train.write_bundle(first, path)
+    # from_bundle membandingkan hasil lipatan dengan sklearn
+    Predictor.from_bundle(joblib.load(path))
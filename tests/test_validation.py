@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import validation
+from scoring import FEATURE_COLUMNS
+
+
+@pytest.fixture(scope="module")
+def schema(predictor):
+    return validation.compile_schema(predictor.classes)
+
+
+def reasons_of(schema, records):
+    checked = schema.validate_records(records)
+    return checked, {col: checked.reasons[:, FEATURE_COLUMNS.index(col)].tolist() for col in FEATURE_COLUMNS}
+
+
+def test_valid_record_is_encoded_like_predictor(schema, predictor, features):
+    checked = schema.validate_records([features])
+    assert checked.valid.tolist() == [True]
+    assert checked.X[0].tolist() == predictor.encode(features)
+    assert checked.messages().tolist() == [""]
+
+
+@pytest.mark.parametrize("value", [["Male"], ("Male",), {"Male": 1}, []])
+def test_non_scalar_category_is_unknown(schema, features, value):
+    checked, reasons = reasons_of(schema, [dict(features, Gender=value), features])
+    assert reasons["Gender"] == [validation.UNKNOWN, validation.OK]
+    assert checked.valid.tolist() == [False, True]
+
+
+def test_non_scalar_in_every_row(schema, features):
+    # Semua sel list dengan panjang sama: dulu di-broadcast NumPy jadi matriks
+    checked, reasons = reasons_of(schema, [dict(features, Gender=["Male"]), dict(features, Gender=["Female"])])
+    assert reasons["Gender"] == [validation.UNKNOWN, validation.UNKNOWN]
+
+
+@pytest.mark.parametrize("value", [[22], {"value": 22}, (22,)])
+def test_non_scalar_number_is_not_a_number(schema, features, value):
+    _, reasons = reasons_of(schema, [dict(features, Age=value), features])
+    assert reasons["Age"] == [validation.NOT_A_NUMBER, validation.OK]
+
+
+@pytest.mark.parametrize("value, reason", [
+    (None, validation.MISSING),
+    (math.nan, validation.MISSING),
+    ("22", validation.OK),
+    ("abc", validation.NOT_A_NUMBER),
+    (True, validation.NOT_A_NUMBER),
+    (math.inf, validation.NOT_A_NUMBER),
+    (22.5, validation.NOT_WHOLE),
+    (17, validation.OUT_OF_RANGE),
+    (35, validation.OUT_OF_RANGE),
+    (18, validation.OK),
+])
+def test_numeric_reasons(schema, features, value, reason):
+    _, reasons = reasons_of(schema, [dict(features, Age=value)])
+    assert reasons["Age"] == [reason]
+
+
+@pytest.mark.parametrize("value, reason", [
+    ("Martian", validation.UNKNOWN),
+    ("male", validation.UNKNOWN),
+    (None, validation.MISSING),
+    (math.nan, validation.MISSING),
+    (1, validation.UNKNOWN),
+])
+def test_categorical_reasons(schema, features, value, reason):
+    _, reasons = reasons_of(schema, [dict(features, Gender=value)])
+    assert reasons["Gender"] == [reason]
+
+
+def test_absent_column_is_missing(schema, features):
+    del features["Study Hours"]
+    checked = schema.validate_records([features])
+    assert checked.row_errors(0) == {"Study Hours": "missing"}
+
+
+def test_invalid_cells_are_nan_and_messages_name_fields(schema, features):
+    checked = schema.validate_records([dict(features, Age=99, Gender="Martian")])
+    row = checked.X[0]
+    assert np.isnan(row[FEATURE_COLUMNS.index("Age")]) and np.isnan(row[FEATURE_COLUMNS.index("Gender")])
+    errors = checked.row_errors(0)
+    assert errors["Age"] == "99 outside [18, 34]"
+    assert errors["Gender"].startswith("unknown category 'Martian'")
+
+
+def test_frame_matches_records(schema, features):
+    records = [features, dict(features, Age="x"), dict(features, Gender=None), dict(features, Age=40)]
+    by_records = schema.validate_records(records)
+    by_frame = schema.validate_frame(pd.DataFrame(records))
+    assert by_frame.reasons.tolist() == by_records.reasons.tolist()
+    assert by_frame.messages().tolist() == by_records.messages().tolist()
+    assert by_frame.counts() == {"Age": {"not a number": 1, "out of range": 1}, "Gender": {"missing": 1}}
+
+
+def test_compile_schema_is_shared(predictor):
+    assert validation.compile_schema(predictor.classes) is validation.compile_schema(dict(predictor.classes))
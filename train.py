@@ -0,0 +1,247 @@
+"""\
+train.py
+-----------------
+Reproducible training pipeline for model_depression.joblib.
+
+Steps (as described on the About page):
+- Merge Primer + Sekunder CSV
+- LabelEncoder for the categorical columns and the Depression target
+- Stratified 80:20 train_test_split (fixed seed)
+- StandardScaler + LogisticRegression, with the scaler fitted inside each
+  CV fold; hyperparameters chosen by stratified k-fold grid search run on
+  all CPU cores (n_jobs=-1)
+- Evaluate the refitted best model on the 20% hold-out
+
+Output is the same {"model", "scaler", "encoders"} bundle apps.py loads,
+published atomically with its slim export (publish_bundle), plus a metrics
+manifest (JSON). With the same data, seed
+and library versions both files are byte-identical between runs: there are
+no timestamps, and every random step uses --seed.
+
+Training data is exactly the two CSVs (the dataset store is only used as a
+faster copy of them); --store trains on the whole store instead, rows
+appended by ingest.py included, and records the store's content hash and
+sources in the manifest in place of the CSV hash.
+
+Run:
+    python train.py                                   # -> model_depression.joblib
+    python train.py --store -o /tmp/model.joblib      # + ingested rows
+    python train.py -o /tmp/model.joblib --seed 7 --folds 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import resources
+import risk_table
+from scoring import CATEGORICAL_COLUMNS, DEFAULT_THRESHOLD, FEATURE_COLUMNS, TARGET_COLUMN, Predictor
+
+SEED = 42
+
+PARAM_GRID = {
+    "model__C": [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0, 100.0],
+    "model__class_weight": [None, "balanced"],
+}
+
+
+# ------------------------------------------------------------------
+# Data
+# ------------------------------------------------------------------
+def fit_encoders(df):
+    """LabelEncoders for the categorical features and the target (Yes/No -> 1/0)."""
+    encoders = {col: LabelEncoder().fit(df[col]) for col in CATEGORICAL_COLUMNS}
+    encoders[TARGET_COLUMN] = LabelEncoder().fit(target_values(df))
+    return encoders
+
+
+def target_values(df):
+    return (df[TARGET_COLUMN].astype(str).str.strip().str.lower() == "yes").astype(np.int64).to_numpy()
+
+
+def encode_dataset(df, encoders):
+    """-> (X DataFrame in FEATURE_COLUMNS order, y array)."""
+    X = df[FEATURE_COLUMNS].copy()
+    for col in CATEGORICAL_COLUMNS:
+        X[col] = encoders[col].transform(X[col])
+    X = X.astype(np.float64)
+    y = encoders[TARGET_COLUMN].transform(target_values(df))
+    return X, y
+
+
+# ------------------------------------------------------------------
+# Training
+# ------------------------------------------------------------------
+def classification_metrics(y_true, prob, threshold=DEFAULT_THRESHOLD):
+    pred = (prob >= threshold).astype(np.int64)
+    return {
+        "threshold": threshold,
+        "accuracy": round(float(accuracy_score(y_true, pred)), 6),
+        "precision": round(float(precision_score(y_true, pred, zero_division=0)), 6),
+        "recall": round(float(recall_score(y_true, pred, zero_division=0)), 6),
+        "f1": round(float(f1_score(y_true, pred, zero_division=0)), 6),
+        "roc_auc": round(float(roc_auc_score(y_true, prob)), 6),
+    }
+
+
+def train_bundle(df, seed=SEED, folds=5, n_jobs=-1, param_grid=PARAM_GRID, test_size=0.2):
+    """Fit encoders, scaler and model on ``df``. Returns (bundle, metrics)."""
+    encoders = fit_encoders(df)
+    X, y = encode_dataset(df, encoders)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, stratify=y, random_state=seed
+    )
+
+    pipeline = Pipeline([
+        ("scaler", StandardScaler()),
+        ("model", LogisticRegression(max_iter=1000)),
+    ])
+    search = GridSearchCV(
+        pipeline,
+        param_grid,
+        scoring="roc_auc",
+        cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed),
+        n_jobs=n_jobs,
+    )
+    search.fit(X_train, y_train)
+
+    best = search.best_estimator_
+    scaler = best.named_steps["scaler"]
+    model = best.named_steps["model"]
+    prob_test = best.predict_proba(X_test)[:, 1]
+
+    cv = search.cv_results_
+    metrics = {
+        "seed": seed,
+        "folds": folds,
+        "rows": {"total": int(len(df)), "train": int(len(y_train)), "test": int(len(y_test))},
+        "features": FEATURE_COLUMNS,
+        "best_params": {k.split("__", 1)[1]: v for k, v in search.best_params_.items()},
+        "cv_roc_auc": {"mean": round(float(search.best_score_), 6),
+                       "std": round(float(cv["std_test_score"][search.best_index_]), 6)},
+        "cv_results": [
+            {
+                "params": {k.split("__", 1)[1]: v for k, v in params.items()},
+                "mean_roc_auc": round(float(mean), 6),
+                "std_roc_auc": round(float(std), 6),
+            }
+            for params, mean, std in zip(cv["params"], cv["mean_test_score"], cv["std_test_score"])
+        ],
+        "test": classification_metrics(y_test, prob_test),
+        "versions": {"sklearn": sklearn.__version__, "numpy": np.__version__},
+    }
+    bundle = {"model": model, "scaler": scaler, "encoders": encoders}
+    return bundle, metrics
+
+
+def write_bundle(bundle, path):
+    """joblib.dump to a temp file, then os.replace (apps.py reloads atomically)."""
+    tmp = f"{path}.tmp"
+    joblib.dump(bundle, tmp)
+    os.replace(tmp, path)
+
+
+def publish_bundle(bundle, path, table_path=None, meta_path=None):
+    """Write ``bundle`` to ``path`` together with the files derived from it.
+
+    1. the folded scorer is built and checked against sklearn first; nothing
+       is written if they disagree
+    2. the bundle (write_bundle), then the slim export <path>.json the same
+       way, so load_predictor() keeps serving without pickle or sklearn
+    3. the risk table next to the bundle (risk_table.npy / .json, like the
+       slim export) is rebuilt when it was built from the bundle being
+       replaced; a table of another bundle is left alone
+
+    Returns {"slim": slim path, "risk_table": table path or None}.
+    """
+    path = Path(path)
+    # Tabel milik bundle ini ada di folder yang sama; salinan bundle di tempat
+    # lain (hash sama) tidak boleh menimpa tabel bundle aslinya
+    table_path = table_path or path.with_name(resources.RISK_TABLE_PATH.name)
+    meta_path = meta_path or path.with_name(resources.RISK_TABLE_META_PATH.name)
+    predictor = Predictor.from_bundle(bundle)
+    replaced = resources.file_digest(path) if path.exists() else None
+
+    write_bundle(bundle, path)
+    predictor.source_sha256 = resources.file_digest(path)
+    slim_path = path.with_suffix(".json")
+    tmp = f"{slim_path}.tmp"
+    predictor.save(tmp)
+    os.replace(tmp, slim_path)
+
+    try:
+        with open(meta_path) as f:
+            built_from = json.load(f).get("bundle_sha256")
+    except (OSError, ValueError):
+        built_from = None
+    rebuilt = None
+    if replaced is not None and built_from == replaced:
+        risk_table.build_table(predictor, table_path, meta_path, predictor.source_sha256)
+        rebuilt = table_path
+    return {"slim": slim_path, "risk_table": rebuilt}
+
+
+def write_json(data, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild model_depression.joblib from the survey CSVs.")
+    parser.add_argument("-o", "--output", default=str(resources.MODEL_PATH), help="bundle path (.joblib)")
+    parser.add_argument("--metrics", help="metrics manifest (default: <output>.metrics.json)")
+    parser.add_argument("--primer", default=str(resources.PRIMER_PATH))
+    parser.add_argument("--sekunder", default=str(resources.SEKUNDER_PATH))
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="parallel CV workers (-1 = all cores)")
+    parser.add_argument("--store", nargs="?", const=str(resources.DATASET_STORE_PATH),
+                        help="train on the whole dataset store instead, rows appended by ingest.py included")
+    args = parser.parse_args(argv)
+
+    metrics_path = args.metrics or str(os.path.splitext(args.output)[0]) + ".metrics.json"
+
+    start = time.perf_counter()
+    if args.store:
+        df, store_meta = resources.load_store(args.store)
+    else:
+        df = resources.load_dataset(args.primer, args.sekunder)
+    bundle, metrics = train_bundle(df, seed=args.seed, folds=args.folds, n_jobs=args.n_jobs)
+    if args.store:
+        # Isi store (hash kolom) + daftar sumbernya: cukup untuk mengulang training
+        metrics["dataset_sha256"] = store_meta["content_sha256"]
+        metrics["dataset_store"] = {"content_sha256": store_meta["content_sha256"], "sources": store_meta["sources"]}
+    else:
+        metrics["dataset_sha256"] = resources.file_digest(args.primer, args.sekunder)
+
+    published = publish_bundle(bundle, args.output)
+    metrics["bundle_sha256"] = resources.file_digest(args.output)
+    write_json(metrics, metrics_path)
+    elapsed = time.perf_counter() - start
+
+    test = metrics["test"]
+    print(f"✅ Wrote {args.output}, {published['slim']} and {metrics_path} in {elapsed:.2f}s"
+          + (f" (rebuilt {published['risk_table']})" if published["risk_table"] else ""))
+    print(f"   best {metrics['best_params']}  cv roc_auc={metrics['cv_roc_auc']['mean']:.4f}")
+    print(f"   test roc_auc={test['roc_auc']:.4f} f1={test['f1']:.4f} recall={test['recall']:.4f} "
+          f"@ threshold {test['threshold']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
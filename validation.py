@@ -0,0 +1,314 @@
+"""\
+validation.py
+-----------------
+Row-level input validation for batch and API scoring.
+
+A Schema is compiled once from the model's encoder classes and
+scoring.NUMERIC_RANGES: per categorical column a sorted class array (plus
+the code of each class), per numeric column its whole-number range. It then
+checks whole columns at a time and returns a Validation with
+- reasons: uint8 matrix (rows x FEATURE_COLUMNS), OK or one of the codes
+  below for every cell
+- valid:   boolean row mask (no field in error)
+- X:       the encoded matrix (LabelEncoder codes / numbers), ready for
+           Predictor.predict_proba_matrix(X[valid]); invalid cells are NaN
+Human-readable messages are only built for the rows that need them.
+
+Reasons:
+    MISSING        field absent, empty or null
+    UNKNOWN        category the encoders have never seen
+    NOT_A_NUMBER   numeric field that does not parse as a number
+    NOT_WHOLE      numeric field with a fractional part
+    OUT_OF_RANGE   whole number outside scoring.NUMERIC_RANGES
+
+Nothing raises for a bad row, so one invalid answer no longer aborts a
+whole batch (batch_score.py) or API request (server.py).
+"""
+
+import functools
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from scoring import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERIC_RANGES
+
+OK, MISSING, UNKNOWN, NOT_A_NUMBER, NOT_WHOLE, OUT_OF_RANGE = range(6)
+
+REASONS = {
+    MISSING: "missing",
+    UNKNOWN: "unknown category",
+    NOT_A_NUMBER: "not a number",
+    NOT_WHOLE: "not a whole number",
+    OUT_OF_RANGE: "out of range",
+}
+
+# Penanda kolom yang tidak ada sama sekali (beda dengan nilai kosong)
+_ABSENT = object()
+
+# Kolom kategori ter-dictionary-encode: hanya nilai unik yang divalidasi
+# (codes -1 = kosong). Kolom numerik yang sudah dikonversi + mask kosong.
+Dictionary = namedtuple("Dictionary", "uniques codes")
+Numbers = namedtuple("Numbers", "values missing raw")
+
+
+def _is_missing(value):
+    return value is None or value is _ABSENT or (isinstance(value, float) and math.isnan(value))
+
+
+def _to_float(value):
+    # bool adalah int di Python, tapi bukan jawaban numerik yang sah
+    if isinstance(value, bool) or _is_missing(value):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _is_scalar(value):
+    # Nilai JSON bersarang (list / object) bukan jawaban yang sah
+    return not isinstance(value, (list, tuple, dict, set, np.ndarray))
+
+
+_missing = np.frompyfunc(_is_missing, 1, 1)
+_floats = np.frompyfunc(_to_float, 1, 1)
+_scalar = np.frompyfunc(_is_scalar, 1, 1)
+
+
+class Validation:
+    """Result of Schema.validate (see module docstring)."""
+
+    def __init__(self, schema, columns, reasons, X):
+        self.schema = schema
+        self.columns = columns
+        self.reasons = reasons
+        self.X = X
+        self.valid = ~reasons.any(axis=1)
+
+    def __len__(self):
+        return len(self.valid)
+
+    @property
+    def errors(self):
+        """Boolean (rows x FEATURE_COLUMNS) mask of invalid fields."""
+        return self.reasons != OK
+
+    @property
+    def invalid_rows(self):
+        return np.flatnonzero(~self.valid)
+
+    def value(self, col, i):
+        """Input value of ``col`` in row ``i``, as given."""
+        values = self.columns[col]
+        if isinstance(values, Dictionary):
+            code = values.codes[i]
+            value = values.uniques[code] if code >= 0 else None
+        elif isinstance(values, Numbers):
+            value = values.raw[i]
+        else:
+            value = values[i]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def _describe(self, col, reason, value):
+        if reason == MISSING:
+            return "missing"
+        if reason == UNKNOWN:
+            return f"unknown category {value!r} (expected one of {self.schema.classes[col]})"
+        if reason == OUT_OF_RANGE:
+            lo, hi = NUMERIC_RANGES[col]
+            return f"{value!r} outside [{lo}, {hi}]"
+        return f"{value!r} is {REASONS[reason]}"
+
+    def row_errors(self, i):
+        """{column: message} for row ``i`` (empty for a valid row)."""
+        return {
+            FEATURE_COLUMNS[j]: self._describe(FEATURE_COLUMNS[j], self.reasons[i, j], self.value(FEATURE_COLUMNS[j], i))
+            for j in np.flatnonzero(self.reasons[i])
+        }
+
+    def message(self, i):
+        """One-line description of row ``i``'s errors ("" for a valid row)."""
+        return "; ".join(f"{col!r}: {text}" for col, text in self.row_errors(i).items())
+
+    def messages(self):
+        """message(i) for every row, as an object array ("" for valid rows).
+
+        Built column by column; each distinct (reason, value) is described
+        once, so dirty exports with repeated bad values stay cheap.
+        """
+        out = np.full(len(self.valid), "", dtype=object)
+        for j, col in enumerate(FEATURE_COLUMNS):
+            rows = np.flatnonzero(self.reasons[:, j])
+            if not len(rows):
+                continue
+            memo = {}
+            texts = np.empty(len(rows), dtype=object)
+            for k, (row, reason) in enumerate(zip(rows.tolist(), self.reasons[rows, j].tolist())):
+                value = None if reason == MISSING else self.value(col, row)
+                key = (reason, value if isinstance(value, str) else repr(value))
+                text = memo.get(key)
+                if text is None:
+                    text = memo[key] = f"{col!r}: {self._describe(col, reason, value)}"
+                texts[k] = text
+            first = out[rows] == ""
+            out[rows] = np.where(first, texts, out[rows] + "; " + texts)
+        return out
+
+    def counts(self):
+        """{column: {reason text: rows}} over the invalid fields."""
+        out = {}
+        for j, col in enumerate(FEATURE_COLUMNS):
+            codes, n = np.unique(self.reasons[:, j], return_counts=True)
+            found = {REASONS[c]: int(k) for c, k in zip(codes.tolist(), n.tolist()) if c != OK}
+            if found:
+                out[col] = found
+        return out
+
+
+class Schema:
+    """Validator compiled from encoder classes; use compile_schema() to share one."""
+
+    def __init__(self, classes):
+        self.classes = {col: list(classes[col]) for col in CATEGORICAL_COLUMNS}
+        # Kelas diurutkan untuk searchsorted; kode = posisi di encoder (bukan urutan sortir)
+        self._sorted = {}
+        for col in CATEGORICAL_COLUMNS:
+            names = np.array(self.classes[col], dtype=str)
+            order = np.argsort(names)
+            self._sorted[col] = (names[order], order.astype(np.float64))
+
+    def validate(self, columns, rows=None):
+        """Validate {column: values} (all the same length); missing columns fail every row."""
+        if rows is None:
+            rows = next((len(values) for values in columns.values()), 0)
+        # Kolom-mayor: setiap kolom diperiksa sebagai satu blok memori kontigu
+        reasons = np.zeros((rows, len(FEATURE_COLUMNS)), dtype=np.uint8, order="F")
+        X = np.full((rows, len(FEATURE_COLUMNS)), np.nan, order="F")
+        for j, col in enumerate(FEATURE_COLUMNS):
+            if col not in columns:
+                reasons[:, j] = MISSING
+                continue
+            values = columns[col]
+            if not isinstance(values, (Dictionary, Numbers)):
+                values = np.asarray(values)
+            if col in self._sorted:
+                self._check_categorical(col, values, reasons[:, j], X[:, j])
+            else:
+                self._check_numeric(col, values, reasons[:, j], X[:, j])
+        return Validation(self, columns, reasons, X)
+
+    def validate_frame(self, frame):
+        """Validate the FEATURE_COLUMNS of a DataFrame (extra columns are ignored).
+
+        Categorical columns are dictionary-encoded first (pandas categoricals
+        already are; others via pd.factorize), so only distinct values are
+        looked up; non-numeric numeric columns go through pd.to_numeric.
+        """
+        import pandas as pd
+
+        columns = {}
+        for col in FEATURE_COLUMNS:
+            if col not in frame.columns:
+                continue
+            series = frame[col]
+            if col in self._sorted:
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    columns[col] = Dictionary(np.asarray(series.cat.categories, dtype=object),
+                                              series.cat.codes.to_numpy())
+                else:
+                    codes, uniques = pd.factorize(series)
+                    columns[col] = Dictionary(np.asarray(uniques, dtype=object), codes)
+            elif series.dtype.kind in "iuf":
+                columns[col] = series.to_numpy()
+            else:
+                columns[col] = Numbers(pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64),
+                                       series.isna().to_numpy(), series.to_numpy())
+        return self.validate(columns, rows=len(frame))
+
+    def validate_records(self, records):
+        """Validate a list of feature dicts (e.g. API request bodies).
+
+        Nested values (lists, objects) are kept as single cells and rejected
+        as an unknown category / not a number.
+        """
+        columns = {}
+        for col in FEATURE_COLUMNS:
+            # Diisi per elemen: list-assignment akan di-broadcast oleh NumPy
+            values = np.empty(len(records), dtype=object)
+            for i, record in enumerate(records):
+                values[i] = record.get(col, _ABSENT)
+            columns[col] = values
+        return self.validate(columns, rows=len(records))
+
+    def _check_categorical(self, col, values, reasons, out):
+        if isinstance(values, Dictionary):
+            unique_reasons = np.zeros(len(values.uniques), dtype=np.uint8)
+            unique_codes = np.full(len(values.uniques), np.nan)
+            self._check_categorical(col, values.uniques, unique_reasons, unique_codes)
+            present = values.codes >= 0
+            reasons[:] = MISSING
+            reasons[present] = unique_reasons[values.codes[present]]
+            out[present] = unique_codes[values.codes[present]]
+            return
+
+        # str() per sel di C, lalu searchsorted; hanya sel yang tidak cocok
+        # (jarang) diperiksa satu per satu: kosong atau kategori asing
+        if values.dtype.kind == "U":
+            text = values
+        else:
+            text = values.astype(object, copy=False)
+            scalar = _scalar(text).astype(bool) if len(text) else np.ones(0, dtype=bool)
+            if not scalar.all():
+                # Sel bersarang tidak boleh sampai ke astype(str): NumPy mencoba
+                # menjadikannya dimensi baru. None tidak pernah cocok -> UNKNOWN
+                text = np.where(scalar, text, None)
+            text = text.astype(str)
+        names, codes = self._sorted[col]
+        pos = np.minimum(np.searchsorted(names, text), len(names) - 1)
+        known = names[pos] == text
+        out[known] = codes[pos[known]]
+        rest = np.flatnonzero(~known)
+        if len(rest):
+            missing = _missing(values[rest].astype(object)).astype(bool)
+            reasons[rest] = np.where(missing, MISSING, UNKNOWN)
+
+    def _check_numeric(self, col, values, reasons, out):
+        if isinstance(values, Numbers):
+            numbers, missing, _ = values
+        elif values.dtype.kind in "iuf":
+            numbers = values.astype(np.float64)
+            missing = np.isnan(numbers)
+        else:
+            values = values.astype(object, copy=False)
+            try:
+                numbers = values.astype(np.float64)
+                fast = not any(v.__class__ is bool for v in values)
+            except (TypeError, ValueError):
+                fast = False
+            if fast:
+                missing = np.isnan(numbers)
+            else:
+                missing = _missing(values).astype(bool) if len(values) else np.zeros(0, dtype=bool)
+                numbers = _floats(values).astype(np.float64) if len(values) else np.zeros(0)
+        lo, hi = NUMERIC_RANGES[col]
+        with np.errstate(invalid="ignore"):
+            not_number = np.isnan(numbers) | np.isinf(numbers)
+            not_whole = ~not_number & (numbers != np.round(numbers))
+            outside = ~not_number & ~not_whole & ((numbers < lo) | (numbers > hi))
+        reasons[not_number] = NOT_A_NUMBER
+        reasons[missing] = MISSING
+        reasons[not_whole] = NOT_WHOLE
+        reasons[outside] = OUT_OF_RANGE
+        ok = reasons == OK
+        out[ok] = numbers[ok]
+
+
+@functools.lru_cache(maxsize=8)
+def _compile(frozen):
+    return Schema({col: list(values) for col, values in frozen})
+
+
+def compile_schema(classes):
+    """Shared Schema for these encoder classes ({column: [class, ...]}), compiled once."""
+    return _compile(tuple((col, tuple(classes[col])) for col in CATEGORICAL_COLUMNS))